@@ -23,7 +23,12 @@ from app.models.punishment_event import PunishmentEvent  # noqa: F401
 from app.models.quick_start_template import QuickStartTemplate  # noqa: F401
 from app.models.admin_audit_log import AdminAuditLog  # noqa: F401
 from app.models.time_trace import TimeTrace  # noqa: F401
-from app.models.group import Group, GroupDailySnapshot, GroupMember, GroupMessage  # noqa: F401
+from app.models.group import Group, GroupDailySnapshot, GroupMember, GroupMessage, GroupMessageArchive  # noqa: F401
+from app.models.user_daily_status import UserDailyStatus  # noqa: F401
+from app.models.search_document import SearchDocument  # noqa: F401
+from app.models.job import JobLease, JobRun  # noqa: F401
+from app.models.target_progress import TargetProgress  # noqa: F401
+from app.models.email_outbox import EmailOutbox  # noqa: F401
 
 # this is the Alembic Config object
 config = context.config
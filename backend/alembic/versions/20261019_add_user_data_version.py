@@ -0,0 +1,26 @@
+"""add user data version
+
+Revision ID: 20261019_user_data_version
+Revises: 20260804_category_sort
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_user_data_version"
+down_revision = "20260804_category_sort"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("data_version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "data_version")
@@ -0,0 +1,24 @@
+"""add session keyset indexes
+
+Revision ID: 20261020_session_keyset
+Revises: 20261019_user_data_version
+Create Date: 2026-10-20
+"""
+
+from alembic import op
+
+
+revision = "20261020_session_keyset"
+down_revision = "20261019_user_data_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sessions_start_time_id", "sessions", ["start_time", "id"], unique=False)
+    op.create_index("ix_sessions_category_start_time", "sessions", ["category_id", "start_time"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sessions_category_start_time", table_name="sessions")
+    op.drop_index("ix_sessions_start_time_id", table_name="sessions")
@@ -0,0 +1,55 @@
+"""add user search indexes
+
+Revision ID: 20261021_user_search
+Revises: 20261020_session_keyset
+Create Date: 2026-10-21
+"""
+
+import sqlite3
+
+from alembic import op
+
+
+revision = "20261021_user_search"
+down_revision = "20261020_session_keyset"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS users_search USING fts5("
+    "username, email, content='users', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS users_search_ai AFTER INSERT ON users BEGIN "
+    "INSERT INTO users_search(rowid, username, email) VALUES (new.id, new.username, new.email); END",
+    "CREATE TRIGGER IF NOT EXISTS users_search_ad AFTER DELETE ON users BEGIN "
+    "INSERT INTO users_search(users_search, rowid, username, email) "
+    "VALUES ('delete', old.id, old.username, old.email); END",
+    "CREATE TRIGGER IF NOT EXISTS users_search_au AFTER UPDATE OF username, email ON users BEGIN "
+    "INSERT INTO users_search(users_search, rowid, username, email) "
+    "VALUES ('delete', old.id, old.username, old.email); "
+    "INSERT INTO users_search(rowid, username, email) VALUES (new.id, new.username, new.email); END",
+    "INSERT INTO users_search(users_search) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_users_username_trgm ON users USING gin (lower(username) gin_trgm_ops)")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops)")
+    elif dialect == "sqlite" and sqlite3.sqlite_version_info >= (3, 34, 0):
+        # The trigram tokenizer needs SQLite 3.34; older builds keep the LIKE scan.
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_users_email_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_users_username_trgm")
+    elif dialect == "sqlite":
+        for trigger in ("users_search_au", "users_search_ad", "users_search_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS users_search")
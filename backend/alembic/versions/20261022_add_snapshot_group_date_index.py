@@ -0,0 +1,27 @@
+"""add group daily snapshot leaderboard index
+
+Revision ID: 20261022_snapshot_group_date
+Revises: 20261021_user_search
+Create Date: 2026-10-22
+"""
+
+from alembic import op
+
+
+revision = "20261022_snapshot_group_date"
+down_revision = "20261021_user_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_group_daily_snapshots_group_date",
+        "group_daily_snapshots",
+        ["group_id", "date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_daily_snapshots_group_date", table_name="group_daily_snapshots")
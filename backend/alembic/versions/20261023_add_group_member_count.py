@@ -0,0 +1,34 @@
+"""add denormalized group member count
+
+Revision ID: 20261023_group_member_count
+Revises: 20261022_snapshot_group_date
+Create Date: 2026-10-23
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261023_group_member_count"
+down_revision = "20261022_snapshot_group_date"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "groups",
+        sa.Column("member_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE groups SET member_count = (
+            SELECT COUNT(*) FROM group_members
+            WHERE group_members.group_id = groups.id AND group_members.is_active = true
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("groups", "member_count")
@@ -0,0 +1,41 @@
+"""add cached user daily statuses
+
+Revision ID: 20261024_user_daily_statuses
+Revises: 20261023_group_member_count
+Create Date: 2026-10-24
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261024_user_daily_statuses"
+down_revision = "20261023_group_member_count"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_daily_statuses",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("total_seconds", sa.Integer(), nullable=False),
+        sa.Column("by_category", sa.JSON(), nullable=False),
+        sa.Column("target_completed_count", sa.Integer(), nullable=False),
+        sa.Column("target_total_count", sa.Integer(), nullable=False),
+        sa.Column("streak_days", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "date", name="uq_user_daily_statuses_user_date"),
+    )
+    op.create_index(op.f("ix_user_daily_statuses_id"), "user_daily_statuses", ["id"], unique=False)
+    op.create_index(op.f("ix_user_daily_statuses_user_id"), "user_daily_statuses", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_user_daily_statuses_user_id"), table_name="user_daily_statuses")
+    op.drop_index(op.f("ix_user_daily_statuses_id"), table_name="user_daily_statuses")
+    op.drop_table("user_daily_statuses")
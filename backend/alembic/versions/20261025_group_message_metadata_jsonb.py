@@ -0,0 +1,77 @@
+"""store group message metadata as native JSON
+
+Revision ID: 20261025_message_metadata_json
+Revises: 20261024_user_daily_statuses
+Create Date: 2026-10-25
+"""
+
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261025_message_metadata_json"
+down_revision = "20261024_user_daily_statuses"
+branch_labels = None
+depends_on = None
+
+
+def _clear_malformed_metadata() -> None:
+    """Null legacy values that are not a JSON object.
+
+    Message pages splice the stored text into responses unchanged, so one
+    malformed value would break every page it lands on.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        op.execute(
+            "UPDATE group_messages SET metadata_json = NULL "
+            "WHERE metadata_json IS NOT NULL AND "
+            "(CASE WHEN json_valid(metadata_json) THEN json_type(metadata_json) END) IS NOT 'object'"
+        )
+        return
+    messages = sa.table("group_messages", sa.column("id", sa.Integer), sa.column("metadata_json", sa.Text))
+    malformed = []
+    for message_id, raw in bind.execute(
+        sa.select(messages.c.id, messages.c.metadata_json).where(messages.c.metadata_json.isnot(None))
+    ):
+        try:
+            valid = isinstance(json.loads(raw), dict)
+        except ValueError:
+            valid = False
+        if not valid:
+            malformed.append(message_id)
+    for offset in range(0, len(malformed), 1000):
+        bind.execute(
+            messages.update().where(messages.c.id.in_(malformed[offset:offset + 1000])).values(metadata_json=None)
+        )
+
+
+def upgrade() -> None:
+    _clear_malformed_metadata()
+    # SQLite stores JSON as text already; only Postgres needs a type change.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.alter_column(
+        "group_messages",
+        "metadata_json",
+        type_=postgresql.JSONB(),
+        existing_type=sa.Text(),
+        existing_nullable=True,
+        postgresql_using="CASE WHEN metadata_json IS NULL OR metadata_json = '' THEN NULL ELSE metadata_json::jsonb END",
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.alter_column(
+        "group_messages",
+        "metadata_json",
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="metadata_json::text",
+    )
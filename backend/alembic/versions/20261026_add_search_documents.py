@@ -0,0 +1,148 @@
+"""add search documents for message and note search
+
+Revision ID: 20261026_search_documents
+Revises: 20261025_message_metadata_json
+Create Date: 2026-10-26
+"""
+
+import re
+import sqlite3
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261026_search_documents"
+down_revision = "20261025_message_metadata_json"
+branch_labels = None
+depends_on = None
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copy of SEARCH_DOCUMENTS_SQLITE_DDL in app/models/search_document.py
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "tokens, content='search_documents', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, tokens) VALUES (new.id, new.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, tokens) VALUES ('delete', old.id, old.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE OF tokens ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, tokens) VALUES ('delete', old.id, old.tokens); "
+    "INSERT INTO search_documents_fts(rowid, tokens) VALUES (new.id, new.tokens); END",
+)
+
+# Frozen copy of the index-side tokenizer in app/services/search.py
+_WORD_RUN = re.compile(r"[^\W_]+")
+_CJK_RUN = re.compile(
+    r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+"
+)
+
+
+def _tokenize(value):
+    tokens = []
+    normalized = unicodedata.normalize("NFKC", value or "").lower()
+    for word in _WORD_RUN.findall(normalized):
+        position = 0
+        runs = []
+        for match in _CJK_RUN.finditer(word):
+            if match.start() > position:
+                runs.append((False, word[position:match.start()]))
+            runs.append((True, match.group()))
+            position = match.end()
+        if position < len(word):
+            runs.append((False, word[position:]))
+        for is_cjk, run in runs:
+            if not is_cjk:
+                tokens.append(run)
+                continue
+            tokens.extend(run)
+            tokens.extend(run[index:index + 2] for index in range(len(run) - 1))
+    return tokens
+
+
+search_documents = sa.table(
+    "search_documents",
+    sa.column("doc_type", sa.String),
+    sa.column("doc_id", sa.Integer),
+    sa.column("scope_id", sa.Integer),
+    sa.column("tokens", sa.Text),
+)
+group_messages = sa.table(
+    "group_messages",
+    sa.column("id", sa.Integer),
+    sa.column("group_id", sa.Integer),
+    sa.column("content", sa.Text),
+    sa.column("deleted_at", sa.DateTime(timezone=True)),
+)
+time_traces = sa.table(
+    "time_traces",
+    sa.column("id", sa.Integer),
+    sa.column("user_id", sa.Integer),
+    sa.column("content", sa.Text),
+)
+
+
+def _backfill(bind, doc_type, source, scope_column, *criteria) -> None:
+    last_id = 0
+    while True:
+        batch = bind.execute(
+            sa.select(source.c.id, scope_column, source.c.content)
+            .where(source.c.id > last_id, *criteria)
+            .order_by(source.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not batch:
+            break
+        bind.execute(
+            sa.insert(search_documents),
+            [
+                {"doc_type": doc_type, "doc_id": row_id, "scope_id": scope_id, "tokens": " ".join(_tokenize(content))}
+                for row_id, scope_id, content in batch
+            ],
+        )
+        last_id = batch[-1][0]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "search_documents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("doc_type", sa.String(length=30), nullable=False),
+        sa.Column("doc_id", sa.Integer(), nullable=False),
+        sa.Column("scope_id", sa.Integer(), nullable=False),
+        sa.Column("tokens", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("uq_search_documents_doc", "search_documents", ["doc_type", "doc_id"], unique=True)
+    op.create_index("ix_search_documents_scope", "search_documents", ["doc_type", "scope_id"])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_search_documents_tokens_gin ON search_documents "
+            "USING gin (array_to_tsvector(string_to_array(tokens, ' ')))"
+        )
+    elif dialect == "sqlite" and sqlite3.sqlite_version_info >= (3, 9, 0):
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+
+    # Tokenization happens in Python; the FTS triggers pick up the inserted rows.
+    bind = op.get_bind()
+    _backfill(bind, "group_message", group_messages, group_messages.c.group_id, group_messages.c.deleted_at.is_(None))
+    _backfill(bind, "time_trace", time_traces, time_traces.c.user_id)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_search_documents_tokens_gin")
+    elif dialect == "sqlite":
+        for trigger in ("search_documents_au", "search_documents_ad", "search_documents_ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS search_documents_fts")
+    op.drop_index("ix_search_documents_scope", table_name="search_documents")
+    op.drop_index("uq_search_documents_doc", table_name="search_documents")
+    op.drop_table("search_documents")
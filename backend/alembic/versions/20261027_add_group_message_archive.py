@@ -0,0 +1,49 @@
+"""add month-partitioned group message archive
+
+Revision ID: 20261027_message_archive
+Revises: 20261026_search_documents
+Create Date: 2026-10-27
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261027_message_archive"
+down_revision = "20261026_search_documents"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partitions are created per month by the archive job on Postgres.
+    op.create_table(
+        "group_messages_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("archive_month", sa.Date(), nullable=False),
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("message_type", sa.String(length=20), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "metadata_json",
+            sa.JSON(none_as_null=True).with_variant(postgresql.JSONB(none_as_null=True), "postgresql"),
+            nullable=True,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["group_id"], ["groups.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "archive_month"),
+        postgresql_partition_by="RANGE (archive_month)",
+    )
+    op.create_index("ix_group_messages_archive_group_id_id", "group_messages_archive", ["group_id", "id"])
+    op.create_index("ix_group_messages_group_id_id", "group_messages", ["group_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_group_messages_group_id_id", table_name="group_messages")
+    op.drop_index("ix_group_messages_archive_group_id_id", table_name="group_messages_archive")
+    op.drop_table("group_messages_archive")
@@ -0,0 +1,22 @@
+"""add group visibility index for the public directory
+
+Revision ID: 20261028_group_visibility
+Revises: 20261027_message_archive
+Create Date: 2026-10-28
+"""
+
+from alembic import op
+
+
+revision = "20261028_group_visibility"
+down_revision = "20261027_message_archive"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_groups_visibility_updated_at", "groups", ["visibility", "updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_groups_visibility_updated_at", table_name="groups")
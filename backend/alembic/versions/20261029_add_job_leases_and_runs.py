@@ -0,0 +1,52 @@
+"""add job leases and job runs
+
+Revision ID: 20261029_job_runner
+Revises: 20261028_group_visibility
+Create Date: 2026-10-29
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261029_job_runner"
+down_revision = "20261028_group_visibility"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_leases",
+        sa.Column("job_name", sa.String(length=100), nullable=False),
+        sa.Column("owner", sa.String(length=200), nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_slot", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("acquired_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("job_name"),
+    )
+    op.create_table(
+        "job_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_name", sa.String(length=100), nullable=False),
+        sa.Column("owner", sa.String(length=200), nullable=False),
+        sa.Column("slot", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("rows_processed", sa.Integer(), nullable=True),
+        sa.Column("detail_json", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_job_runs_id"), "job_runs", ["id"], unique=False)
+    op.create_index(op.f("ix_job_runs_started_at"), "job_runs", ["started_at"], unique=False)
+    op.create_index("ix_job_runs_job_started", "job_runs", ["job_name", "started_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_runs_job_started", table_name="job_runs")
+    op.drop_index("ix_job_runs_started_at", table_name="job_runs")
+    op.drop_index("ix_job_runs_id", table_name="job_runs")
+    op.drop_table("job_runs")
+    op.drop_table("job_leases")
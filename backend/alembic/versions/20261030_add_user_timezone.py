@@ -0,0 +1,28 @@
+"""add user timezone
+
+Revision ID: 20261030_user_timezone
+Revises: 20261029_job_runner
+Create Date: 2026-10-30
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261030_user_timezone"
+down_revision = "20261029_job_runner"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("timezone", sa.String(length=64), server_default="UTC", nullable=False),
+    )
+    op.create_index("ix_users_timezone", "users", ["timezone"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_timezone", table_name="users")
+    op.drop_column("users", "timezone")
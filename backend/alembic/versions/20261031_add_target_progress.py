@@ -0,0 +1,40 @@
+"""add cached target progress
+
+Revision ID: 20261031_target_progress
+Revises: 20261030_user_timezone
+Create Date: 2026-10-31
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261031_target_progress"
+down_revision = "20261030_user_timezone"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "target_progress",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("target_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("period_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("period_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("actual_seconds", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.ForeignKeyConstraint(["target_id"], ["work_targets.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("target_id", "period_start", name="uq_target_progress_target_period"),
+    )
+    op.create_index(op.f("ix_target_progress_id"), "target_progress", ["id"], unique=False)
+    op.create_index("ix_target_progress_user_period", "target_progress", ["user_id", "period_start", "period_end"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_target_progress_user_period", table_name="target_progress")
+    op.drop_index(op.f("ix_target_progress_id"), table_name="target_progress")
+    op.drop_table("target_progress")
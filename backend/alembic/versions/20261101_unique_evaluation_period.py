@@ -0,0 +1,39 @@
+"""unique evaluation per target period
+
+Revision ID: 20261101_unique_evaluation
+Revises: 20261031_target_progress
+Create Date: 2026-11-01
+"""
+
+from alembic import op
+
+
+revision = "20261101_unique_evaluation"
+down_revision = "20261031_target_progress"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep the first evaluation of any period that was evaluated more than once.
+    op.execute(
+        "DELETE FROM punishment_events WHERE evaluation_id IN ("
+        "SELECT e.id FROM work_evaluations e WHERE EXISTS ("
+        "SELECT 1 FROM work_evaluations f WHERE f.target_id = e.target_id "
+        "AND f.period_start = e.period_start AND f.id < e.id))"
+    )
+    op.execute(
+        "DELETE FROM work_evaluations WHERE EXISTS ("
+        "SELECT 1 FROM work_evaluations f WHERE f.target_id = work_evaluations.target_id "
+        "AND f.period_start = work_evaluations.period_start AND f.id < work_evaluations.id)"
+    )
+    op.create_index(
+        "uq_work_evaluations_target_period",
+        "work_evaluations",
+        ["target_id", "period_start"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_work_evaluations_target_period", table_name="work_evaluations")
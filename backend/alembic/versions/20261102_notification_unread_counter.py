@@ -0,0 +1,37 @@
+"""add notification inbox index and unread counter
+
+Revision ID: 20261102_notification_unread
+Revises: 20261101_unique_evaluation
+Create Date: 2026-11-02
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261102_notification_unread"
+down_revision = "20261101_unique_evaluation"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_notifications_user_read_created",
+        "notifications",
+        ["user_id", "read_at", "created_at"],
+    )
+    op.add_column(
+        "users",
+        sa.Column("unread_notification_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        "UPDATE users SET unread_notification_count = ("
+        "SELECT COUNT(*) FROM notifications "
+        "WHERE notifications.user_id = users.id AND notifications.read_at IS NULL)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "unread_notification_count")
+    op.drop_index("ix_notifications_user_read_created", table_name="notifications")
@@ -0,0 +1,23 @@
+"""add notification digest counts
+
+Revision ID: 20261103_notification_digests
+Revises: 20261102_notification_unread
+Create Date: 2026-11-03
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261103_notification_digests"
+down_revision = "20261102_notification_unread"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("notifications", sa.Column("digest_counts", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("notifications", "digest_counts")
@@ -0,0 +1,31 @@
+"""add notification read history index
+
+Revision ID: 20261105_notification_read
+Revises: 20261104_email_outbox
+Create Date: 2026-11-05
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261105_notification_read"
+down_revision = "20261104_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The read phase of the inbox filters read_at IS NOT NULL and orders by
+    # created_at; (user_id, read_at, created_at) would still sort every read row.
+    op.create_index(
+        "ix_notifications_user_read_history",
+        "notifications",
+        ["user_id", "created_at", "id"],
+        postgresql_where=sa.text("read_at IS NOT NULL"),
+        sqlite_where=sa.text("read_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notifications_user_read_history", table_name="notifications")
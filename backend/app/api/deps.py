@@ -1,10 +1,11 @@
 ﻿"""API Dependencies - Reusable dependency functions"""
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.models.user import User, UserRole
+from app.services.data_version import build_etag, etag_matches
 from app.utils.jwt import decode_token
 
 # OAuth2 scheme for token authentication
@@ -30,6 +31,34 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
+    return user_from_token(token, db)
+
+
+def get_current_stream_user(
+    token: Optional[str] = Depends(oauth2_scheme),
+    access_token: Optional[str] = Query(None, description="Bearer token for clients that cannot set headers (EventSource, WebSocket)"),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to authenticate long-lived streaming requests.
+    
+    Browsers cannot attach an Authorization header to EventSource, so the
+    access token may also be passed as the ``access_token`` query parameter.
+    Inactive users are rejected like in get_current_active_user.
+    
+    Args:
+        token: JWT token from request header
+        access_token: JWT token from query string
+        db: Database session
+        
+    Returns:
+        Active user object
+    """
+    return get_current_active_user(user_from_token(token or access_token, db))
+
+
+def user_from_token(token: Optional[str], db: Session) -> User:
+    """Resolve a JWT access token to a user or raise 401."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -102,3 +131,33 @@ def get_current_admin(
         )
     
     return current_user
+
+
+def check_data_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_active_user)
+) -> None:
+    """
+    Dependency for conditional GETs on user-scoped reads.
+    
+    Emits an ETag derived from the user's data version and short-circuits with
+    304 Not Modified when the client already holds the current representation,
+    so the endpoint body (and its aggregation queries) never runs.
+    
+    Args:
+        request: Incoming request (path, query string and If-None-Match)
+        response: Response whose headers receive the ETag
+        current_user: Current active user
+        
+    Raises:
+        HTTPException: 304 when If-None-Match matches the current ETag
+    """
+    scope = f"{request.url.path}?{request.url.query}"
+    etag = build_etag(current_user, scope)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
@@ -2,19 +2,25 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session as DBSession
 from sqlalchemy import or_, and_, func
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
 
 from app.models.user import User, UserRole
 from app.models.session import Session as SessionModel
 from app.models.user import User
 from app.models.admin_audit_log import AdminAuditLog
+from app.models.group import GroupMember
+from app.models.job import JobLease, JobRun
 from app.schemas.admin import (
     UserUpdateByAdmin, UserListResponse, PaginatedUsersResponse,
-    SessionListItemResponse, PaginatedSessionsResponse
+    SessionListItemResponse, PaginatedSessionsResponse,
+    JobRunResponse, JobStatusResponse
 )
 from app.api.deps import get_current_admin
 from app.core.db import get_db
+from app.services.groups import adjust_member_count
+from app.services.pagination import decode_cursor, decode_datetime, encode_cursor, estimate_count
+from app.services.user_search import search_users
 
 
 router = APIRouter()
@@ -43,6 +49,7 @@ def create_audit_log(
 @router.get("/users", response_model=PaginatedUsersResponse)
 def list_users(
     search: Optional[str] = Query(None, description="Search by username or email"),
+    mode: Literal["substring", "prefix"] = Query("substring", description="Search mode"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     current_admin: User = Depends(get_current_admin),
@@ -51,10 +58,13 @@ def list_users(
     """
     List all users with pagination and optional search.
     
-    Admin only. Searches across username and email fields.
+    Admin only. Searches across username and email fields through the
+    indexed user search; matches are ranked exact > prefix > substring and
+    capped, in which case ``total_is_capped`` is set.
     
     Args:
         search: Optional search query for username/email
+        mode: "substring" match anywhere, or "prefix" for typeahead
         page: Page number (starting from 1)
         page_size: Number of items per page (max 100)
         current_admin: Current admin user
@@ -63,24 +73,25 @@ def list_users(
     Returns:
         Paginated list of users
     """
-    # Build query
-    query = db.query(User)
+    offset = (page - 1) * page_size
     
-    # Apply search filter if provided
-    if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                User.username.ilike(search_pattern),
-                User.email.ilike(search_pattern)
-            )
+    # Indexed, ranked search if a term is provided
+    if search and search.strip():
+        users, total, capped = search_users(db, search, mode, offset, page_size)
+        return PaginatedUsersResponse(
+            total=total,
+            total_is_capped=capped,
+            page=page,
+            page_size=page_size,
+            users=[UserListResponse.from_orm(user) for user in users]
         )
     
+    query = db.query(User)
+    
     # Get total count
     total = query.count()
     
     # Apply pagination
-    offset = (page - 1) * page_size
     users = query.order_by(User.created_at.desc()).offset(offset).limit(page_size).all()
     
     return PaginatedUsersResponse(
@@ -162,6 +173,8 @@ def list_sessions(
     category_id: Optional[int] = Query(None, description="Filter by category ID"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's next_cursor"),
+    total_mode: Literal["exact", "estimate", "none"] = Query("exact", description="How to compute total"),
     current_admin: User = Depends(get_current_admin),
     db: DBSession = Depends(get_db)
 ):
@@ -169,19 +182,27 @@ def list_sessions(
     List sessions with filters and pagination.
     
     Admin only. Supports filtering by user, time range, and category.
+    Sessions are ordered by (start_time, id) descending. Passing ``cursor``
+    switches from offset paging to keyset paging, whose cost does not grow
+    with page depth; ``total_mode`` can skip or approximate the total count.
     
     Args:
         user_id: Optional filter by user ID
         start: Optional filter by start time (inclusive)
         end: Optional filter by end time (inclusive)
         category_id: Optional filter by category ID
-        page: Page number (starting from 1)
+        page: Page number (starting from 1), ignored when cursor is given
         page_size: Number of items per page (max 100)
+        cursor: Opaque cursor returned as next_cursor by the previous page
+        total_mode: "exact" count, planner/cached "estimate", or "none"
         current_admin: Current admin user
         db: Database session
         
     Returns:
         Paginated list of sessions
+        
+    Raises:
+        HTTPException: If the cursor is malformed
     """
     # Build query
     query = db.query(SessionModel)
@@ -202,11 +223,32 @@ def list_sessions(
         query = query.filter(SessionModel.category_id == category_id)
     
     # Get total count
-    total = query.count()
+    total = None
+    if total_mode == "exact":
+        total = query.count()
+    elif total_mode == "estimate":
+        total = estimate_count(db, query)
     
     # Apply pagination
-    offset = (page - 1) * page_size
-    sessions = query.order_by(SessionModel.start_time.desc()).offset(offset).limit(page_size).all()
+    query = query.order_by(SessionModel.start_time.desc(), SessionModel.id.desc())
+    if cursor is not None:
+        cursor_start, cursor_id = decode_cursor(cursor, 2)
+        cursor_start = decode_datetime(cursor_start)
+        if not isinstance(cursor_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        query = query.filter(
+            or_(
+                SessionModel.start_time < cursor_start,
+                and_(SessionModel.start_time == cursor_start, SessionModel.id < cursor_id),
+            )
+        )
+    else:
+        query = query.offset((page - 1) * page_size)
+    # Fetch one extra row to know whether another page exists
+    sessions = query.limit(page_size + 1).all()
+    has_more = len(sessions) > page_size
+    sessions = sessions[:page_size]
+    next_cursor = encode_cursor(sessions[-1].start_time, sessions[-1].id) if has_more else None
 
     # Fetch usernames to avoid N+1
     user_ids = {s.user_id for s in sessions}
@@ -230,8 +272,10 @@ def list_sessions(
     
     return PaginatedSessionsResponse(
         total=total,
+        total_is_estimate=total_mode == "estimate",
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
         sessions=session_items
     )
 
@@ -394,6 +438,13 @@ def delete_user(
         "role": user.role.value if isinstance(user.role, UserRole) else user.role
     }
     
+    # The cascade removes memberships without touching the denormalized counts
+    for (group_id,) in db.query(GroupMember.group_id).filter(
+        GroupMember.user_id == user.id,
+        GroupMember.is_active == True,
+    ).all():
+        adjust_member_count(group_id, -1, db)
+
     # Delete user (cascade delete will handle related records)
     db.delete(user)
     db.commit()
@@ -435,3 +486,53 @@ def list_audit_logs(
     ).limit(limit).all()
     
     return [AuditLogResponse.from_orm(log) for log in logs]
+
+
+@router.get("/jobs", response_model=list[JobStatusResponse])
+def list_jobs(
+    current_admin: User = Depends(get_current_admin),
+    db: DBSession = Depends(get_db)
+):
+    """
+    List scheduled jobs with their lease and latest run.
+    
+    Admin only. A job appears once it has been claimed by a worker.
+    """
+    latest_ids = db.query(func.max(JobRun.id)).group_by(JobRun.job_name).subquery()
+    latest = {
+        run.job_name: run
+        for run in db.query(JobRun).filter(JobRun.id.in_(db.query(latest_ids))).all()
+    }
+    leases = db.query(JobLease).order_by(JobLease.job_name).all()
+    return [
+        JobStatusResponse(
+            job_name=lease.job_name,
+            owner=lease.owner,
+            locked_until=lease.locked_until,
+            last_slot=lease.last_slot,
+            last_run=JobRunResponse.model_validate(latest[lease.job_name]) if lease.job_name in latest else None,
+        )
+        for lease in leases
+    ]
+
+
+@router.get("/jobs/runs", response_model=list[JobRunResponse])
+def list_job_runs(
+    job_name: Optional[str] = Query(None, description="Only runs of this job"),
+    status_filter: Optional[Literal["running", "succeeded", "failed", "abandoned"]] = Query(None, alias="status"),
+    limit: int = Query(50, ge=1, le=500, description="Number of runs to return"),
+    current_admin: User = Depends(get_current_admin),
+    db: DBSession = Depends(get_db)
+):
+    """
+    List scheduled job runs, newest first.
+    
+    Admin only. Each run records its worker, slot, outcome, rows processed
+    and error if any.
+    """
+    query = db.query(JobRun)
+    if job_name:
+        query = query.filter(JobRun.job_name == job_name)
+    if status_filter:
+        query = query.filter(JobRun.status == status_filter)
+    return query.order_by(JobRun.started_at.desc(), JobRun.id.desc()).limit(limit).all()
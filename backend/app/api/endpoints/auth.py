@@ -1,6 +1,5 @@
 ﻿"""Authentication Endpoints"""
 from datetime import datetime
-import logging
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from app.core.config import settings
@@ -28,11 +27,10 @@ from app.utils.jwt import (
     verify_password_reset_fingerprint,
 )
 from app.utils.rate_limit import is_rate_limited
-from app.utils.email import send_email, build_reset_email
+from app.services.email_outbox import enqueue_email
+from app.utils.email import build_reset_email
 
 
-logger = logging.getLogger(__name__)
-
 router = APIRouter()
 
 
@@ -90,7 +88,8 @@ def register(user_data: UserRegister, db: Session = Depends(get_db)):
         username=user_data.username,
         password_hash=hash_password(user_data.password),
         role=UserRole.USER.value,  # Default role uses enum value
-        is_active=True
+        is_active=True,
+        timezone=user_data.timezone or "UTC",
     )
     
     db.add(new_user)
@@ -221,7 +220,7 @@ def refresh_token(token_data: TokenRefresh, db: Session = Depends(get_db)):
 
 @router.post("/forgot-password")
 def forgot_password(payload: ForgotPasswordRequest, request: Request, db: Session = Depends(get_db)):
-    """Issue a reset token for password recovery and send via email."""
+    """Issue a reset token for password recovery and queue it for email delivery."""
     normalized_email = payload.email.lower()
     _enforce_rate_limit(
         key=f"forgot-password:{_client_host(request)}:{normalized_email}",
@@ -237,13 +236,10 @@ def forgot_password(payload: ForgotPasswordRequest, request: Request, db: Sessio
             "sub": str(user.id),
             RESET_PASSWORD_FINGERPRINT_CLAIM: create_password_reset_fingerprint(user.password_hash),
         })
-        try:
-            subject, body = build_reset_email(user.email, reset_token)
-            send_email(user.email, subject, body)
-        except Exception as exc:  # pragma: no cover - side effect
-            logger.exception("Failed to send reset email: %s", exc)
-            # Do not leak SMTP errors to client; keep response generic to avoid user enumeration.
-            pass
+        subject, body = build_reset_email(user.email, reset_token)
+        # Delivered by the outbox job, so SMTP latency and errors never reach the client.
+        enqueue_email(db, user.email, subject, body)
+        db.commit()
 
     # Always respond 200 to avoid user enumeration
     return {
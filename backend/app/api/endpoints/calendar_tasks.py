@@ -1,5 +1,5 @@
 """Calendar task endpoints."""
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -18,6 +18,8 @@ from app.schemas.calendar_task import (
     CalendarTaskStatus,
     CalendarTaskUpdate,
 )
+from app.services.category_loader import CategoryLoader
+from app.services.reminders import due_reminder_tasks, reminder_time
 
 
 router = APIRouter()
@@ -52,17 +54,10 @@ def _get_task(task_id: int, user_id: int, db: DBSession) -> CalendarTask:
     return task
 
 
-def _task_response(task: CalendarTask, db: DBSession) -> CalendarTaskResponse:
-    category_name = None
-    category_color = None
-    if task.category_id is not None:
-        category = db.query(Category).filter(
-            Category.id == task.category_id,
-            Category.user_id == task.user_id,
-        ).first()
-        if category:
-            category_name = category.name
-            category_color = category.color
+def _task_response(task: CalendarTask, categories: CategoryLoader) -> CalendarTaskResponse:
+    category = categories.get(task.category_id)
+    category_name = category.name if category else None
+    category_color = category.color if category else None
 
     return CalendarTaskResponse(
         id=task.id,
@@ -102,22 +97,10 @@ def get_due_reminders(
 ):
     """Get reminder-enabled scheduled tasks whose reminder window has arrived."""
     current_time = _ensure_timezone(now) or datetime.now(timezone.utc)
-    tasks = db.query(CalendarTask).filter(
-        CalendarTask.user_id == current_user.id,
-        CalendarTask.status == "scheduled",
-        CalendarTask.reminder_enabled == True,
-        CalendarTask.reminder_fired_at.is_(None),
-        CalendarTask.scheduled_start.isnot(None),
-    ).order_by(CalendarTask.scheduled_start.asc(), CalendarTask.id.asc()).all()
-
-    due = []
-    for task in tasks:
-        reminder_minutes = task.reminder_minutes_before if task.reminder_minutes_before is not None else 10
-        reminder_time = _ensure_timezone(task.scheduled_start) - timedelta(minutes=reminder_minutes)
-        if reminder_time <= current_time:
-            due.append(_task_response(task, db))
-
-    return due
+    tasks = due_reminder_tasks(db, current_time, [current_user.id])
+    categories = CategoryLoader(db, current_user.id)
+    categories.prime(task.category_id for task in tasks)
+    return [_task_response(task, categories) for task in tasks]
 
 
 @router.get("", response_model=list[CalendarTaskResponse])
@@ -157,7 +140,9 @@ def list_calendar_tasks(
         CalendarTask.created_at.desc(),
         CalendarTask.id.desc(),
     ).all()
-    return [_task_response(task, db) for task in tasks]
+    categories = CategoryLoader(db, current_user.id)
+    categories.prime(task.category_id for task in tasks)
+    return [_task_response(task, categories) for task in tasks]
 
 
 @router.post("", response_model=CalendarTaskResponse, status_code=status.HTTP_201_CREATED)
@@ -186,7 +171,7 @@ def create_calendar_task(
     db.add(task)
     db.commit()
     db.refresh(task)
-    return _task_response(task, db)
+    return _task_response(task, CategoryLoader(db, current_user.id))
 
 
 @router.patch("/{task_id}", response_model=CalendarTaskResponse)
@@ -199,6 +184,7 @@ def update_calendar_task(
     """Update a current user's calendar task."""
     task = _get_task(task_id, current_user.id, db)
     payload = task_data.model_dump(exclude_unset=True)
+    previous_reminder = reminder_time(task) if task.reminder_enabled else None
 
     if "category_id" in payload:
         _validate_category_ownership(payload.get("category_id"), current_user.id, db)
@@ -227,10 +213,13 @@ def update_calendar_task(
 
     if task.status != "scheduled":
         task.reminder_fired_at = None
+    elif task.reminder_enabled and reminder_time(task) != previous_reminder:
+        # Moved or re-timed reminders fire again at their new instant.
+        task.reminder_fired_at = None
 
     db.commit()
     db.refresh(task)
-    return _task_response(task, db)
+    return _task_response(task, CategoryLoader(db, current_user.id))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -289,7 +278,7 @@ def complete_calendar_task(
     task.reminder_fired_at = task.reminder_fired_at or datetime.now(timezone.utc)
     db.commit()
     db.refresh(task)
-    return _task_response(task, db)
+    return _task_response(task, CategoryLoader(db, current_user.id))
 
 
 @router.post("/{task_id}/reminder-fired", response_model=CalendarTaskResponse)
@@ -303,4 +292,4 @@ def mark_reminder_fired(
     task.reminder_fired_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(task)
-    return _task_response(task, db)
+    return _task_response(task, CategoryLoader(db, current_user.id))
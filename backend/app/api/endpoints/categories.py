@@ -8,7 +8,8 @@ from app.models.user import User
 from app.models.category import Category
 from app.models.quick_start_template import QuickStartTemplate
 from app.schemas.category import CategoryCreate, CategoryReorder, CategoryUpdate, CategoryResponse
-from app.api.deps import get_current_active_user
+from app.services.target_progress import invalidate_user_progress
+from app.api.deps import check_data_etag, get_current_active_user
 
 router = APIRouter()
 
@@ -66,7 +67,7 @@ def create_category(
     return new_category
 
 
-@router.get("", response_model=List[CategoryResponse])
+@router.get("", response_model=List[CategoryResponse], dependencies=[Depends(check_data_etag)])
 def list_categories(
     include_archived: bool = False,
     current_user: User = Depends(get_current_active_user),
@@ -263,8 +264,10 @@ def delete_category(
         )
     
     if hard_delete:
-        # Permanent delete
+        # Permanent delete; sessions lose the category through ON DELETE SET NULL,
+        # which the progress cache does not see.
         db.delete(category)
+        invalidate_user_progress(db, current_user.id)
     else:
         # Soft delete (archive)
         category.is_archived = True
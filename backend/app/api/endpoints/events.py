@@ -0,0 +1,72 @@
+"""Server-Sent Events stream for per-user live state."""
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session as DBSession
+
+from app.api.deps import get_current_stream_user
+from app.core.db import get_db
+from app.models.user import User
+from app.services.events import hub
+
+
+router = APIRouter()
+
+HEARTBEAT_SECONDS = 15.0
+RETRY_MILLISECONDS = 3000
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    current_user: User = Depends(get_current_stream_user),
+    db: DBSession = Depends(get_db),
+):
+    """
+    Stream live events for the current user.
+
+    Pushes ``session_started``/``session_stopped``, ``notification`` and
+    ``reminder_due`` events. Reconnecting clients send ``Last-Event-ID`` to
+    replay what they missed; when the gap can no longer be replayed, or the id
+    comes from another server process, a ``resync`` event tells the client to
+    refetch its state once.
+    """
+    user_id = current_user.id
+    # Authentication is done; do not hold a pooled connection for the stream lifetime.
+    db.close()
+
+    subscription, replay, complete = hub.subscribe(user_id, last_event_id)
+
+    async def event_source():
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            if not complete:
+                yield "event: resync\ndata: {}\n\n"
+            for item in replay:
+                yield item.encode()
+
+            last_sent = replay[-1].id if replay else 0
+            while not await request.is_disconnected():
+                try:
+                    item = await asyncio.wait_for(subscription.queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                if item.id <= last_sent:
+                    continue
+                last_sent = item.id
+                yield item.encode()
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -1,35 +1,49 @@
 """Group APIs for lightweight group chat and sharing."""
+import asyncio
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, WebSocket, WebSocketDisconnect, status
 from sqlalchemy import func
 from sqlalchemy.orm import Session as DBSession
+from starlette.concurrency import run_in_threadpool
 
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, user_from_token
 from app.core.db import get_db
-from app.models.group import Group, GroupMember, GroupMessage
-from app.models.notification import Notification
+from app.models.group import Group, GroupMember
 from app.models.user import User
 from app.schemas.group import (
     GroupCardShareCreate,
     GroupCreate,
     GroupJoin,
+    GroupLeaderboardResponse,
     GroupMemberResponse,
+    GroupMembersBoardResponse,
     GroupMessageCreate,
     GroupMessageResponse,
+    GroupMessageSearchResponse,
+    GroupPresenceResponse,
     GroupPublicRequestCreate,
     GroupResponse,
     GroupUpdate,
 )
+from app.services.group_channels import broadcast_member_removed, broadcast_message, channels
+from app.services.daily_status import mark_status_stale, today_status
+from app.services.leaderboard import LeaderboardRange, group_leaderboard, range_bounds
+from app.services.members_board import members_board
+from app.services.message_archive import message_page_rows, messages_by_id
+from app.services.notifications import add_notification
+from app.services.presence import group_presence
+from app.services.public_directory import invalidate_public_directory_after_commit, public_directory
+from app.services.search import GROUP_MESSAGE, search_documents
 from app.services.groups import (
-    active_member_count,
-    build_today_status,
+    active_roles_by_group,
+    adjust_member_count,
     create_group_message,
-    ensure_public_exam_group,
     generate_invite_code,
-    get_active_membership,
     get_group_for_member,
-    parse_metadata,
+    message_page_json,
+    message_response,
     require_admin_or_owner,
     require_member,
     save_daily_snapshot,
@@ -39,7 +53,7 @@ from app.services.groups import (
 router = APIRouter()
 
 
-def _group_response(group: Group, member: GroupMember, db: DBSession) -> GroupResponse:
+def _group_response(group: Group, role: Optional[str]) -> GroupResponse:
     return GroupResponse(
         id=group.id,
         name=group.name,
@@ -49,40 +63,14 @@ def _group_response(group: Group, member: GroupMember, db: DBSession) -> GroupRe
         visibility=group.visibility,
         created_at=group.created_at,
         updated_at=group.updated_at,
-        member_count=active_member_count(group.id, db),
-        my_role=member.role,
-    )
-
-
-def _public_group_response(group: Group, current_user_id: int, db: DBSession) -> GroupResponse:
-    member = get_active_membership(group.id, current_user_id, db)
-    return GroupResponse(
-        id=group.id,
-        name=group.name,
-        description=group.description,
-        owner_id=group.owner_id,
-        invite_code=group.invite_code,
-        visibility=group.visibility,
-        created_at=group.created_at,
-        updated_at=group.updated_at,
-        member_count=active_member_count(group.id, db),
-        my_role=member.role if member else None,
+        member_count=group.member_count,
+        my_role=role,
     )
 
 
 def _message_response(row) -> GroupMessageResponse:
     message, username = row
-    return GroupMessageResponse(
-        id=message.id,
-        group_id=message.group_id,
-        user_id=message.user_id,
-        username=username,
-        message_type=message.message_type,
-        content=message.content,
-        metadata_json=parse_metadata(message.metadata_json),
-        created_at=message.created_at,
-        deleted_at=message.deleted_at,
-    )
+    return message_response(message, username)
 
 
 @router.get("", response_model=list[GroupResponse])
@@ -96,19 +84,19 @@ def list_groups(
         GroupMember.user_id == current_user.id,
         GroupMember.is_active == True,
     ).order_by(Group.updated_at.desc(), Group.id.desc()).all()
-    return [_group_response(group, member, db) for group, member in rows]
+    return [_group_response(group, member.role) for group, member in rows]
 
 
 @router.get("/public", response_model=list[GroupResponse])
 def list_public_groups(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
     current_user: User = Depends(get_current_active_user),
     db: DBSession = Depends(get_db),
 ):
-    ensure_public_exam_group(current_user, db)
-    groups = db.query(Group).filter(
-        Group.visibility == "public",
-    ).order_by(Group.updated_at.desc(), Group.id.desc()).all()
-    return [_public_group_response(group, current_user.id, db) for group in groups]
+    entries = public_directory(db)[offset:offset + limit]
+    roles = active_roles_by_group([entry["id"] for entry in entries], current_user.id, db)
+    return [GroupResponse(**entry, my_role=roles.get(entry["id"])) for entry in entries]
 
 
 @router.post("/public-requests", status_code=status.HTTP_202_ACCEPTED)
@@ -123,12 +111,13 @@ def request_public_group(
 
     admins = db.query(User).filter(User.role == "admin", User.is_active == True).all()
     for admin in admins:
-        db.add(Notification(
+        add_notification(
+            db,
             user_id=admin.id,
             type="group_public_request",
             title="公开小组申请",
             content=f"{current_user.username} 申请公开小组「{name}」。{payload.description or ''}",
-        ))
+        )
     if admins:
         db.commit()
     return {"detail": "公开小组申请已提交给管理员"}
@@ -150,6 +139,7 @@ def create_group(
         owner_id=current_user.id,
         invite_code=generate_invite_code(db),
         visibility=payload.visibility,
+        member_count=1,
     )
     db.add(group)
     db.flush()
@@ -164,7 +154,7 @@ def create_group(
     db.commit()
     db.refresh(group)
     db.refresh(member)
-    return _group_response(group, member, db)
+    return _group_response(group, member.role)
 
 
 @router.get("/{group_id}", response_model=GroupResponse)
@@ -174,7 +164,7 @@ def get_group(
     db: DBSession = Depends(get_db),
 ):
     group, member = get_group_for_member(group_id, current_user.id, db)
-    return _group_response(group, member, db)
+    return _group_response(group, member.role)
 
 
 @router.patch("/{group_id}", response_model=GroupResponse)
@@ -201,7 +191,7 @@ def update_group(
 
     db.commit()
     db.refresh(group)
-    return _group_response(group, member, db)
+    return _group_response(group, member.role)
 
 
 @router.post("/join", response_model=GroupResponse)
@@ -229,11 +219,16 @@ def join_group(
         should_announce = True
 
     if should_announce:
+        adjust_member_count(group.id, 1, db)
+        if group.visibility == "public":
+            invalidate_public_directory_after_commit(db)
         create_group_message(group.id, current_user.id, "system", f"{current_user.username} 加入了小组。", None, db)
+        # Rank the new member with the time they already logged today.
+        mark_status_stale(db, current_user.id, [datetime.now(timezone.utc).date()])
     db.commit()
     db.refresh(member)
     db.refresh(group)
-    return _group_response(group, member, db)
+    return _group_response(group, member.role)
 
 
 @router.post("/{group_id}/leave", status_code=status.HTTP_204_NO_CONTENT)
@@ -247,8 +242,12 @@ def leave_group(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Owner cannot leave group in MVP")
 
     member.is_active = False
+    adjust_member_count(group.id, -1, db)
+    if group.visibility == "public":
+        invalidate_public_directory_after_commit(db)
     create_group_message(group.id, current_user.id, "system", f"{current_user.username} 退出了小组。", None, db)
     db.commit()
+    broadcast_member_removed(group.id, current_user.id)
     return None
 
 
@@ -283,6 +282,53 @@ def list_members(
     ]
 
 
+@router.get("/{group_id}/members/board", response_model=GroupMembersBoardResponse)
+def get_members_board(
+    group_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_db),
+):
+    """Today's total, top category and target completion of every member."""
+    require_member(group_id, current_user.id, db)
+    day, entries = members_board(group_id, db)
+    return GroupMembersBoardResponse(group_id=group_id, date=day, entries=entries)
+
+
+@router.get("/{group_id}/leaderboard", response_model=GroupLeaderboardResponse)
+def get_leaderboard(
+    group_id: int,
+    range_: LeaderboardRange = Query("day", alias="range"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_db),
+):
+    """Rank active members by tracked time from daily snapshots."""
+    require_member(group_id, current_user.id, db)
+    start_date, end_date = range_bounds(range_)
+    entries = group_leaderboard(group_id, start_date, end_date, db)
+    me = next((entry for entry in entries if entry["user_id"] == current_user.id), None)
+    return GroupLeaderboardResponse(
+        group_id=group_id,
+        range=range_,
+        start_date=start_date,
+        end_date=end_date,
+        entries=entries[:limit],
+        me=me,
+    )
+
+
+@router.get("/{group_id}/presence", response_model=GroupPresenceResponse)
+def get_presence(
+    group_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_db),
+):
+    """Members timing right now, longest-running first."""
+    require_member(group_id, current_user.id, db)
+    source, entries = group_presence(group_id, db)
+    return GroupPresenceResponse(group_id=group_id, source=source, entries=entries)
+
+
 @router.get("/{group_id}/messages", response_model=list[GroupMessageResponse])
 def list_messages(
     group_id: int,
@@ -292,17 +338,32 @@ def list_messages(
     db: DBSession = Depends(get_db),
 ):
     require_member(group_id, current_user.id, db)
-    query = db.query(GroupMessage, User.username).join(
-        User, User.id == GroupMessage.user_id
-    ).filter(
-        GroupMessage.group_id == group_id,
-        GroupMessage.deleted_at.is_(None),
-    )
-    if before is not None:
-        query = query.filter(GroupMessage.id < before)
+    rows = message_page_rows(group_id, before, limit, db)
+    # Metadata is passed through as stored JSON text instead of being decoded per row.
+    return Response(content=message_page_json(reversed(rows)), media_type="application/json")
 
-    rows = query.order_by(GroupMessage.id.desc()).limit(limit).all()
-    return [_message_response(row) for row in reversed(rows)]
+
+@router.get("/{group_id}/messages/search", response_model=GroupMessageSearchResponse)
+def search_messages(
+    group_id: int,
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_db),
+):
+    """Search the group's chat history, best match first."""
+    require_member(group_id, current_user.id, db)
+    message_ids, has_more = search_documents(
+        db, GROUP_MESSAGE, group_id, q, offset=(page - 1) * page_size, limit=page_size
+    )
+    by_id = messages_by_id(message_ids, db)
+    return GroupMessageSearchResponse(
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        items=[_message_response(by_id[message_id]) for message_id in message_ids if message_id in by_id],
+    )
 
 
 @router.post("/{group_id}/messages", response_model=GroupMessageResponse, status_code=status.HTTP_201_CREATED)
@@ -321,7 +382,9 @@ def create_message(
     db.commit()
     db.refresh(message)
     username = db.query(func.coalesce(User.username, "")).filter(User.id == current_user.id).scalar()
-    return _message_response((message, username))
+    response = _message_response((message, username))
+    broadcast_message(response)
+    return response
 
 
 @router.post("/{group_id}/share-status", response_model=GroupMessageResponse, status_code=status.HTTP_201_CREATED)
@@ -331,12 +394,14 @@ def share_status(
     db: DBSession = Depends(get_db),
 ):
     require_member(group_id, current_user.id, db)
-    content, metadata = build_today_status(current_user.id, db)
+    content, metadata = today_status(current_user.id, db)
     save_daily_snapshot(group_id, current_user.id, metadata, db)
     message = create_group_message(group_id, current_user.id, "status_share", content, metadata, db)
     db.commit()
     db.refresh(message)
-    return _message_response((message, current_user.username))
+    response = _message_response((message, current_user.username))
+    broadcast_message(response)
+    return response
 
 
 @router.post("/{group_id}/share-card", response_model=GroupMessageResponse, status_code=status.HTTP_201_CREATED)
@@ -351,4 +416,59 @@ def share_card(
     message = create_group_message(group_id, current_user.id, "card_share", content, payload.metadata_json, db)
     db.commit()
     db.refresh(message)
-    return _message_response((message, current_user.username))
+    response = _message_response((message, current_user.username))
+    broadcast_message(response)
+    return response
+
+
+@router.websocket("/{group_id}/ws")
+async def group_socket(
+    websocket: WebSocket,
+    group_id: int,
+    access_token: Optional[str] = Query(None),
+    db: DBSession = Depends(get_db),
+):
+    """Push new group messages to a member over a WebSocket.
+
+    Membership is checked once at connect time; leaving the group closes the
+    socket. Client frames are ignored and only serve as keep-alives.
+    """
+    def authorize() -> int:
+        try:
+            user = get_current_active_user(user_from_token(access_token, db))
+            require_member(group_id, user.id, db)
+            return user.id
+        finally:
+            db.close()
+
+    try:
+        user_id = await run_in_threadpool(authorize)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    connection = channels.register(group_id, user_id)
+
+    async def pump() -> None:
+        while True:
+            payload = await connection.queue.get()
+            if payload["kind"] == "member_removed":
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
+            await websocket.send_json({"type": "message", "message": payload["message"]})
+
+    sender = asyncio.create_task(pump())
+    try:
+        while not sender.done():
+            receiver = asyncio.create_task(websocket.receive_text())
+            done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver not in done:
+                receiver.cancel()
+                break
+            receiver.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        channels.unregister(connection)
+        sender.cancel()
@@ -9,7 +9,7 @@ from app.models.user import User
 from app.models.session import Session
 from app.models.category import Category
 from app.schemas.heatmap import HeatmapDay, DaySessionDetail
-from app.api.deps import get_current_active_user
+from app.api.deps import check_data_etag, get_current_active_user
 from app.core.db import get_db
 
 
@@ -33,7 +33,7 @@ def _parse_category_ids(value: Optional[str]) -> Optional[list[int]]:
     return category_ids
 
 
-@router.get("", response_model=List[HeatmapDay])
+@router.get("", response_model=List[HeatmapDay], dependencies=[Depends(check_data_etag)])
 def get_heatmap(
     start: Optional[DateType] = Query(None, description="Start date (YYYY-MM-DD)"),
     end: Optional[DateType] = Query(None, description="End date (YYYY-MM-DD)"),
@@ -1,57 +1,115 @@
 ﻿"""Notifications API Endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import and_, or_
 from sqlalchemy.orm import Session as DBSession
-from datetime import datetime, timezone
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 from app.models.user import User
 from app.models.notification import Notification
-from app.schemas.work_target import NotificationReadAllResponse, NotificationResponse
+from app.schemas.work_target import (
+    NotificationReadAllResponse, NotificationResponse, NotificationUnreadCountResponse
+)
 from app.api.deps import get_current_active_user
 from app.core.db import get_db
+from app.services.data_version import bump_data_version
+from app.services.notifications import mark_all_read, mark_read
+from app.services.pagination import decode_cursor, decode_datetime, encode_cursor
 
 
 router = APIRouter()
 
 
+def _notification_page(
+    db: DBSession,
+    user_id: int,
+    unread: bool,
+    after: Optional[tuple[datetime, int]],
+    limit: int,
+) -> List[Notification]:
+    query = db.query(Notification).filter(
+        Notification.user_id == user_id,
+        Notification.read_at.is_(None) if unread else Notification.read_at.isnot(None),
+    )
+    if after is not None:
+        created_at, notification_id = after
+        query = query.filter(or_(
+            Notification.created_at < created_at,
+            and_(Notification.created_at == created_at, Notification.id < notification_id),
+        ))
+    return query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit).all()
+
+
 @router.get("", response_model=List[NotificationResponse])
 def list_notifications(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200, description="Number of notifications to return"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous page's X-Next-Cursor header"),
     current_user: User = Depends(get_current_active_user),
     db: DBSession = Depends(get_db)
 ):
     """
-    List all notifications for the current user.
+    List notifications for the current user, one page at a time.
+    
+    Unread notifications come first, each group newest first. When more
+    notifications follow, the ``X-Next-Cursor`` response header holds the
+    cursor for the next page.
     
     Args:
+        limit: Page size
+        cursor: Opaque cursor returned by the previous page
         current_user: Current authenticated user
         db: Database session
         
     Returns:
         List of notifications (unread first, then by created_at desc)
+        
+    Raises:
+        HTTPException: If the cursor is malformed
     """
-    notifications = db.query(Notification).filter(
-        Notification.user_id == current_user.id
-    ).order_by(
-        Notification.read_at.is_(None).desc(),  # Unread first
-        Notification.created_at.desc()
-    ).all()
-    
+    unread_phase = True
+    after = None
+    if cursor is not None:
+        phase, cursor_created, cursor_id = decode_cursor(cursor, 3)
+        if phase not in {"unread", "read"} or not isinstance(cursor_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        unread_phase = phase == "unread"
+        after = (decode_datetime(cursor_created), cursor_id)
+
+    # Fetch one extra row to know whether another page follows.
+    notifications = []
+    if unread_phase:
+        notifications = _notification_page(db, current_user.id, True, after, limit + 1)
+        after = None
+    if len(notifications) <= limit:
+        notifications += _notification_page(db, current_user.id, False, after, limit + 1 - len(notifications))
+
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        last = notifications[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            "unread" if last.read_at is None else "read", last.created_at, last.id
+        )
     return notifications
 
 
+@router.get("/unread-count", response_model=NotificationUnreadCountResponse)
+def get_unread_count(
+    current_user: User = Depends(get_current_active_user),
+):
+    """Number of unread notifications, read from the user's maintained counter."""
+    return NotificationUnreadCountResponse(unread_count=current_user.unread_notification_count or 0)
+
+
 @router.post("/read-all", response_model=NotificationReadAllResponse)
 def mark_all_notifications_read(
     current_user: User = Depends(get_current_active_user),
     db: DBSession = Depends(get_db)
 ):
     """Mark every unread notification for the current user as read."""
-    updated_count = db.query(Notification).filter(
-        Notification.user_id == current_user.id,
-        Notification.read_at.is_(None),
-    ).update(
-        {Notification.read_at: datetime.now(timezone.utc)},
-        synchronize_session=False,
-    )
+    updated_count = mark_all_read(db, current_user.id)
+    if updated_count:
+        bump_data_version(db, [current_user.id])
     db.commit()
     return NotificationReadAllResponse(updated_count=updated_count)
 
@@ -88,8 +146,7 @@ def mark_notification_read(
         )
     
     # Mark as read
-    if notification.read_at is None:
-        notification.read_at = datetime.now(timezone.utc)
+    if mark_read(db, notification):
         db.commit()
         db.refresh(notification)
     
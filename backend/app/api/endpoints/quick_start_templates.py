@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as DBSession
 
-from app.api.deps import get_current_active_user
+from app.api.deps import check_data_etag, get_current_active_user
 from app.core.db import get_db
 from app.models.category import Category
 from app.models.quick_start_template import QuickStartTemplate
@@ -19,6 +19,8 @@ from app.schemas.quick_start_template import (
     QuickStartTemplateResponse,
     QuickStartTemplateUpdate,
 )
+from app.services.category_loader import CategoryLoader
+from app.services.events import queue_event, session_event_data
 
 router = APIRouter()
 
@@ -70,15 +72,15 @@ def _validate_category(category_id: int, user_id: int, db: DBSession) -> Categor
     return category
 
 
-def _to_response(template: QuickStartTemplate, db: DBSession) -> QuickStartTemplateResponse:
-    category = db.query(Category).filter(Category.id == template.category_id).first()
+def _to_response(template: QuickStartTemplate, categories: CategoryLoader) -> QuickStartTemplateResponse:
+    category = categories.get(template.category_id)
     return QuickStartTemplateResponse.model_validate({
         **template.__dict__,
         "category_name": category.name if category else None,
     })
 
 
-@router.get("", response_model=List[QuickStartTemplateResponse])
+@router.get("", response_model=List[QuickStartTemplateResponse], dependencies=[Depends(check_data_etag)])
 def list_templates(
     current_user: User = Depends(get_current_active_user),
     db: DBSession = Depends(get_db),
@@ -90,7 +92,9 @@ def list_templates(
         QuickStartTemplate.sort_order.asc(),
         QuickStartTemplate.created_at.asc(),
     ).all()
-    return [_to_response(template, db) for template in templates]
+    categories = CategoryLoader(db, current_user.id)
+    categories.prime(template.category_id for template in templates)
+    return [_to_response(template, categories) for template in templates]
 
 
 @router.post("", response_model=QuickStartTemplateResponse, status_code=status.HTTP_201_CREATED)
@@ -115,7 +119,7 @@ def create_template(
     db.add(template)
     db.commit()
     db.refresh(template)
-    return _to_response(template, db)
+    return _to_response(template, CategoryLoader(db, current_user.id))
 
 
 @router.patch("/{template_id}", response_model=QuickStartTemplateResponse)
@@ -139,7 +143,7 @@ def update_template(
 
     db.commit()
     db.refresh(template)
-    return _to_response(template, db)
+    return _to_response(template, CategoryLoader(db, current_user.id))
 
 
 @router.delete("/{template_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -169,7 +173,7 @@ def start_from_template(
     existing_session = _get_session_by_client_id(current_user.id, start_data.client_generated_id, db)
     if existing_session:
         return QuickStartStartResponse(
-            template=_to_response(template, db),
+            template=_to_response(template, CategoryLoader(db, current_user.id)),
             session=existing_session,
         )
 
@@ -192,19 +196,21 @@ def start_from_template(
     )
     db.add(session)
     try:
+        db.flush()
+        queue_event(db, current_user.id, "session_started", session_event_data(session))
         db.commit()
     except IntegrityError:
         db.rollback()
         existing_session = _get_session_by_client_id(current_user.id, start_data.client_generated_id, db)
         if existing_session:
             return QuickStartStartResponse(
-                template=_to_response(template, db),
+                template=_to_response(template, CategoryLoader(db, current_user.id)),
                 session=existing_session,
             )
         raise
     db.refresh(session)
 
     return QuickStartStartResponse(
-        template=_to_response(template, db),
+        template=_to_response(template, CategoryLoader(db, current_user.id)),
         session=session,
     )
@@ -25,6 +25,8 @@ from app.schemas.review import (
     WeeklyReviewResponse,
     YearlyReviewResponse,
 )
+from app.services.evaluation import _period_bounds
+from app.services.target_progress import load_target_progress
 
 
 router = APIRouter()
@@ -275,6 +277,8 @@ def _active_remaining_seconds(
         WorkTarget.effective_from <= end_dt,
     ).all()
 
+    # Targets whose period is exactly the review range read cached progress.
+    cached_periods = []
     remaining = 0
     for target in targets:
         if target.period == TargetPeriod.TOMORROW.value:
@@ -284,9 +288,16 @@ def _active_remaining_seconds(
             if not (start_dt.date() <= effective.date() <= end_dt.date()):
                 continue
 
+        if _period_bounds(target.period, start_dt.date()) == (start_dt, end_dt):
+            cached_periods.append((target, start_dt, end_dt))
+            continue
         actual = _target_actual_seconds(target, start_dt, end_dt, db)
         remaining += max(0, target.target_seconds - actual)
 
+    progress = load_target_progress(cached_periods, db)
+    for target, period_start, _ in cached_periods:
+        remaining += max(0, target.target_seconds - progress[(target.id, period_start)])
+
     return remaining
 
 
@@ -302,6 +313,8 @@ def _target_summary(
     missed_count = sum(1 for item in evaluations if item.status == EvaluationStatus.MISSED.value)
     evaluated_remaining = sum(item.deficit_seconds for item in evaluations)
     remaining = evaluated_remaining or _active_remaining_seconds(user_id, start_dt, end_dt, active_periods, db)
+    # Keep progress rows built by this read.
+    db.commit()
 
     return ReviewTargetSummary(
         total_count=len(evaluations),
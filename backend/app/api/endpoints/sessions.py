@@ -14,6 +14,8 @@ from app.schemas.session import (
     SessionResponse, ActiveSessionResponse, SessionAdjustMultiplier
 )
 from app.api.deps import get_current_active_user
+from app.services.events import queue_event, session_event_data
+from app.services.presence import sync_user_presence
 
 router = APIRouter()
 
@@ -151,6 +153,8 @@ def start_session(
     
     db.add(new_session)
     try:
+        db.flush()
+        queue_event(db, current_user.id, "session_started", session_event_data(new_session))
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -213,6 +217,7 @@ def stop_session(
     if session_data.note:
         active_session.note = session_data.note
     
+    queue_event(db, current_user.id, "session_stopped", session_event_data(active_session))
     db.commit()
     db.refresh(active_session)
     
@@ -332,6 +337,7 @@ def get_active_session(
         Active session or None
     """
     active_session = _get_active_session(current_user.id, db)
+    sync_user_presence(current_user.id, active_session, db)
     
     if not active_session:
         return None
@@ -9,7 +9,7 @@ from app.models.user import User
 from app.models.session import Session
 from app.models.category import Category
 from app.schemas.stats import StatsSummary, CategoryStats
-from app.api.deps import get_current_active_user
+from app.api.deps import check_data_etag, get_current_active_user
 from app.core.db import get_db
 
 
@@ -83,7 +83,7 @@ def _get_time_range(
         )
 
 
-@router.get("/summary", response_model=StatsSummary)
+@router.get("/summary", response_model=StatsSummary, dependencies=[Depends(check_data_etag)])
 def get_stats_summary(
     range_type: Optional[str] = Query(None, alias="range", description="Preset range: today, week, or month"),
     start: Optional[datetime] = Query(None, description="Custom start datetime (UTC)"),
@@ -11,7 +11,7 @@ from app.schemas.work_target import (
     WorkTargetResponse,
     WorkTargetUpdate,
 )
-from app.api.deps import get_current_active_user
+from app.api.deps import check_data_etag, get_current_active_user
 from app.core.db import get_db
 from app.services.evaluation import build_target_dashboard
 
@@ -74,13 +74,16 @@ def list_targets(
     return targets
 
 
-@router.get("/dashboard", response_model=TargetDashboardResponse)
+@router.get("/dashboard", response_model=TargetDashboardResponse, dependencies=[Depends(check_data_etag)])
 def get_target_dashboard(
     current_user: User = Depends(get_current_active_user),
     db: DBSession = Depends(get_db)
 ):
     """Get target streaks, current progress, and debt/compensation events."""
-    return build_target_dashboard(current_user.id, db)
+    dashboard = build_target_dashboard(current_user.id, db)
+    # Keep progress rows built by this read.
+    db.commit()
+    return dashboard
 
 
 @router.patch("/{target_id}", response_model=WorkTargetResponse)
@@ -7,7 +7,8 @@ from app.api.deps import get_current_active_user
 from app.core.db import get_db
 from app.models.time_trace import TimeTrace
 from app.models.user import User
-from app.schemas.time_trace import TimeTraceCreate, TimeTraceResponse
+from app.schemas.time_trace import TimeTraceCreate, TimeTraceResponse, TimeTraceSearchResponse
+from app.services.search import TIME_TRACE, search_documents
 
 
 router = APIRouter()
@@ -29,6 +30,30 @@ def list_time_traces(
     )
 
 
+@router.get("/search", response_model=TimeTraceSearchResponse)
+def search_time_traces(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_active_user),
+    db: DBSession = Depends(get_db),
+):
+    """Search the current user's notes, best match first."""
+    trace_ids, has_more = search_documents(
+        db, TIME_TRACE, current_user.id, q, offset=(page - 1) * page_size, limit=page_size
+    )
+    traces = {
+        trace.id: trace
+        for trace in db.query(TimeTrace).filter(TimeTrace.id.in_(trace_ids)).all()
+    } if trace_ids else {}
+    return TimeTraceSearchResponse(
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        items=[traces[trace_id] for trace_id in trace_ids if trace_id in traces],
+    )
+
+
 @router.post("", response_model=TimeTraceResponse, status_code=status.HTTP_201_CREATED)
 def create_time_trace(
     payload: TimeTraceCreate,
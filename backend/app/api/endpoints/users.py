@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from app.core.db import get_db
 from app.models.user import User
-from app.schemas.user import UserResponse
+from app.schemas.user import UserResponse, UserUpdate
 from app.api.deps import get_current_active_user, get_current_admin
 
 router = APIRouter()
@@ -27,6 +27,33 @@ def get_current_user_info(
     return current_user
 
 
+@router.patch("/me", response_model=UserResponse)
+def update_current_user(
+    user_data: UserUpdate,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update current user settings.
+    
+    The timezone decides where local days start and end for target
+    evaluation and progress.
+    
+    Args:
+        user_data: Fields to update
+        current_user: Current authenticated user from dependency
+        db: Database session
+        
+    Returns:
+        Updated user information
+    """
+    if user_data.timezone is not None:
+        current_user.timezone = user_data.timezone
+    db.commit()
+    db.refresh(current_user)
+    return current_user
+
+
 @router.get("/admin-only")
 def admin_only_route(
     current_admin: User = Depends(get_current_admin)
@@ -1,6 +1,6 @@
 ﻿"""API Router - Aggregates all API routes"""
 from fastapi import APIRouter
-from .endpoints import health, auth, users, categories, sessions, stats, heatmap, targets, evaluations, notifications, admin, time_traces, reviews, groups, quick_start_templates, calendar_tasks
+from .endpoints import health, auth, users, categories, sessions, stats, heatmap, targets, evaluations, notifications, admin, time_traces, reviews, groups, quick_start_templates, calendar_tasks, events
 
 # Create main API router
 api_router = APIRouter()
@@ -52,6 +52,9 @@ api_router.include_router(calendar_tasks.router, prefix="/calendar-tasks", tags=
 # Include group endpoints
 api_router.include_router(groups.router, prefix="/groups", tags=["groups"])
 
+# Include live event stream endpoints
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+
 # Include admin endpoints
 api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
 
@@ -43,6 +43,29 @@ class Settings(BaseSettings):
     # API
     API_V1_PREFIX: str = "/api/v1"
 
+    # Group chat fan-out between workers: "auto", "postgres" or "local"
+    GROUP_BACKPLANE: str = "auto"
+    # Group presence source: "auto", "memory" (needs a shared backplane across workers) or "database"
+    GROUP_PRESENCE: str = "auto"
+    # Messages older than this many days (and soft-deleted ones) move to the archive table
+    GROUP_MESSAGE_ARCHIVE_DAYS: int = 90
+    # Seconds between reminder engine ticks; a tick with nothing due does not query the database
+    REMINDER_TICK_SECONDS: int = 10
+    # Each worker reloads upcoming reminders this often, picking up tasks written by other workers
+    REMINDER_RESYNC_SECONDS: int = 300
+    # Reminders due within this many minutes are loaded into the in-memory schedule
+    REMINDER_HORIZON_MINUTES: int = 60
+    # Unfired reminders of tasks that started more than this many minutes ago are not fired late
+    REMINDER_GRACE_MINUTES: int = 60
+    # Reminders fired per committed batch
+    REMINDER_BATCH_SIZE: int = 500
+    # Read notifications older than this many days are collapsed into weekly digests
+    NOTIFICATION_DIGEST_AFTER_DAYS: int = 30
+    # Weekly digests older than this many days are deleted
+    NOTIFICATION_DIGEST_RETENTION_DAYS: int = 365
+    # Rows handled per committed chunk of the notification retention job
+    NOTIFICATION_RETENTION_BATCH_SIZE: int = 1000
+
     # SMTP / Email
     SMTP_HOST: Optional[str] = None
     SMTP_PORT: int = 465
@@ -51,6 +74,16 @@ class Settings(BaseSettings):
     SMTP_FROM: Optional[str] = None
     SMTP_TLS: bool = False
     SMTP_SSL: bool = True
+    # Seconds between outbox drains in each worker
+    EMAIL_OUTBOX_INTERVAL_SECONDS: int = 15
+    # Emails claimed per outbox batch
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    # SMTP sender threads (and open connections) across all workers
+    EMAIL_OUTBOX_CONCURRENCY: int = 2
+    # Send attempts before an email is marked failed
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 6
+    # Delay before the first retry; doubles with every further failure
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = 60
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -2,6 +2,7 @@
 
 - Ensures tables exist when migrations were not run (useful for local dev).
 - Creates a default admin user when enabled via settings.
+- Creates the shared public exam group, so public listings stay read-only.
 """
 from typing import Tuple
 from sqlalchemy.orm import Session
@@ -10,15 +11,22 @@ from app.core.db import Base, SessionLocal, engine
 from app.core.config import settings
 from app.models.admin_audit_log import AdminAuditLog  # noqa: F401
 from app.models.category import Category  # noqa: F401
-from app.models.group import Group, GroupDailySnapshot, GroupMember, GroupMessage  # noqa: F401
+from app.models.email_outbox import EmailOutbox  # noqa: F401
+from app.models.group import Group, GroupDailySnapshot, GroupMember, GroupMessage, GroupMessageArchive  # noqa: F401
+from app.models.job import JobLease, JobRun  # noqa: F401
 from app.models.notification import Notification  # noqa: F401
 from app.models.punishment_event import PunishmentEvent  # noqa: F401
 from app.models.quick_start_template import QuickStartTemplate  # noqa: F401
+from app.models.search_document import SearchDocument  # noqa: F401
 from app.models.session import Session  # noqa: F401
+from app.models.target_progress import TargetProgress  # noqa: F401
 from app.models.time_trace import TimeTrace  # noqa: F401
 from app.models.user import User, UserRole
+from app.models.user_daily_status import UserDailyStatus  # noqa: F401
 from app.models.work_evaluation import WorkEvaluation  # noqa: F401
 from app.models.work_target import WorkTarget  # noqa: F401
+from app.services.groups import ensure_public_exam_group
+from app.services.public_directory import invalidate_public_directory
 from app.utils.security import hash_password
 
 
@@ -79,8 +87,23 @@ def ensure_default_admin(db: Session) -> Tuple[User, bool, bool]:
     return admin, created, updated
 
 
+def ensure_public_groups() -> None:
+    """Create the default public groups once an admin exists to own them."""
+    db = SessionLocal()
+    try:
+        group = ensure_public_exam_group(db)
+        if group is None:
+            print("Default public group skipped: no active admin to own it")
+    except Exception as exc:  # pragma: no cover - defensive logging
+        db.rollback()
+        print(f"Failed to ensure default public group: {exc}")
+    finally:
+        db.close()
+    invalidate_public_directory()
+
+
 def init_database() -> None:
-    """Initialize database schema and optional default admin."""
+    """Initialize database schema, optional default admin and default public groups."""
     if settings.AUTO_CREATE_TABLES:
         create_tables_if_missing()
 
@@ -101,3 +124,5 @@ def init_database() -> None:
             raise
         finally:
             db.close()
+
+    ensure_public_groups()
@@ -3,12 +3,21 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime, timezone, timedelta
 from app.core.config import settings
 from app.api.router import api_router
 from app.core.db import SessionLocal
 from app.core.init_db import init_database
-from app.services.evaluation import evaluate_targets_for_date
+from app.services.email_outbox import run_email_outbox_job
+from app.services.evaluation import evaluate_finished_local_days
+from app.services.group_channels import start_backplane, stop_backplane
+from app.services.job_runner import DAILY, HOURLY, run_exclusive_job
+from app.services.message_archive import run_message_archive_job
+from app.services.notification_retention import run_notification_retention_job
+from app.services.presence import load_presence, presence_mode
+from app.services.reminders import fire_due_reminders, has_reminder_work, load_reminders
+from app.services.snapshot_job import run_group_snapshot_job
 
 
 def mask_database_url(database_url: str) -> str:
@@ -51,26 +60,115 @@ app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 scheduler = BackgroundScheduler()
 
 
+def _evaluate_finished_days(db):
+    now = datetime.now(timezone.utc)
+    print(f"[{now}] Running target evaluation for timezones past local midnight...")
+    evaluations = evaluate_finished_local_days(db, now)
+    users = len({evaluation.user_id for evaluation in evaluations})
+    print(f"Created {len(evaluations)} evaluations for {users} users")
+    return len(evaluations), {"users": users}
+
+
 def daily_evaluation_task():
     """
-    Daily task to evaluate all active targets.
-    Runs at 23:59 UTC daily.
+    Evaluate the targets of users whose local day just ended.
+    Runs hourly on the hour, once across all workers.
     """
-    print(f"[{datetime.now(timezone.utc)}] Running daily target evaluation...")
-    
+    run_exclusive_job("daily_evaluation", _evaluate_finished_days, HOURLY)
+
+
+def email_outbox_task():
+    """
+    Send queued transactional email.
+    Runs every EMAIL_OUTBOX_INTERVAL_SECONDS in every worker; rows are claimed one by one.
+    """
+    db = SessionLocal()
+    try:
+        stats = run_email_outbox_job(db)
+        if stats.claimed:
+            print(
+                f"Email outbox: {stats.sent} sent, {stats.retried} retried, {stats.failed} failed "
+                f"over {stats.connections} connections, {stats.elapsed_seconds:.2f}s"
+            )
+    except Exception as e:
+        print(f"Error sending queued email: {e}")
+    finally:
+        db.close()
+
+
+def reminder_task():
+    """
+    Fire due calendar reminders as notifications and live events.
+    Runs every REMINDER_TICK_SECONDS in every worker; the in-memory schedule
+    keeps idle ticks off the database and each reminder fires once overall.
+    """
+    now = datetime.now(timezone.utc)
+    if not has_reminder_work(now):
+        return
     db = SessionLocal()
     try:
-        # Evaluate today's targets
-        today = datetime.now(timezone.utc).date()
-        evaluations = evaluate_targets_for_date(today, db)
-        print(f"Created {len(evaluations)} evaluations for {today}")
+        stats = fire_due_reminders(db, now)
+        if stats.fired:
+            print(f"Fired {stats.fired} calendar reminders in {stats.batches} batches, {stats.elapsed_seconds:.2f}s")
     except Exception as e:
-        print(f"Error in daily evaluation: {e}")
-        db.rollback()
+        print(f"Error firing calendar reminders: {e}")
     finally:
         db.close()
 
 
+def _write_group_snapshots(db):
+    stats = run_group_snapshot_job(db)
+    print(
+        f"Group snapshots for {stats.day}: {stats.rows_written} rows, "
+        f"{stats.users} users in {stats.chunks} chunks, {stats.elapsed_seconds:.2f}s "
+        f"(aggregate {stats.timings['aggregate']:.2f}s, upsert {stats.timings['upsert']:.2f}s)"
+    )
+    return stats.rows_written, stats.as_dict()
+
+
+def group_snapshot_task():
+    """
+    Write today's group snapshots for every active member.
+    Runs hourly, once across all workers.
+    """
+    run_exclusive_job("group_snapshots", _write_group_snapshots, HOURLY)
+
+
+def _archive_messages(db):
+    stats = run_message_archive_job(db)
+    print(
+        f"Archived {stats.moved} group messages ({stats.deleted_moved} deleted) "
+        f"older than {stats.cutoff:%Y-%m-%d} in {stats.batches} batches, {stats.elapsed_seconds:.2f}s"
+    )
+    return stats.moved, stats.as_dict()
+
+
+def message_archive_task():
+    """
+    Move old and soft-deleted group messages to the archive table.
+    Runs at 03:30 UTC daily, once across all workers.
+    """
+    run_exclusive_job("message_archive", _archive_messages, DAILY)
+
+
+def _apply_notification_retention(db):
+    stats = run_notification_retention_job(db)
+    print(
+        f"Notification retention: {stats.digested} read notifications into "
+        f"{stats.digests_created} new / {stats.digests_updated} updated digests, "
+        f"{stats.digests_purged} digests purged in {stats.batches} batches, {stats.elapsed_seconds:.2f}s"
+    )
+    return stats.digested + stats.digests_purged, stats.as_dict()
+
+
+def notification_retention_task():
+    """
+    Collapse old read notifications into weekly digests and purge expired digests.
+    Runs at 04:00 UTC daily, once across all workers.
+    """
+    run_exclusive_job("notification_retention", _apply_notification_retention, DAILY)
+
+
 @app.get("/")
 def root():
     """Root endpoint - API information"""
@@ -94,13 +192,63 @@ async def startup_event():
     # Start scheduler
     scheduler.add_job(
         daily_evaluation_task,
-        trigger=CronTrigger(hour=23, minute=59),  # Run at 23:59 UTC daily
+        trigger=CronTrigger(minute=0),  # Hourly; each timezone is evaluated after its local midnight
         id="daily_evaluation",
         name="Daily Target Evaluation",
         replace_existing=True
     )
+    scheduler.add_job(
+        reminder_task,
+        trigger=IntervalTrigger(seconds=settings.REMINDER_TICK_SECONDS),
+        id="calendar_reminders",
+        name="Calendar Reminders",
+        replace_existing=True
+    )
+    scheduler.add_job(
+        email_outbox_task,
+        trigger=IntervalTrigger(seconds=settings.EMAIL_OUTBOX_INTERVAL_SECONDS),
+        id="email_outbox",
+        name="Email Outbox",
+        replace_existing=True
+    )
+    scheduler.add_job(
+        group_snapshot_task,
+        trigger=CronTrigger(minute=5),
+        id="group_snapshots",
+        name="Group Daily Snapshots",
+        replace_existing=True
+    )
+    scheduler.add_job(
+        message_archive_task,
+        trigger=CronTrigger(hour=3, minute=30),
+        id="message_archive",
+        name="Group Message Archive",
+        replace_existing=True
+    )
+    scheduler.add_job(
+        notification_retention_task,
+        trigger=CronTrigger(hour=4, minute=0),
+        id="notification_retention",
+        name="Notification Retention",
+        replace_existing=True
+    )
     scheduler.start()
-    print("Scheduler started: Daily evaluation at 23:59 UTC")
+    print(
+        "Scheduler started: Target evaluation hourly by local midnight, "
+        f"calendar reminders every {settings.REMINDER_TICK_SECONDS}s, "
+        f"email outbox every {settings.EMAIL_OUTBOX_INTERVAL_SECONDS}s, "
+        "group snapshots hourly, message archive at 03:30 UTC, notification retention at 04:00 UTC"
+    )
+
+    start_backplane()
+
+    db = SessionLocal()
+    try:
+        focusing = load_presence(db)
+        print(f"Group presence: {presence_mode()} ({focusing} running timers loaded)")
+        print(f"Calendar reminders: {load_reminders(db)} upcoming reminders loaded")
+    finally:
+        db.close()
 
 
 @app.on_event("shutdown")
@@ -112,3 +260,5 @@ async def shutdown_event():
     if scheduler.running:
         scheduler.shutdown()
         print("Scheduler stopped")
+
+    stop_backplane()
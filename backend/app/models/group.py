@@ -1,5 +1,6 @@
 """Group models for lightweight study groups and chat."""
-from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import JSON, Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 
 from app.core.db import Base
@@ -8,6 +9,7 @@ from app.core.db import Base
 class Group(Base):
     """A user-created study/self-discipline group."""
     __tablename__ = "groups"
+    __table_args__ = (Index("ix_groups_visibility_updated_at", "visibility", "updated_at", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False)
@@ -15,6 +17,7 @@ class Group(Base):
     owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     invite_code = Column(String(32), unique=True, nullable=False, index=True)
     visibility = Column(String(20), nullable=False, default="invite_code")
+    member_count = Column(Integer, nullable=False, default=0, server_default="0")  # Active members, kept in sync on join/leave
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -36,21 +39,45 @@ class GroupMember(Base):
 class GroupMessage(Base):
     """Lightweight group chat message."""
     __tablename__ = "group_messages"
+    __table_args__ = (Index("ix_group_messages_group_id_id", "group_id", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     message_type = Column(String(20), nullable=False, default="text")
     content = Column(Text, nullable=False)
-    metadata_json = Column(Text, nullable=True)
+    metadata_json = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
 
+class GroupMessageArchive(Base):
+    """Cold copy of old or deleted messages, range-partitioned by month on Postgres."""
+    __tablename__ = "group_messages_archive"
+    __table_args__ = (
+        Index("ix_group_messages_archive_group_id_id", "group_id", "id"),
+        {"postgresql_partition_by": "RANGE (archive_month)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # Same id as the hot row it replaced
+    archive_month = Column(Date, primary_key=True)  # First day of the created_at month; partition key
+    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    message_type = Column(String(20), nullable=False, default="text")
+    content = Column(Text, nullable=False)
+    metadata_json = Column(JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class GroupDailySnapshot(Base):
-    """Optional denormalized snapshot for future group dashboards."""
+    """Per-member daily totals, rebuilt when sessions close; feeds group leaderboards."""
     __tablename__ = "group_daily_snapshots"
-    __table_args__ = (UniqueConstraint("group_id", "user_id", "date", name="uq_group_daily_snapshots_group_user_date"),)
+    __table_args__ = (
+        UniqueConstraint("group_id", "user_id", "date", name="uq_group_daily_snapshots_group_user_date"),
+        Index("ix_group_daily_snapshots_group_date", "group_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False, index=True)
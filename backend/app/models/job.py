@@ -0,0 +1,33 @@
+"""Scheduled job bookkeeping - cross-worker leases and run history."""
+from sqlalchemy import JSON, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.core.db import Base
+
+
+class JobLease(Base):
+    """One row per scheduled job; the worker holding the lease runs the current slot."""
+    __tablename__ = "job_leases"
+
+    job_name = Column(String(100), primary_key=True)
+    owner = Column(String(200), nullable=True)  # "host:pid:token" of the worker holding the lease
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # NULL once released
+    last_slot = Column(DateTime(timezone=True), nullable=True)  # Scheduled minute of the last claimed run
+    acquired_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class JobRun(Base):
+    """History of scheduled job executions."""
+    __tablename__ = "job_runs"
+    __table_args__ = (Index("ix_job_runs_job_started", "job_name", "started_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_name = Column(String(100), nullable=False)
+    owner = Column(String(200), nullable=False)
+    slot = Column(DateTime(timezone=True), nullable=False)
+    status = Column(String(20), nullable=False, default="running")  # running, succeeded, failed, abandoned
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    rows_processed = Column(Integer, nullable=True)
+    detail_json = Column(JSON, nullable=True)  # Job specific stats
+    error = Column(Text, nullable=True)
@@ -1,5 +1,5 @@
 ﻿"""Notification Model - User notifications"""
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, JSON, text
 from sqlalchemy.sql import func
 from app.core.db import Base
 
@@ -7,6 +7,19 @@ from app.core.db import Base
 class Notification(Base):
     """Notification model - user notifications"""
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Unread phase of the inbox: read_at IS NULL, newest first
+        Index("ix_notifications_user_read_created", "user_id", "read_at", "created_at"),
+        # Read phase: read_at IS NOT NULL, newest first
+        Index(
+            "ix_notifications_user_read_history",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("read_at IS NOT NULL"),
+            sqlite_where=text("read_at IS NOT NULL"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)
@@ -15,6 +28,7 @@ class Notification(Base):
     type = Column(String(50), nullable=False)  # e.g., "target_missed", "target_met"
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=True)
+    digest_counts = Column(JSON, nullable=True)  # {type: count} of the notifications a weekly_digest replaced
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,61 @@
+"""Search document model - tokenized text behind message and note search."""
+import sqlite3
+
+from sqlalchemy import DDL, Column, Index, Integer, String, Text, event, func, literal_column
+
+from app.core.db import Base
+
+
+class SearchDocument(Base):
+    """Pre-tokenized copy of a searchable row (see app/services/search.py)."""
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        Index("uq_search_documents_doc", "doc_type", "doc_id", unique=True),
+        Index("ix_search_documents_scope", "doc_type", "scope_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    doc_type = Column(String(30), nullable=False)  # "group_message" or "time_trace"
+    doc_id = Column(Integer, nullable=False)
+    scope_id = Column(Integer, nullable=False)  # group_id for messages, user_id for traces
+    tokens = Column(Text, nullable=False)  # Space separated terms: words plus CJK unigrams/bigrams
+
+
+# Postgres: GIN index over the token list. array_to_tsvector skips the text
+# parser, so CJK bigrams are indexed exactly as the tokenizer produced them.
+Index(
+    "ix_search_documents_tokens_gin",
+    func.array_to_tsvector(func.string_to_array(SearchDocument.__table__.c.tokens, literal_column("' '"))),
+    postgresql_using="gin",
+).ddl_if(dialect="postgresql")
+
+
+# SQLite: FTS5 table over the same tokens, kept in sync by triggers.
+SEARCH_DOCUMENTS_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "tokens, content='search_documents', content_rowid='id', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, tokens) VALUES (new.id, new.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, tokens) VALUES ('delete', old.id, old.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE OF tokens ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, tokens) VALUES ('delete', old.id, old.tokens); "
+    "INSERT INTO search_documents_fts(rowid, tokens) VALUES (new.id, new.tokens); END",
+)
+
+
+def _sqlite_supports_fts5(ddl, target, bind, **kw) -> bool:
+    return bind.dialect.name == "sqlite" and sqlite3.sqlite_version_info >= (3, 9, 0)
+
+
+for _statement in SEARCH_DOCUMENTS_SQLITE_DDL:
+    event.listen(
+        SearchDocument.__table__,
+        "after_create",
+        DDL(_statement).execute_if(callable_=_sqlite_supports_fts5),
+    )
+event.listen(
+    SearchDocument.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS search_documents_fts").execute_if(callable_=_sqlite_supports_fts5),
+)
@@ -18,6 +18,8 @@ class Session(Base):
         Index("ix_sessions_start_time", "start_time"),
         Index("ix_sessions_end_time", "end_time"),
         Index("ix_sessions_user_start_time", "user_id", "start_time"),
+        Index("ix_sessions_start_time_id", "start_time", "id"),
+        Index("ix_sessions_category_start_time", "category_id", "start_time"),
         Index("uq_sessions_user_client_generated_id", "user_id", "client_generated_id", unique=True),
     )
     
@@ -0,0 +1,25 @@
+"""Cached target progress for one target period."""
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.core.db import Base
+
+
+class TargetProgress(Base):
+    """Seconds counted towards a target within one period, refreshed when the owner's sessions change."""
+    __tablename__ = "target_progress"
+    __table_args__ = (
+        UniqueConstraint("target_id", "period_start", name="uq_target_progress_target_period"),
+        Index("ix_target_progress_user_period", "user_id", "period_start", "period_end"),
+    )
+
+    # Derived from sessions, whose writes already bump the owner's data version.
+    skip_data_version = True
+
+    id = Column(Integer, primary_key=True, index=True)
+    target_id = Column(Integer, ForeignKey("work_targets.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    period_start = Column(DateTime(timezone=True), nullable=False)
+    period_end = Column(DateTime(timezone=True), nullable=False)
+    actual_seconds = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -1,8 +1,9 @@
 ﻿"""User Model"""
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, DDL, event
 from sqlalchemy.sql import func
 from app.core.db import Base
 import enum
+import sqlite3
 
 
 class UserRole(str, enum.Enum):
@@ -27,6 +28,40 @@ class User(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     last_login_at = Column(DateTime(timezone=True), nullable=True)
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bumped on every write to user-owned rows
+    unread_notification_count = Column(Integer, default=0, server_default="0", nullable=False)  # Kept in step by services.notifications
+    timezone = Column(String(64), default="UTC", server_default="UTC", nullable=False, index=True)  # IANA name; targets are evaluated at local midnight
     
     def __repr__(self):
         return f"<User(id={self.id}, username={self.username}, role={self.role})>"
+
+
+# SQLite search index for admin user search (see app/services/user_search.py).
+# An FTS5 trigram table mirrors username/email and is kept in sync by triggers.
+USERS_SEARCH_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS users_search USING fts5("
+    "username, email, content='users', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS users_search_ai AFTER INSERT ON users BEGIN "
+    "INSERT INTO users_search(rowid, username, email) VALUES (new.id, new.username, new.email); END",
+    "CREATE TRIGGER IF NOT EXISTS users_search_ad AFTER DELETE ON users BEGIN "
+    "INSERT INTO users_search(users_search, rowid, username, email) "
+    "VALUES ('delete', old.id, old.username, old.email); END",
+    "CREATE TRIGGER IF NOT EXISTS users_search_au AFTER UPDATE OF username, email ON users BEGIN "
+    "INSERT INTO users_search(users_search, rowid, username, email) "
+    "VALUES ('delete', old.id, old.username, old.email); "
+    "INSERT INTO users_search(rowid, username, email) VALUES (new.id, new.username, new.email); END",
+)
+
+
+def _sqlite_supports_trigram(ddl, target, bind, **kw) -> bool:
+    # The FTS5 trigram tokenizer ships with SQLite 3.34+.
+    return bind.dialect.name == "sqlite" and sqlite3.sqlite_version_info >= (3, 34, 0)
+
+
+for _statement in USERS_SEARCH_SQLITE_DDL:
+    event.listen(User.__table__, "after_create", DDL(_statement).execute_if(callable_=_sqlite_supports_trigram))
+event.listen(
+    User.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS users_search").execute_if(callable_=_sqlite_supports_trigram),
+)
@@ -0,0 +1,21 @@
+"""Cached per-user day status for group sharing and leaderboards."""
+from sqlalchemy import JSON, Column, Date, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.core.db import Base
+
+
+class UserDailyStatus(Base):
+    """A user's totals for one UTC day, refreshed when their sessions or targets change."""
+    __tablename__ = "user_daily_statuses"
+    __table_args__ = (UniqueConstraint("user_id", "date", name="uq_user_daily_statuses_user_date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    date = Column(Date, nullable=False)
+    total_seconds = Column(Integer, nullable=False, default=0)
+    by_category = Column(JSON, nullable=False, default=list)  # [{category_id, category_name, category_color, seconds}]
+    target_completed_count = Column(Integer, nullable=False, default=0)
+    target_total_count = Column(Integer, nullable=False, default=0)
+    streak_days = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
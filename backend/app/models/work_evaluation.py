@@ -1,5 +1,5 @@
 ﻿"""WorkEvaluation Model - Target evaluation results"""
-from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.core.db import Base
 import enum
@@ -14,6 +14,9 @@ class EvaluationStatus(str, enum.Enum):
 class WorkEvaluation(Base):
     """Work evaluation model - records of target evaluation results"""
     __tablename__ = "work_evaluations"
+    __table_args__ = (
+        Index("uq_work_evaluations_target_period", "target_id", "period_start", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False, index=True)
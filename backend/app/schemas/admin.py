@@ -28,6 +28,7 @@ class UserListResponse(BaseModel):
 class PaginatedUsersResponse(BaseModel):
     """Paginated user list response"""
     total: int
+    total_is_capped: bool = False
     page: int
     page_size: int
     users: list[UserListResponse]
@@ -53,9 +54,11 @@ class SessionListItemResponse(BaseModel):
 
 class PaginatedSessionsResponse(BaseModel):
     """Paginated session list response"""
-    total: int
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
     sessions: list[SessionListItemResponse]
 
 
@@ -72,3 +75,30 @@ class AuditLogResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+# Scheduled Job Schemas
+class JobRunResponse(BaseModel):
+    """Response schema for one scheduled job run"""
+    id: int
+    job_name: str
+    owner: str
+    slot: datetime
+    status: str
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    rows_processed: Optional[int] = None
+    detail_json: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class JobStatusResponse(BaseModel):
+    """Lease state and latest run of a scheduled job"""
+    job_name: str
+    owner: Optional[str] = None
+    locked_until: Optional[datetime] = None
+    last_slot: Optional[datetime] = None
+    last_run: Optional[JobRunResponse] = None
@@ -1,5 +1,5 @@
 """Pydantic schemas for group MVP APIs."""
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
@@ -57,6 +57,59 @@ class GroupMemberResponse(BaseModel):
     is_active: bool
 
 
+class GroupMemberBoardEntry(BaseModel):
+    user_id: int
+    username: str
+    role: str
+    total_seconds: int
+    top_category_id: Optional[int]
+    top_category_name: Optional[str]
+    top_category_seconds: int
+    target_completed_count: int
+    target_total_count: int
+
+
+class GroupMembersBoardResponse(BaseModel):
+    group_id: int
+    date: date
+    entries: list[GroupMemberBoardEntry]
+
+
+class GroupLeaderboardEntry(BaseModel):
+    rank: int
+    user_id: int
+    username: str
+    total_seconds: int
+    target_completed_count: int
+    target_total_count: int
+    streak_days: int
+
+
+class GroupLeaderboardResponse(BaseModel):
+    group_id: int
+    range: Literal["day", "week", "month"]
+    start_date: date
+    end_date: date
+    entries: list[GroupLeaderboardEntry]
+    me: Optional[GroupLeaderboardEntry] = None
+
+
+class GroupPresenceEntry(BaseModel):
+    user_id: int
+    username: str
+    session_id: int
+    category_id: Optional[int]
+    category_name: Optional[str]
+    start_time: datetime
+    elapsed_seconds: int
+
+
+class GroupPresenceResponse(BaseModel):
+    group_id: int
+    source: Literal["memory", "database"]
+    entries: list[GroupPresenceEntry]
+
+
 class GroupMessageCreate(BaseModel):
     message_type: GroupMessageType = "text"
     content: str = Field(..., min_length=1, max_length=1000)
@@ -75,13 +128,25 @@ class GroupCardShareCreate(BaseModel):
     metadata_json: dict[str, Any] = Field(default_factory=dict)
 
 
-class GroupMessageResponse(BaseModel):
+class GroupMessageEnvelope(BaseModel):
+    """Message fields rendered around pre-encoded metadata in list responses."""
     id: int
     group_id: int
     user_id: int
     username: str
     message_type: str
     content: str
-    metadata_json: Optional[dict[str, Any]]
     created_at: datetime
     deleted_at: Optional[datetime]
+
+
+class GroupMessageResponse(GroupMessageEnvelope):
+    metadata_json: Optional[dict[str, Any]]
+
+
+class GroupMessageSearchResponse(BaseModel):
+    """One page of message search results, best match first."""
+    page: int
+    page_size: int
+    has_more: bool
+    items: list[GroupMessageResponse]
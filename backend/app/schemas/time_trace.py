@@ -1,5 +1,7 @@
 """Time trace schemas."""
 from datetime import datetime
+from typing import List
+
 from pydantic import BaseModel, ConfigDict, Field
 
 
@@ -16,3 +18,11 @@ class TimeTraceResponse(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TimeTraceSearchResponse(BaseModel):
+    """One page of note search results, best match first."""
+    page: int
+    page_size: int
+    has_more: bool
+    items: List[TimeTraceResponse]
@@ -1,8 +1,9 @@
 ﻿"""User Schemas (Pydantic Models)"""
-from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from pydantic import BaseModel, EmailStr, Field, ConfigDict, field_validator
 from datetime import datetime
 from typing import Optional
 from app.models.user import UserRole
+from app.utils.timezones import is_valid_timezone
 
 
 # Request Schemas
@@ -11,6 +12,26 @@ class UserRegister(BaseModel):
     email: EmailStr
     username: str = Field(..., min_length=3, max_length=50)
     password: str = Field(..., min_length=6)
+    timezone: Optional[str] = Field(None, max_length=64)
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v):
+        if v is not None and not is_valid_timezone(v):
+            raise ValueError("timezone must be an IANA timezone name, e.g. Asia/Shanghai")
+        return v
+
+
+class UserUpdate(BaseModel):
+    """Current user settings update"""
+    timezone: Optional[str] = Field(None, max_length=64)
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, v):
+        if v is not None and not is_valid_timezone(v):
+            raise ValueError("timezone must be an IANA timezone name, e.g. Asia/Shanghai")
+        return v
 
 
 class UserLogin(BaseModel):
@@ -45,6 +66,7 @@ class UserResponse(BaseModel):
     is_active: bool
     created_at: datetime
     last_login_at: Optional[datetime] = None
+    timezone: str = "UTC"
     
     model_config = ConfigDict(from_attributes=True)
 
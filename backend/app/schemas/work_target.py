@@ -1,7 +1,7 @@
 ﻿"""Work Target Schemas - Request/Response models for work targets"""
 from pydantic import BaseModel, field_validator
 from datetime import datetime
-from typing import Any, Optional, List
+from typing import Any, Dict, Optional, List
 
 
 class WorkTargetCreate(BaseModel):
@@ -87,6 +87,7 @@ class NotificationResponse(BaseModel):
     type: str
     title: str
     content: Optional[str]
+    digest_counts: Optional[Dict[str, int]] = None
     created_at: datetime
     read_at: Optional[datetime]
     
@@ -97,6 +98,10 @@ class NotificationReadAllResponse(BaseModel):
     updated_count: int
 
 
+class NotificationUnreadCountResponse(BaseModel):
+    unread_count: int
+
+
 class PunishmentEventResponse(BaseModel):
     """Schema for punishment/reward event response"""
     id: int
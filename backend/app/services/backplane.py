@@ -0,0 +1,119 @@
+"""Cross-worker fan-out for group chat events.
+
+Every uvicorn worker keeps its own WebSocket connections, so a message posted
+through one worker has to reach the sockets held by the others. The
+backplane carries small JSON payloads between workers:
+
+- ``PostgresBackplane`` uses LISTEN/NOTIFY on a dedicated connection.
+- ``LocalBackplane`` dispatches in-process; it is used for SQLite, single
+  worker deployments and tests.
+"""
+from __future__ import annotations
+
+import json
+import select
+import threading
+from typing import Any, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+Handler = Callable[[dict[str, Any]], None]
+
+GROUP_CHANNEL = "etime_group_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_NOTIFY_BYTES = 7900
+
+
+class LocalBackplane:
+    """In-process backplane: publish calls the handler directly."""
+
+    def __init__(self) -> None:
+        self._handler: Optional[Handler] = None
+
+    def start(self, handler: Handler) -> None:
+        self._handler = handler
+
+    def stop(self) -> None:
+        self._handler = None
+
+    def publish(self, payload: dict[str, Any]) -> None:
+        if self._handler is not None:
+            self._handler(payload)
+
+
+class PostgresBackplane:
+    """LISTEN/NOTIFY backplane shared by every worker on the same database."""
+
+    def __init__(self, engine: Engine, channel: str = GROUP_CHANNEL) -> None:
+        self._engine = engine
+        self._channel = channel
+        self._handler: Optional[Handler] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, handler: Handler) -> None:
+        self._handler = handler
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, name="group-backplane", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def publish(self, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False, default=str)
+        if len(body.encode("utf-8")) > MAX_NOTIFY_BYTES:
+            # Receivers reload oversized messages from the database.
+            body = json.dumps({key: payload.get(key) for key in ("kind", "group_id", "message_id", "user_id")})
+        with self._engine.connect() as connection:
+            connection.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self._channel, "payload": body})
+            connection.commit()
+
+    def _listen(self) -> None:
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._engine.raw_connection()
+                dbapi_connection = connection.driver_connection
+                dbapi_connection.autocommit = True
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f'LISTEN "{self._channel}"')
+                while not self._stop.is_set():
+                    if select.select([dbapi_connection], [], [], 1.0) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notify = dbapi_connection.notifies.pop(0)
+                        self._dispatch(notify.payload)
+            except Exception as exc:  # pragma: no cover - requires a live Postgres
+                print(f"Group backplane listener error: {exc}")
+                self._stop.wait(2)
+            finally:
+                if connection is not None:
+                    connection.invalidate()
+
+    def _dispatch(self, raw: str) -> None:
+        if self._handler is None:
+            return
+        try:
+            payload = json.loads(raw)
+        except json.JSONDecodeError:
+            return
+        self._handler(payload)
+
+
+def create_backplane(engine: Engine):
+    """Pick the backplane implementation from GROUP_BACKPLANE settings."""
+    choice = settings.GROUP_BACKPLANE
+    if choice == "auto":
+        choice = "postgres" if engine.dialect.name == "postgresql" else "local"
+    if choice == "postgres":
+        return PostgresBackplane(engine)
+    return LocalBackplane()
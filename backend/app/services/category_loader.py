@@ -0,0 +1,40 @@
+"""Request-scoped category lookup for response builders.
+
+List endpoints prime the loader with every category id on the page, which
+costs one ``IN`` query however many rows reference them; response builders
+then read from the cache instead of querying per row.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.category import Category
+
+
+class CategoryLoader:
+    """Categories of one user, loaded at most once per id for a request."""
+
+    def __init__(self, db: DBSession, user_id: int):
+        self.db = db
+        self.user_id = user_id
+        self._categories: dict[int, Optional[Category]] = {}
+
+    def prime(self, category_ids: Iterable[Optional[int]]) -> None:
+        """Load every id not seen yet with one query."""
+        missing = {category_id for category_id in category_ids if category_id is not None} - self._categories.keys()
+        if not missing:
+            return
+        self._categories.update(dict.fromkeys(missing))
+        for category in self.db.query(Category).filter(
+            Category.id.in_(sorted(missing)),
+            Category.user_id == self.user_id,
+        ):
+            self._categories[category.id] = category
+
+    def get(self, category_id: Optional[int]) -> Optional[Category]:
+        if category_id is None:
+            return None
+        self.prime([category_id])
+        return self._categories[category_id]
@@ -0,0 +1,223 @@
+"""Cached per-user "today status" behind group shares and leaderboards.
+
+``UserDailyStatus`` holds one row per (user, UTC day). Rows are refreshed
+incrementally: every flush that closes, edits or deletes a finished session,
+records an evaluation or changes a target marks the owner's (user, day) as
+stale, and stale rows are rebuilt right before the transaction commits. The
+member's ``GroupDailySnapshot`` rows are rewritten from the same status.
+
+Streaks are derived from the previous day's row instead of walking back over
+raw sessions. A day that has no row yet (the first read after midnight, or a
+user whose history predates the cache) is built on first access.
+"""
+from __future__ import annotations
+
+from datetime import date as DateType
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event, func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as ORMSession
+from sqlalchemy.orm import attributes
+
+from app.models.group import GroupMember
+from app.models.session import Session
+from app.models.user_daily_status import UserDailyStatus
+from app.models.work_evaluation import WorkEvaluation
+from app.models.work_target import WorkTarget
+from app.services.groups import (
+    category_totals,
+    count_streak_days,
+    format_today_status,
+    save_daily_snapshot,
+    target_counts,
+)
+
+
+STALE_STATUS_KEY = "stale_daily_statuses"
+
+
+def _utc_day(value: Optional[datetime]) -> Optional[DateType]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+def _today() -> DateType:
+    return datetime.now(timezone.utc).date()
+
+
+def _get_row(user_id: int, day: DateType, db: ORMSession, reload: bool = False) -> Optional[UserDailyStatus]:
+    query = db.query(UserDailyStatus).filter(
+        UserDailyStatus.user_id == user_id,
+        UserDailyStatus.date == day,
+    )
+    if reload:
+        query = query.populate_existing()
+    return query.first()
+
+
+def _previous_streak(user_id: int, day: DateType, db: ORMSession) -> int:
+    previous = _get_row(user_id, day - timedelta(days=1), db)
+    if previous is not None:
+        return previous.streak_days
+    # No cached history yet: fall back to the raw-session walk once.
+    return count_streak_days(user_id, day - timedelta(days=1), db)
+
+
+def _upsert_status(values: dict[str, Any], db: ORMSession) -> None:
+    """Insert or overwrite a (user, day) row; concurrent commits may write it at once."""
+    changes = {key: value for key, value in values.items() if key not in {"user_id", "date"}}
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(UserDailyStatus).values(**values)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={**{key: statement.excluded[key] for key in changes}, "updated_at": func.now()},
+        ))
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(UserDailyStatus).values(**values))
+    except IntegrityError:
+        db.execute(update(UserDailyStatus).where(
+            UserDailyStatus.user_id == values["user_id"],
+            UserDailyStatus.date == values["date"],
+        ).values(**changes))
+
+
+def refresh_daily_status(user_id: int, day: DateType, db: ORMSession) -> UserDailyStatus:
+    """Recompute and store a user's status for ``day``."""
+    categories = category_totals(user_id, day, db)
+    completed, total = target_counts(user_id, day, db)
+    total_seconds = sum(item["seconds"] for item in categories)
+
+    _upsert_status({
+        "user_id": user_id,
+        "date": day,
+        "by_category": categories,
+        "total_seconds": total_seconds,
+        "target_completed_count": completed,
+        "target_total_count": total,
+        "streak_days": _previous_streak(user_id, day, db) + 1 if total_seconds > 0 else 0,
+    }, db)
+    return _get_row(user_id, day, db, reload=True)
+
+
+def _cascade_streaks(row: UserDailyStatus, db: ORMSession) -> list[UserDailyStatus]:
+    """Carry a changed past-day streak forward into later cached days."""
+    changed = []
+    previous = row
+    while previous.date < _today():
+        following = _get_row(row.user_id, previous.date + timedelta(days=1), db)
+        if following is None:
+            break
+        streak = previous.streak_days + 1 if following.total_seconds > 0 else 0
+        if streak == following.streak_days:
+            break
+        following.streak_days = streak
+        changed.append(following)
+        previous = following
+    return changed
+
+
+def get_daily_status(user_id: int, db: ORMSession, day: Optional[DateType] = None) -> UserDailyStatus:
+    """Cached status row for ``day`` (today by default), built on first access."""
+    value = day or _today()
+    row = _get_row(user_id, value, db)
+    if row is None:
+        row = refresh_daily_status(user_id, value, db)
+    return row
+
+
+def status_metadata(row: UserDailyStatus) -> tuple[str, dict[str, Any]]:
+    """Share text and metadata for a cached status row."""
+    return format_today_status(
+        row.date,
+        list(row.by_category or []),
+        row.target_completed_count,
+        row.target_total_count,
+        row.streak_days,
+    )
+
+
+def today_status(user_id: int, db: ORMSession, today: Optional[DateType] = None) -> tuple[str, dict[str, Any]]:
+    """Cached equivalent of ``services.groups.build_today_status``."""
+    return status_metadata(get_daily_status(user_id, db, today))
+
+
+def _write_snapshots(row: UserDailyStatus, group_ids: list[int], db: ORMSession) -> None:
+    if not group_ids:
+        return
+    _, metadata = status_metadata(row)
+    for group_id in group_ids:
+        save_daily_snapshot(group_id, row.user_id, metadata, db)
+
+
+def mark_status_stale(db: ORMSession, user_id: int, days: Iterable[DateType]) -> None:
+    """Rebuild extra (user, day) statuses and snapshots at commit, e.g. after joining a group."""
+    stale = db.info.setdefault(STALE_STATUS_KEY, set())
+    stale.update((user_id, day) for day in days if day is not None)
+
+
+def _session_days(session: Session, deleted: bool) -> set[DateType]:
+    if deleted:
+        return {_utc_day(session.start_time)} if session.end_time is not None else set()
+    if session.end_time is None and not attributes.get_history(session, "end_time").deleted:
+        # Still running and never closed: nothing to count yet.
+        return set()
+    history = attributes.get_history(session, "start_time")
+    return {_utc_day(value) for value in (*history.added, *history.unchanged, *history.deleted)}
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _mark_stale_statuses(session: ORMSession, flush_context) -> None:
+    changed = list(session.new) + [
+        obj for obj in session.dirty if session.is_modified(obj, include_collections=False)
+    ]
+    for obj in changed:
+        if isinstance(obj, Session):
+            mark_status_stale(session, obj.user_id, _session_days(obj, deleted=False))
+        elif isinstance(obj, WorkEvaluation):
+            mark_status_stale(session, obj.user_id, [_utc_day(obj.period_start)])
+        elif isinstance(obj, WorkTarget):
+            mark_status_stale(session, obj.user_id, [_today()])
+    for obj in session.deleted:
+        if isinstance(obj, Session):
+            mark_status_stale(session, obj.user_id, _session_days(obj, deleted=True))
+        elif isinstance(obj, WorkTarget):
+            mark_status_stale(session, obj.user_id, [_today()])
+
+
+@event.listens_for(ORMSession, "before_commit")
+def _refresh_stale_statuses(session: ORMSession) -> None:
+    if not (session.info.get(STALE_STATUS_KEY) or session.new or session.dirty or session.deleted):
+        return
+    # Flush first so pending changes are both marked and visible to the aggregates.
+    session.flush()
+    stale = session.info.pop(STALE_STATUS_KEY, None)
+    memberships: dict[int, list[int]] = {}
+    for user_id, day in sorted(stale or ()):
+        if user_id not in memberships:
+            memberships[user_id] = [
+                group_id
+                for (group_id,) in session.query(GroupMember.group_id).filter(
+                    GroupMember.user_id == user_id,
+                    GroupMember.is_active == True,
+                ).all()
+            ]
+        row = refresh_daily_status(user_id, day, session)
+        for refreshed in [row, *_cascade_streaks(row, session)]:
+            _write_snapshots(refreshed, memberships[user_id], session)
+    # Refreshing flushes status rows; nothing they touch needs another pass.
+    session.info.pop(STALE_STATUS_KEY, None)
+
+
+@event.listens_for(ORMSession, "after_rollback")
+def _discard_stale_statuses(session: ORMSession) -> None:
+    session.info.pop(STALE_STATUS_KEY, None)
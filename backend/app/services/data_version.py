@@ -0,0 +1,81 @@
+"""Per-user data version used to answer conditional GETs cheaply.
+
+Every flush that inserts, updates or deletes a row owning a ``user_id`` column
+bumps ``users.data_version`` for the affected users inside the same
+transaction. Read endpoints fold the version into an ETag so an unchanged
+screen refresh can be answered with ``304 Not Modified`` before any query
+runs.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session as ORMSession
+
+from app.models.user import User
+from app.utils.timezones import get_zone
+
+
+def _owner_ids(objects: Iterable[object]) -> set[int]:
+    owners = set()
+    for obj in objects:
+        if getattr(obj, "skip_data_version", False):
+            continue
+        user_id = getattr(obj, "user_id", None)
+        if isinstance(user_id, int):
+            owners.add(user_id)
+    return owners
+
+
+def bump_data_version(db: ORMSession, user_ids: Iterable[int]) -> None:
+    """Increment the data version of the given users in the current transaction.
+
+    Needed after bulk ``query.update()``/``query.delete()`` calls, which do not
+    go through the flush hook below.
+    """
+    ids = sorted({int(user_id) for user_id in user_ids})
+    if not ids:
+        return
+    db.connection().execute(
+        update(User)
+        .where(User.id.in_(ids))
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _bump_after_flush(session: ORMSession, flush_context) -> None:
+    changed = list(session.new) + list(session.deleted) + [
+        obj for obj in session.dirty if session.is_modified(obj, include_collections=False)
+    ]
+    bump_data_version(session, _owner_ids(changed))
+
+
+def build_etag(user: User, scope: str, today: Optional[datetime] = None) -> str:
+    """Build a weak ETag for a user-scoped read.
+
+    ``scope`` identifies the resource and its query parameters. The current UTC
+    date is folded in because several reads ("today", current target period,
+    default heatmap window) roll over at midnight without any write; the
+    user's local date too, since target periods follow the user's timezone.
+    """
+    now = today or datetime.now(timezone.utc)
+    day = now.date().isoformat()
+    local_day = now.astimezone(get_zone(user.timezone)).date().isoformat()
+    digest = hashlib.sha1(f"{scope}|{day}|{local_day}".encode("utf-8")).hexdigest()[:16]
+    return f'W/"{user.id}-{user.data_version or 0}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Return True when an If-None-Match header matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [item.strip() for item in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    return any((item[2:] if item.startswith("W/") else item) == bare for item in candidates)
@@ -0,0 +1,263 @@
+"""Transactional email outbox.
+
+Request handlers never talk to the mail server. ``enqueue_email`` adds a row
+to ``email_outbox`` in the caller's transaction, so the mail is queued exactly
+when the change that caused it commits, and the request returns without
+waiting on SMTP.
+
+The outbox job drains the queue in every worker:
+
+- a worker claims due rows one by one with a conditional UPDATE that only
+  succeeds while the row is pending (or its claim has expired), so two
+  workers never send the same row;
+- ``EMAIL_OUTBOX_CONCURRENCY`` caps the SMTP connections of the whole
+  cluster. Each sender thread needs one of that many *sender slots*, held as
+  ``job_leases`` rows, so a worker only starts as many threads as it could
+  claim slots, and a worker that gets none skips the tick. Each thread opens
+  one SMTP connection and reuses it for its whole share, reconnecting only
+  after a failure;
+- a failed send is retried with exponential backoff starting at
+  ``EMAIL_OUTBOX_BACKOFF_SECONDS``; after ``EMAIL_OUTBOX_MAX_ATTEMPTS``
+  attempts the row is marked ``failed`` and kept for inspection;
+- the body, which may hold a live password-reset link, is cleared once the
+  row is sent or has failed for good.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox
+from app.services.job_runner import WORKER_ID, acquire_lease, release_lease
+from app.utils.email import build_message, open_smtp_connection, smtp_configured
+
+
+CLAIM_SECONDS = 5 * 60
+SENDER_SLOT_PREFIX = "email_outbox_sender"
+MAX_BACKOFF_SECONDS = 6 * 60 * 60
+MAX_ERROR_LENGTH = 2000
+
+# Returns an open SMTP connection with ``send_message`` and ``quit``.
+Connect = Callable[[], Any]
+
+
+@dataclass
+class EmailOutboxStats:
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    connections: int = 0
+    sender_slots: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def enqueue_email(db: DBSession, to_email: str, subject: str, body: str) -> EmailOutbox:
+    """Queue an email; it is sent once the caller's transaction commits."""
+    email = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    db.add(email)
+    return email
+
+
+def retry_delay(attempts: int, base_seconds: int) -> timedelta:
+    """Backoff before the next attempt after ``attempts`` failed sends."""
+    return timedelta(seconds=min(base_seconds * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS))
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+        and_(EmailOutbox.status == "sending", EmailOutbox.locked_until < now),
+    )
+
+
+def claim_batch(db: DBSession, limit: int, now: datetime) -> list[EmailOutbox]:
+    """Claim up to ``limit`` due emails for this worker and commit the claim."""
+    candidates = [
+        row.id
+        for row in db.query(EmailOutbox.id)
+        .filter(_claimable(now))
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(limit)
+    ]
+    claimed = []
+    for email_id in candidates:
+        # Claiming counts as an attempt, so a worker dying mid-send still backs off.
+        if db.query(EmailOutbox).filter(EmailOutbox.id == email_id, _claimable(now)).update(
+            {
+                EmailOutbox.status: "sending",
+                EmailOutbox.locked_until: now + timedelta(seconds=CLAIM_SECONDS),
+                EmailOutbox.attempts: EmailOutbox.attempts + 1,
+            },
+            synchronize_session=False,
+        ):
+            claimed.append(email_id)
+    db.commit()
+    if not claimed:
+        return []
+    return db.query(EmailOutbox).filter(EmailOutbox.id.in_(claimed)).order_by(EmailOutbox.id).all()
+
+
+def acquire_sender_slots(db: DBSession, limit: int, owner: str, now: datetime) -> list[str]:
+    """Claim free cluster-wide sender slots out of ``limit``; returns their lease names.
+
+    A slot is held for at most ``CLAIM_SECONDS``, like a claimed row, so a
+    crashed worker frees its slots on its own.
+    """
+    held = []
+    for index in range(limit):
+        name = f"{SENDER_SLOT_PREFIX}:{index}"
+        # Each run is its own lease slot, so a released sender slot can be taken again right away.
+        if acquire_lease(db, name, now, owner, CLAIM_SECONDS, now):
+            held.append(name)
+    return held
+
+
+def release_sender_slots(db: DBSession, names: list[str], owner: str) -> None:
+    for name in names:
+        release_lease(db, name, owner)
+
+
+def _close(connection: Any) -> None:
+    try:
+        connection.quit()
+    except Exception:
+        pass
+
+
+def _send_shard(messages: list[tuple[int, str, str, str]], connect: Connect) -> tuple[dict[int, Optional[str]], int]:
+    """Send messages over one reused connection; returns {id: error or None} and connections opened."""
+    results: dict[int, Optional[str]] = {}
+    connection = None
+    opened = 0
+    for email_id, to_email, subject, body in messages:
+        if connection is None:
+            try:
+                connection = connect()
+                opened += 1
+            except Exception as exc:
+                # The server is unreachable; leave the rest of the shard for the next attempt.
+                error = f"connect: {exc}"
+                for pending_id, *_ in messages:
+                    results.setdefault(pending_id, error)
+                return results, opened
+        try:
+            connection.send_message(build_message(to_email, subject, body))
+            results[email_id] = None
+        except Exception as exc:
+            results[email_id] = str(exc) or exc.__class__.__name__
+            # The connection may be unusable now; start a fresh one for the next message.
+            _close(connection)
+            connection = None
+    if connection is not None:
+        _close(connection)
+    return results, opened
+
+
+def _record_results(
+    db: DBSession,
+    batch: list[EmailOutbox],
+    results: dict[int, Optional[str]],
+    max_attempts: int,
+    backoff_seconds: int,
+    now: datetime,
+    stats: EmailOutboxStats,
+) -> None:
+    for email in batch:
+        error = results.get(email.id, "not sent")
+        email.locked_until = None
+        if error is None:
+            email.status = "sent"
+            email.sent_at = now
+            email.last_error = None
+            email.body = ""
+            stats.sent += 1
+            continue
+        email.last_error = error[:MAX_ERROR_LENGTH]
+        if email.attempts >= max_attempts:
+            email.status = "failed"
+            email.body = ""
+            stats.failed += 1
+        else:
+            email.status = "pending"
+            email.next_attempt_at = now + retry_delay(email.attempts, backoff_seconds)
+            stats.retried += 1
+    db.commit()
+
+
+def run_email_outbox_job(
+    db: DBSession,
+    connect: Optional[Connect] = None,
+    batch_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+    backoff_seconds: Optional[int] = None,
+    now: Optional[datetime] = None,
+    owner: str = WORKER_ID,
+) -> EmailOutboxStats:
+    """Send due emails from the outbox until no due rows are left.
+
+    ``concurrency`` is the cluster-wide number of sender slots; this run uses
+    the ones no other worker holds.
+    """
+    started = time.perf_counter()
+    stats = EmailOutboxStats()
+    if connect is None:
+        if not smtp_configured():
+            # Keep the mail queued until SMTP is configured.
+            return stats
+        connect = open_smtp_connection
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    concurrency = max(1, concurrency or settings.EMAIL_OUTBOX_CONCURRENCY)
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    backoff_seconds = settings.EMAIL_OUTBOX_BACKOFF_SECONDS if backoff_seconds is None else backoff_seconds
+
+    slots = acquire_sender_slots(db, concurrency, owner, now)
+    stats.sender_slots = len(slots)
+    if not slots:
+        return stats
+    threads = len(slots)
+    try:
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="email-outbox") as pool:
+            while True:
+                batch = claim_batch(db, batch_size, now)
+                if not batch:
+                    break
+                messages = [(email.id, email.to_email, email.subject, email.body) for email in batch]
+                shards = [messages[index::threads] for index in range(threads)]
+                results: dict[int, Optional[str]] = {}
+                for shard_results, opened in pool.map(lambda shard: _send_shard(shard, connect), [s for s in shards if s]):
+                    results.update(shard_results)
+                    stats.connections += opened
+                _record_results(db, batch, results, max_attempts, backoff_seconds, now, stats)
+
+                stats.batches += 1
+                stats.claimed += len(batch)
+                # Stop well before the slots expire; the next tick picks up the rest.
+                if len(batch) < batch_size or time.perf_counter() - started > CLAIM_SECONDS / 2:
+                    break
+    finally:
+        db.rollback()
+        release_sender_slots(db, slots, owner)
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
@@ -1,69 +1,98 @@
-"""Evaluation Service - Target evaluation logic."""
+"""Evaluation Service - Target evaluation logic.
+
+Periods follow the owner's local calendar: a day runs from local midnight to
+local midnight (``users.timezone``), stored as UTC instants.
+"""
 from datetime import date as DateType
-from datetime import datetime, time as TimeType, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from datetime import datetime, time as TimeType, timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Optional
 
 from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session as DBSession
 
-from app.models.notification import Notification
 from app.models.punishment_event import PunishmentEvent
-from app.models.session import Session
+from app.models.user import User
 from app.models.work_evaluation import EvaluationStatus, WorkEvaluation
 from app.models.work_target import TargetPeriod, WorkTarget
+from app.services.daily_status import mark_status_stale
+from app.services.data_version import bump_data_version
+from app.services.notifications import add_notification
+from app.services.target_progress import (
+    drop_target_progress,
+    load_target_progress,
+    purge_finished_progress,
+    target_period_seconds,
+)
+from app.utils.timezones import DEFAULT_TIMEZONE, get_zone
 
 
 DAILY_LIKE_PERIODS = {TargetPeriod.DAILY.value, TargetPeriod.TOMORROW.value}
 
+# Local days end at most this long after the UTC day does (UTC-12).
+MAX_BEHIND_UTC = timedelta(hours=12)
+# Rows per INSERT statement, well under SQLite's bound-parameter limit.
+INSERT_BATCH_SIZE = 500
 
-def _date_bounds(target_date: DateType) -> tuple[datetime, datetime]:
-    period_start = datetime.combine(target_date, TimeType.min).replace(tzinfo=timezone.utc)
-    period_end = datetime.combine(target_date, TimeType.max).replace(tzinfo=timezone.utc)
-    return period_start, period_end
 
+def _date_bounds(target_date: DateType, tz: tzinfo = timezone.utc) -> tuple[datetime, datetime]:
+    period_start = datetime.combine(target_date, TimeType.min, tzinfo=tz)
+    next_start = datetime.combine(target_date + timedelta(days=1), TimeType.min, tzinfo=tz)
+    period_end = next_start.astimezone(timezone.utc) - timedelta(microseconds=1)
+    return period_start.astimezone(timezone.utc), period_end
 
-def _week_bounds(target_date: DateType) -> tuple[datetime, datetime]:
+
+def _week_bounds(target_date: DateType, tz: tzinfo = timezone.utc) -> tuple[datetime, datetime]:
     start_date = target_date - timedelta(days=target_date.weekday())
     end_date = start_date + timedelta(days=6)
-    return _date_bounds(start_date)[0], _date_bounds(end_date)[1]
+    return _date_bounds(start_date, tz)[0], _date_bounds(end_date, tz)[1]
 
 
-def _month_bounds(target_date: DateType) -> tuple[datetime, datetime]:
+def _month_bounds(target_date: DateType, tz: tzinfo = timezone.utc) -> tuple[datetime, datetime]:
     start_date = target_date.replace(day=1)
     if target_date.month == 12:
         next_month = target_date.replace(year=target_date.year + 1, month=1, day=1)
     else:
         next_month = target_date.replace(month=target_date.month + 1, day=1)
     end_date = next_month - timedelta(days=1)
-    return _date_bounds(start_date)[0], _date_bounds(end_date)[1]
+    return _date_bounds(start_date, tz)[0], _date_bounds(end_date, tz)[1]
 
 
-def _period_bounds(period: str, target_date: DateType) -> tuple[datetime, datetime]:
+def _period_bounds(
+    period: str,
+    target_date: DateType,
+    tz: tzinfo = timezone.utc,
+) -> tuple[datetime, datetime]:
+    """UTC bounds of the period containing the local date ``target_date``."""
     if period in DAILY_LIKE_PERIODS:
-        return _date_bounds(target_date)
+        return _date_bounds(target_date, tz)
     if period == TargetPeriod.WEEKLY.value:
-        return _week_bounds(target_date)
+        return _week_bounds(target_date, tz)
     if period == TargetPeriod.MONTHLY.value:
-        return _month_bounds(target_date)
-    return _date_bounds(target_date)
+        return _month_bounds(target_date, tz)
+    return _date_bounds(target_date, tz)
 
 
 def _is_last_day_of_month(target_date: DateType) -> bool:
     return (target_date + timedelta(days=1)).day == 1
 
 
-def _target_effective_date(target: WorkTarget) -> DateType:
+def _effective_from_utc(target: WorkTarget) -> datetime:
     effective = target.effective_from
     if effective.tzinfo is None:
         effective = effective.replace(tzinfo=timezone.utc)
-    return effective.date()
+    return effective
 
 
-def _should_evaluate_target(target: WorkTarget, target_date: DateType) -> bool:
+def _target_effective_date(target: WorkTarget, tz: tzinfo = timezone.utc) -> DateType:
+    return _effective_from_utc(target).astimezone(tz).date()
+
+
+def _should_evaluate_target(target: WorkTarget, target_date: DateType, tz: tzinfo = timezone.utc) -> bool:
     if target.period == TargetPeriod.DAILY.value:
         return True
     if target.period == TargetPeriod.TOMORROW.value:
-        return _target_effective_date(target) == target_date
+        return _target_effective_date(target, tz) == target_date
     if target.period == TargetPeriod.WEEKLY.value:
         return target_date.weekday() == 6
     if target.period == TargetPeriod.MONTHLY.value:
@@ -71,31 +100,6 @@ def _should_evaluate_target(target: WorkTarget, target_date: DateType) -> bool:
     return False
 
 
-def _sum_target_seconds(
-    target: WorkTarget,
-    period_start: datetime,
-    period_end: datetime,
-    db: DBSession,
-) -> int:
-    query = db.query(
-        func.coalesce(
-            func.sum(func.coalesce(Session.effective_seconds, Session.duration_seconds)),
-            0,
-        ).label("total")
-    ).filter(
-        Session.user_id == target.user_id,
-        Session.end_time.isnot(None),
-        Session.start_time >= period_start,
-        Session.start_time <= period_end,
-    )
-
-    if target.include_category_ids:
-        query = query.filter(Session.category_id.in_(target.include_category_ids))
-
-    result = query.first()
-    return int(result.total) if result else 0
-
-
 def _suggest_compensation_seconds(deficit_seconds: int) -> int:
     if deficit_seconds <= 0:
         return 0
@@ -172,20 +176,18 @@ def _apply_compensation(
 def _current_period_for_target(
     target: WorkTarget,
     as_of: datetime,
+    tz: tzinfo = timezone.utc,
 ) -> Optional[tuple[datetime, datetime]]:
-    current_date = as_of.date()
+    current_date = as_of.astimezone(tz).date()
 
     if target.period == TargetPeriod.TOMORROW.value:
-        plan_date = _target_effective_date(target)
+        plan_date = _target_effective_date(target, tz)
         if plan_date < current_date:
             return None
-        return _date_bounds(plan_date)
+        return _date_bounds(plan_date, tz)
 
-    period_start, period_end = _period_bounds(target.period, current_date)
-    effective = target.effective_from
-    if effective.tzinfo is None:
-        effective = effective.replace(tzinfo=timezone.utc)
-    if effective > period_end:
+    period_start, period_end = _period_bounds(target.period, current_date, tz)
+    if _effective_from_utc(target) > period_end:
         return None
 
     return period_start, period_end
@@ -200,6 +202,7 @@ def build_target_dashboard(
     now = as_of or datetime.now(timezone.utc)
     if now.tzinfo is None:
         now = now.replace(tzinfo=timezone.utc)
+    user_zone = get_zone(db.query(User.timezone).filter(User.id == user_id).scalar())
 
     targets = db.query(WorkTarget).filter(
         WorkTarget.user_id == user_id,
@@ -252,18 +255,23 @@ def build_target_dashboard(
             "suggested_compensation_seconds": suggested_compensation_seconds,
         })
 
-    progress = []
+    current_periods = []
     for target in targets:
         if not target.is_active:
             continue
 
-        bounds = _current_period_for_target(target, now)
+        bounds = _current_period_for_target(target, now, user_zone)
         if bounds is None:
             continue
+        current_periods.append((target, *bounds))
 
-        period_start, period_end = bounds
-        actual_end = min(period_end, now)
-        actual_seconds = 0 if actual_end < period_start else _sum_target_seconds(target, period_start, actual_end, db)
+    cached = load_target_progress(
+        [(target, start, end) for target, start, end in current_periods if start <= now],
+        db,
+    )
+    progress = []
+    for target, period_start, period_end in current_periods:
+        actual_seconds = cached.get((target.id, period_start), 0)
         remaining_seconds = max(0, target.target_seconds - actual_seconds)
         progress.append({
             "target_id": target.id,
@@ -287,20 +295,80 @@ def build_target_dashboard(
     }
 
 
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _insert_evaluations(rows: List[Dict[str, Any]], db: DBSession) -> List[WorkEvaluation]:
+    """Insert evaluation rows, skipping periods that are already evaluated.
+
+    Uses ``INSERT .. ON CONFLICT (target_id, period_start) DO NOTHING`` where
+    available, so concurrent evaluators never insert a period twice. Only
+    the rows this call inserted are returned.
+    """
+    if not rows:
+        return []
+    dialect = db.get_bind().dialect.name
+    if dialect not in {"postgresql", "sqlite"}:
+        evaluations = []
+        for row in rows:
+            exists = db.query(WorkEvaluation.id).filter(
+                WorkEvaluation.target_id == row["target_id"],
+                WorkEvaluation.period_start == row["period_start"],
+            ).first()
+            if exists is None:
+                evaluation = WorkEvaluation(**row)
+                db.add(evaluation)
+                evaluations.append(evaluation)
+        db.flush()
+        return evaluations
+
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    db.flush()
+    ids = []
+    for offset in range(0, len(rows), INSERT_BATCH_SIZE):
+        statement = insert(WorkEvaluation).values(rows[offset:offset + INSERT_BATCH_SIZE])
+        statement = statement.on_conflict_do_nothing(
+            index_elements=["target_id", "period_start"],
+        ).returning(WorkEvaluation.id)
+        ids.extend(db.execute(statement).scalars().all())
+    if not ids:
+        return []
+
+    evaluations = db.query(WorkEvaluation).filter(
+        WorkEvaluation.id.in_(ids),
+    ).order_by(WorkEvaluation.id).all()
+    # Core inserts skip the flush hooks that track these rows.
+    bump_data_version(db, {evaluation.user_id for evaluation in evaluations})
+    for evaluation in evaluations:
+        mark_status_stale(db, evaluation.user_id, [_utc(evaluation.period_start).date()])
+    return evaluations
+
+
 def evaluate_targets_for_date(
     target_date: DateType,
     db: DBSession,
     user_id: Optional[int] = None,
+    timezones: Optional[Iterable[str]] = None,
+    commit: bool = True,
 ) -> List[WorkEvaluation]:
     """
-    Evaluate active targets due on a specific date.
+    Evaluate active targets due on a specific local date.
 
     Daily targets are evaluated every day, weekly targets on Sunday, monthly
     targets on the last day of the month, and tomorrow targets once on their
-    effective date.
+    effective date. Each target uses its owner's timezone for the period
+    bounds; ``timezones`` restricts the run to owners in those zones.
+    With ``commit=False`` the work is only flushed, so callers can batch
+    several runs into one transaction.
     """
-    _, day_end = _date_bounds(target_date)
-    query = db.query(WorkTarget).filter(
+    # Coarse SQL filter; the per-owner local day end is checked below.
+    _, latest_day_end = _date_bounds(target_date)
+    query = db.query(WorkTarget, User.timezone).outerjoin(
+        User, User.id == WorkTarget.user_id,
+    ).filter(
         WorkTarget.is_active == True,
         WorkTarget.period.in_([
             TargetPeriod.DAILY.value,
@@ -308,65 +376,62 @@ def evaluate_targets_for_date(
             TargetPeriod.MONTHLY.value,
             TargetPeriod.TOMORROW.value,
         ]),
-        WorkTarget.effective_from <= day_end,
+        WorkTarget.effective_from <= latest_day_end + MAX_BEHIND_UTC,
     )
 
     if user_id is not None:
         query = query.filter(WorkTarget.user_id == user_id)
+    if timezones is not None:
+        query = query.filter(func.coalesce(User.timezone, DEFAULT_TIMEZONE).in_(list(timezones)))
 
-    active_targets = [
-        target for target in query.all()
-        if _should_evaluate_target(target, target_date)
-    ]
-
-    evaluations = []
-
-    for target in active_targets:
-        period_start, period_end = _period_bounds(target.period, target_date)
-
-        existing = db.query(WorkEvaluation).filter(
-            WorkEvaluation.target_id == target.id,
-            func.date(WorkEvaluation.period_start) == period_start.date(),
-        ).first()
-
-        if existing:
+    active_targets = []
+    for target, tz_name in query.all():
+        zone = get_zone(tz_name)
+        if _effective_from_utc(target) > _date_bounds(target_date, zone)[1]:
             continue
+        if _should_evaluate_target(target, target_date, zone):
+            active_targets.append((target, zone))
+
+    rows = []
+    for target, zone in active_targets:
+        period_start, period_end = _period_bounds(target.period, target_date, zone)
+        # Finished periods are read once here; caching them would only grow the table.
+        actual_seconds = target_period_seconds(target, period_start, period_end, db, cache=False)
+        met = actual_seconds >= target.target_seconds
+        rows.append({
+            "user_id": target.user_id,
+            "target_id": target.id,
+            "period_start": period_start,
+            "period_end": period_end,
+            "actual_seconds": actual_seconds,
+            "target_seconds": target.target_seconds,
+            "status": EvaluationStatus.MET.value if met else EvaluationStatus.MISSED.value,
+            "deficit_seconds": 0 if met else target.target_seconds - actual_seconds,
+        })
 
-        actual_seconds = _sum_target_seconds(target, period_start, period_end, db)
-
-        if actual_seconds >= target.target_seconds:
-            status = EvaluationStatus.MET.value
-            deficit_seconds = 0
-        else:
-            status = EvaluationStatus.MISSED.value
-            deficit_seconds = target.target_seconds - actual_seconds
-
-        evaluation = WorkEvaluation(
-            user_id=target.user_id,
-            target_id=target.id,
-            period_start=period_start,
-            period_end=period_end,
-            actual_seconds=actual_seconds,
-            target_seconds=target.target_seconds,
-            status=status,
-            deficit_seconds=deficit_seconds,
-        )
-        db.add(evaluation)
-        db.flush()
+    evaluations = _insert_evaluations(rows, db)
+    drop_target_progress(db, ((row["target_id"], row["period_start"]) for row in rows))
+    targets = {target.id: (target, zone) for target, zone in active_targets}
 
-        evaluations.append(evaluation)
+    for evaluation in evaluations:
+        target, zone = targets[evaluation.target_id]
+        period_start, period_end = _utc(evaluation.period_start), _utc(evaluation.period_end)
+        status = evaluation.status
+        actual_seconds = evaluation.actual_seconds
+        deficit_seconds = evaluation.deficit_seconds
 
         if status == EvaluationStatus.MISSED.value:
             suggested_compensation = _suggest_compensation_seconds(deficit_seconds)
-            db.add(Notification(
+            add_notification(
+                db,
                 user_id=target.user_id,
                 type="target_missed",
                 title=f"目标未达成 - {target.period}",
                 content=(
-                    f"{period_start.date().isoformat()} 至 {period_end.date().isoformat()} "
+                    f"{period_start.astimezone(zone).date().isoformat()} 至 {period_end.astimezone(zone).date().isoformat()} "
                     f"少了 {deficit_seconds} 秒，建议下个可用周期补回 {suggested_compensation} 秒。"
                 ),
-            ))
+            )
 
             db.add(PunishmentEvent(
                 user_id=target.user_id,
@@ -389,16 +454,62 @@ def evaluate_targets_for_date(
             surplus_seconds = max(0, actual_seconds - target.target_seconds)
             _apply_compensation(db, target.user_id, evaluation, surplus_seconds)
 
-            db.add(Notification(
+            add_notification(
+                db,
                 user_id=target.user_id,
                 type="target_met",
                 title=f"目标已达成 - {target.period}",
                 content=(
-                    f"{period_start.date().isoformat()} 至 {period_end.date().isoformat()} "
+                    f"{period_start.astimezone(zone).date().isoformat()} 至 {period_end.astimezone(zone).date().isoformat()} "
                     f"完成 {actual_seconds} 秒，目标 {target.target_seconds} 秒。"
                 ),
-            ))
+            )
+        # Later evaluations of the same user see this one's debt or compensation.
+        db.flush()
 
-    db.commit()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
+    return evaluations
+
+
+def timezones_ending_day(now: datetime, db: DBSession) -> Dict[DateType, List[str]]:
+    """Group the users' timezones whose local day ended within the past hour.
+
+    Returns the finished local date mapped to the timezone names whose local
+    date changed since the previous hourly run, so each zone is evaluated
+    exactly once per day.
+    """
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    names = {name or DEFAULT_TIMEZONE for (name,) in db.query(User.timezone).distinct().all()}
+    due: Dict[DateType, List[str]] = {}
+    for name in sorted(names):
+        zone = get_zone(name)
+        finished = (now - timedelta(hours=1)).astimezone(zone).date()
+        # Compare dates, not the hour: DST changes can skip local midnight.
+        if finished < now.astimezone(zone).date():
+            due.setdefault(finished, []).append(name)
+    return due
+
+
+def evaluate_finished_local_days(
+    db: DBSession,
+    now: Optional[datetime] = None,
+) -> List[WorkEvaluation]:
+    """Evaluate targets of every user whose local day just ended.
 
+    Meant to run hourly, which spreads the nightly evaluation over up to 24
+    small batches instead of one burst at UTC midnight.
+    """
+    now = now or datetime.now(timezone.utc)
+    evaluations: List[WorkEvaluation] = []
+    for local_date, names in timezones_ending_day(now, db).items():
+        evaluations.extend(evaluate_targets_for_date(local_date, db, timezones=names))
+    # Cached progress of periods finished everywhere, e.g. of targets no longer evaluated.
+    purge_finished_progress(db, now - timedelta(days=1) - MAX_BEHIND_UTC)
+    db.commit()
     return evaluations
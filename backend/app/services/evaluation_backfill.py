@@ -0,0 +1,191 @@
+"""Re-run target evaluation over a date range for every user.
+
+Used after an outage or an evaluation bug fix. Users with active targets are
+split into chunks that run in a process pool; each chunk evaluates its users
+day by day (oldest first, so debts and compensation apply in order) and
+commits once. Already evaluated periods are skipped by
+``evaluate_targets_for_date``, so re-running a range is safe.
+
+Finished chunks are recorded in a JSON checkpoint. A run started with the
+same checkpoint and date range only evaluates the users that are still
+missing, including those of chunks that failed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import date as DateType
+from datetime import timedelta
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.db import SessionLocal, engine
+from app.models.work_target import WorkTarget
+from app.services.evaluation import evaluate_targets_for_date
+
+
+DEFAULT_WORKERS = 4
+DEFAULT_CHUNK_SIZE = 50
+
+
+@dataclass
+class BackfillStats:
+    start: DateType
+    end: DateType
+    workers: int
+    chunk_size: int
+    users: int = 0
+    skipped_users: int = 0
+    users_done: int = 0
+    failed_users: int = 0
+    chunks: int = 0
+    evaluations: int = 0
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["start"] = self.start.isoformat()
+        data["end"] = self.end.isoformat()
+        return data
+
+
+def _days(start: DateType, end: DateType) -> Iterator[DateType]:
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def backfill_user_ids(db: DBSession) -> list[int]:
+    """Users owning at least one active target, in id order."""
+    rows = db.query(WorkTarget.user_id).filter(
+        WorkTarget.is_active == True,
+    ).distinct().order_by(WorkTarget.user_id).all()
+    return [user_id for (user_id,) in rows]
+
+
+def evaluate_user_chunk(
+    user_ids: list[int],
+    start: DateType,
+    end: DateType,
+    session_factory: Callable[[], DBSession] = SessionLocal,
+) -> int:
+    """Evaluate ``start``..``end`` for the given users in one transaction.
+
+    Returns the number of evaluations created.
+    """
+    db = session_factory()
+    try:
+        created = 0
+        for user_id in user_ids:
+            for day in _days(start, end):
+                created += len(evaluate_targets_for_date(day, db, user_id=user_id, commit=False))
+        db.commit()
+        return created
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def load_checkpoint(path: Optional[str], start: DateType, end: DateType) -> set[int]:
+    """Users already finished by an earlier run over the same range."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+    if data.get("start") != start.isoformat() or data.get("end") != end.isoformat():
+        raise ValueError(
+            f"Checkpoint {path} covers {data.get('start')}..{data.get('end')}, "
+            f"not {start.isoformat()}..{end.isoformat()}"
+        )
+    return set(data.get("done_user_ids", []))
+
+
+def save_checkpoint(path: Optional[str], start: DateType, end: DateType, done: set[int]) -> None:
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump({"start": start.isoformat(), "end": end.isoformat(), "done_user_ids": sorted(done)}, handle)
+    os.replace(tmp_path, path)
+
+
+def _init_worker() -> None:
+    # Forked workers must not share the parent's pooled connections.
+    engine.dispose(close=False)
+
+
+def run_evaluation_backfill(
+    start: DateType,
+    end: DateType,
+    workers: int = DEFAULT_WORKERS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint_path: Optional[str] = None,
+    session_factory: Callable[[], DBSession] = SessionLocal,
+    progress: Callable[[str], None] = print,
+) -> BackfillStats:
+    """Evaluate every user with active targets for each local day in ``start``..``end``.
+
+    ``workers <= 1`` runs the chunks in this process with ``session_factory``;
+    otherwise worker processes use the default session factory.
+    """
+    if end < start:
+        raise ValueError("end must not be before start")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    stats = BackfillStats(start=start, end=end, workers=max(1, workers), chunk_size=chunk_size)
+    began = time.perf_counter()
+
+    done = load_checkpoint(checkpoint_path, start, end)
+    db = session_factory()
+    try:
+        user_ids = backfill_user_ids(db)
+    finally:
+        db.close()
+    pending = [user_id for user_id in user_ids if user_id not in done]
+    stats.users = len(user_ids)
+    stats.skipped_users = len(user_ids) - len(pending)
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    days = (end - start).days + 1
+
+    def record(chunk: list[int], created: Optional[int], error: Optional[BaseException]) -> None:
+        stats.chunks += 1
+        if error is not None:
+            stats.failed_users += len(chunk)
+            progress(f"Chunk of users {chunk[0]}..{chunk[-1]} failed: {error}")
+        else:
+            done.update(chunk)
+            save_checkpoint(checkpoint_path, start, end, done)
+            stats.users_done += len(chunk)
+            stats.evaluations += created
+        elapsed = time.perf_counter() - began
+        rate = stats.users_done * days / elapsed if elapsed else 0.0
+        progress(
+            f"[{stats.chunks}/{len(chunks)}] {stats.users_done}/{len(pending)} users, "
+            f"{stats.evaluations} evaluations, {rate:.1f} user-days/s"
+        )
+
+    if stats.workers == 1:
+        for chunk in chunks:
+            try:
+                record(chunk, evaluate_user_chunk(chunk, start, end, session_factory), None)
+            except Exception as exc:
+                record(chunk, None, exc)
+    else:
+        with ProcessPoolExecutor(max_workers=stats.workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(evaluate_user_chunk, chunk, start, end): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    record(futures[future], future.result(), None)
+                except Exception as exc:
+                    record(futures[future], None, exc)
+
+    stats.elapsed_seconds = time.perf_counter() - began
+    return stats
@@ -0,0 +1,210 @@
+"""In-process pub/sub hub for per-user live events (Server-Sent Events).
+
+Endpoints and jobs queue events on their DB session with ``queue_event``; the
+events are published to the hub only after the transaction commits (see
+``run_after_commit``), so a client never sees state that was rolled back. Each user keeps a short ring
+buffer so a reconnecting EventSource can resume with ``Last-Event-ID``. Event
+ids are ``<epoch>-<sequence>``; the epoch changes with every process, so an id
+handed out by a restarted (or another) worker is never mistaken for one of ours.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Callable, Deque, Optional
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session as ORMSession
+
+from app.models.notification import Notification
+from app.models.session import Session
+
+
+PENDING_CALLBACKS_KEY = "after_commit_callbacks"
+
+
+@dataclass
+class UserEvent:
+    id: int
+    user_id: int
+    event: str
+    data: dict[str, Any]
+    epoch: str = ""
+
+    @property
+    def event_id(self) -> str:
+        """The SSE id the client echoes back as ``Last-Event-ID``."""
+        return f"{self.epoch}-{self.id}"
+
+    def encode(self) -> str:
+        payload = json.dumps(self.data, ensure_ascii=False, default=str)
+        return f"id: {self.event_id}\nevent: {self.event}\ndata: {payload}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    user_id: int
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
+class EventHub:
+    """Fan out user events to the subscriptions living in this process."""
+
+    def __init__(self, buffer_size: int = 100):
+        self._buffer_size = buffer_size
+        self._ids = itertools.count(1)
+        self.epoch = _new_epoch()
+        self._buffers: dict[int, Deque[UserEvent]] = defaultdict(lambda: deque(maxlen=self._buffer_size))
+        self._subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+        self._evicted_upto: dict[int, int] = {}
+        self._last_id = 0
+        self._lock = Lock()
+
+    def publish(self, user_id: int, event: str, data: dict[str, Any]) -> UserEvent:
+        """Publish an event; safe to call from worker threads and the scheduler."""
+        with self._lock:
+            item = UserEvent(id=next(self._ids), user_id=user_id, event=event, data=data, epoch=self.epoch)
+            buffer = self._buffers[user_id]
+            if len(buffer) == buffer.maxlen:
+                self._evicted_upto[user_id] = buffer[0].id
+            buffer.append(item)
+            self._last_id = item.id
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed; the stream is gone.
+                self.unsubscribe(subscription)
+        return item
+
+    def subscribe(self, user_id: int, last_event_id: Optional[str] = None) -> tuple[Subscription, list[UserEvent], bool]:
+        """Register a subscription for the running event loop.
+
+        Returns the subscription, the buffered events newer than
+        ``last_event_id`` and whether the replay is complete. An incomplete
+        replay means events were evicted from the buffer or the id comes from
+        another epoch (process lifetime) and the client should refetch its state.
+        """
+        subscription = Subscription(user_id=user_id, loop=asyncio.get_running_loop())
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+            if not last_event_id:
+                return subscription, [], True
+            sequence = self._parse_event_id(last_event_id)
+            if sequence is None:
+                return subscription, [], False
+            replay = [item for item in self._buffers.get(user_id, ()) if item.id > sequence]
+            complete = (
+                sequence <= self._last_id
+                and self._evicted_upto.get(user_id, 0) <= sequence
+            )
+        return subscription, replay, complete
+
+    def _parse_event_id(self, value: str) -> Optional[int]:
+        """Sequence part of an id from this epoch, None for anything else."""
+        epoch, _, sequence = value.rpartition("-")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def subscribed_user_ids(self) -> set[int]:
+        with self._lock:
+            return set(self._subscriptions)
+
+    def reset(self) -> None:
+        """Drop buffered events and subscriptions (tests)."""
+        with self._lock:
+            self.epoch = _new_epoch()
+            self._buffers.clear()
+            self._subscriptions.clear()
+            self._evicted_upto.clear()
+
+
+def _new_epoch() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+hub = EventHub()
+
+
+def run_after_commit(db: ORMSession, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once the current transaction of ``db`` commits.
+
+    Callbacks are dropped on rollback. They run outside the transaction and
+    must not use ``db``.
+    """
+    db.info.setdefault(PENDING_CALLBACKS_KEY, []).append(callback)
+
+
+def queue_event(db: ORMSession, user_id: int, event: str, data: dict[str, Any]) -> None:
+    """Queue an event to be published once ``db`` commits."""
+    run_after_commit(db, lambda: hub.publish(user_id, event, data))
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.isoformat()
+
+
+def session_event_data(session: Session) -> dict[str, Any]:
+    """Payload for session_started/session_stopped events."""
+    return {
+        "session_id": session.id,
+        "category_id": session.category_id,
+        "start_time": _isoformat(session.start_time),
+        "end_time": _isoformat(session.end_time),
+        "duration_seconds": session.duration_seconds,
+        "effective_seconds": session.effective_seconds,
+    }
+
+
+def notification_event_data(notification: Notification) -> dict[str, Any]:
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "title": notification.title,
+        "content": notification.content,
+    }
+
+
+@sa_event.listens_for(ORMSession, "after_flush")
+def _queue_new_notifications(session: ORMSession, flush_context) -> None:
+    for obj in session.new:
+        # Rows created already read (weekly digests) are history, not news.
+        if isinstance(obj, Notification) and obj.read_at is None:
+            queue_event(session, obj.user_id, "notification", notification_event_data(obj))
+
+
+@sa_event.listens_for(ORMSession, "after_commit")
+def _run_pending(session: ORMSession) -> None:
+    for callback in session.info.pop(PENDING_CALLBACKS_KEY, []):
+        try:
+            callback()
+        except Exception as exc:  # pragma: no cover - defensive logging
+            print(f"After-commit callback failed: {exc}")
+
+
+@sa_event.listens_for(ORMSession, "after_rollback")
+def _discard_pending(session: ORMSession) -> None:
+    session.info.pop(PENDING_CALLBACKS_KEY, None)
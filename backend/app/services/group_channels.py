@@ -0,0 +1,126 @@
+"""Live group chat channels backed by WebSockets and the backplane."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable, Optional
+
+from app.core.db import SessionLocal, engine
+from app.models.group import GroupMessage
+from app.models.user import User
+from app.schemas.group import GroupMessageResponse
+from app.services.backplane import create_backplane
+from app.services.groups import message_response
+
+
+@dataclass(eq=False)
+class GroupConnection:
+    group_id: int
+    user_id: int
+    loop: asyncio.AbstractEventLoop
+    queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+
+
+class GroupChannelManager:
+    """WebSocket connections held by this worker, indexed by group."""
+
+    def __init__(self) -> None:
+        self._connections: dict[int, set[GroupConnection]] = {}
+        self._lock = Lock()
+
+    def register(self, group_id: int, user_id: int) -> GroupConnection:
+        connection = GroupConnection(group_id=group_id, user_id=user_id, loop=asyncio.get_running_loop())
+        with self._lock:
+            self._connections.setdefault(group_id, set()).add(connection)
+        return connection
+
+    def unregister(self, connection: GroupConnection) -> None:
+        with self._lock:
+            connections = self._connections.get(connection.group_id)
+            if connections is None:
+                return
+            connections.discard(connection)
+            if not connections:
+                del self._connections[connection.group_id]
+
+    def connection_count(self, group_id: int) -> int:
+        with self._lock:
+            return len(self._connections.get(group_id, ()))
+
+    def deliver(self, payload: dict[str, Any]) -> None:
+        """Hand a backplane payload to the local sockets of its group."""
+        group_id = payload.get("group_id")
+        with self._lock:
+            connections = list(self._connections.get(group_id, ()))
+        if not connections:
+            return
+
+        if payload.get("kind") == "message" and "message" not in payload:
+            payload = _reload_message_payload(payload)
+            if payload is None:
+                return
+
+        for connection in connections:
+            if payload.get("kind") == "member_removed" and payload.get("user_id") != connection.user_id:
+                continue
+            try:
+                connection.loop.call_soon_threadsafe(connection.queue.put_nowait, payload)
+            except RuntimeError:
+                self.unregister(connection)
+
+
+channels = GroupChannelManager()
+backplane = create_backplane(engine)
+# Payload kinds handled outside the chat sockets (e.g. presence updates)
+_handlers: dict[str, Callable[[dict[str, Any]], None]] = {}
+
+
+def register_backplane_handler(kind: str, handler: Callable[[dict[str, Any]], None]) -> None:
+    _handlers[kind] = handler
+
+
+def _dispatch(payload: dict[str, Any]) -> None:
+    handler = _handlers.get(payload.get("kind"))
+    if handler is not None:
+        handler(payload)
+    else:
+        channels.deliver(payload)
+
+
+def start_backplane() -> None:
+    backplane.start(_dispatch)
+
+
+def stop_backplane() -> None:
+    backplane.stop()
+
+
+def _reload_message_payload(payload: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """Rebuild a message payload that was too large for the backplane."""
+    db = SessionLocal()
+    try:
+        row = db.query(GroupMessage, User.username).join(
+            User, User.id == GroupMessage.user_id
+        ).filter(GroupMessage.id == payload.get("message_id")).first()
+        if row is None:
+            return None
+        return {**payload, "message": message_response(*row).model_dump(mode="json")}
+    finally:
+        db.close()
+
+
+def broadcast_message(message: GroupMessageResponse) -> None:
+    """Push a committed group message to the sockets of every worker."""
+    backplane.publish({
+        "kind": "message",
+        "group_id": message.group_id,
+        "message_id": message.id,
+        "user_id": message.user_id,
+        "message": message.model_dump(mode="json"),
+    })
+
+
+def broadcast_member_removed(group_id: int, user_id: int) -> None:
+    """Close a former member's sockets on every worker."""
+    backplane.publish({"kind": "member_removed", "group_id": group_id, "user_id": user_id})
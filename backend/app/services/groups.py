@@ -1,7 +1,6 @@
 """Group service helpers for membership checks and share summaries."""
 from __future__ import annotations
 
-import json
 import secrets
 import string
 from datetime import date as DateType
@@ -9,7 +8,9 @@ from datetime import datetime, time, timedelta, timezone
 from typing import Any, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy import func
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as DBSession
 
 from app.models.category import Category
@@ -18,9 +19,15 @@ from app.models.session import Session
 from app.models.user import User
 from app.models.work_evaluation import EvaluationStatus, WorkEvaluation
 from app.models.work_target import TargetPeriod, WorkTarget
+from app.schemas.group import GroupMessageEnvelope, GroupMessageResponse
 
 
 INVITE_ALPHABET = string.ascii_uppercase + string.digits
+# Snapshot rows per INSERT statement, well under SQLite's bound-parameter limit.
+SNAPSHOT_UPSERT_BATCH_SIZE = 1000
+SNAPSHOT_VALUE_COLUMNS = ("total_seconds", "target_completed_count", "target_total_count", "streak_days")
+# Longest streak counted, today included.
+MAX_STREAK_DAYS = 366
 
 
 def generate_invite_code(db: DBSession) -> str:
@@ -33,7 +40,8 @@ def generate_invite_code(db: DBSession) -> str:
     raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not generate invite code")
 
 
-def ensure_public_exam_group(owner: User, db: DBSession) -> Group:
+def ensure_public_exam_group(db: DBSession) -> Optional[Group]:
+    """Create the shared public exam group, owned by the first admin; run at startup."""
     group = db.query(Group).filter(
         Group.name == "考研小组",
         Group.visibility == "public",
@@ -41,12 +49,20 @@ def ensure_public_exam_group(owner: User, db: DBSession) -> Group:
     if group is not None:
         return group
 
+    owner = db.query(User).filter(
+        User.role == "admin",
+        User.is_active == True,
+    ).order_by(User.id).first()
+    if owner is None:
+        return None
+
     group = Group(
         name="考研小组",
         description="公开考研学习小组，所有成员都可以通过邀请码申请加入。",
         owner_id=owner.id,
         invite_code=generate_invite_code(db),
         visibility="public",
+        member_count=1,
     )
     db.add(group)
     db.flush()
@@ -62,20 +78,45 @@ def ensure_public_exam_group(owner: User, db: DBSession) -> Group:
     return group
 
 
-def serialize_metadata(value: Optional[dict[str, Any]]) -> Optional[str]:
-    if value is None:
-        return None
-    return json.dumps(value, ensure_ascii=False)
+def message_response(message: GroupMessage, username: str) -> GroupMessageResponse:
+    metadata = message.metadata_json
+    return GroupMessageResponse(
+        id=message.id,
+        group_id=message.group_id,
+        user_id=message.user_id,
+        username=username,
+        message_type=message.message_type,
+        content=message.content,
+        metadata_json=metadata if isinstance(metadata, dict) else None,
+        created_at=message.created_at,
+        deleted_at=message.deleted_at,
+    )
 
 
-def parse_metadata(value: Optional[str]) -> Optional[dict[str, Any]]:
-    if not value:
-        return None
-    try:
-        loaded = json.loads(value)
-        return loaded if isinstance(loaded, dict) else None
-    except json.JSONDecodeError:
-        return None
+def message_page_json(rows) -> bytes:
+    """Render a page of messages as a JSON array without decoding metadata.
+
+    ``rows`` carry ``metadata_raw``, the metadata column cast to text by the
+    database, which also nulls values that are not a JSON object (see
+    ``message_archive._metadata_text``). It is spliced into the output as-is
+    instead of being parsed into dicts and re-encoded.
+    """
+    parts = []
+    for row in rows:
+        envelope = GroupMessageEnvelope(
+            id=row.id,
+            group_id=row.group_id,
+            user_id=row.user_id,
+            username=row.username,
+            message_type=row.message_type,
+            content=row.content,
+            created_at=row.created_at,
+            deleted_at=row.deleted_at,
+        ).model_dump_json()
+        raw = row.metadata_raw
+        metadata = raw if raw and raw.lstrip().startswith("{") else "null"
+        parts.append(f'{envelope[:-1]},"metadata_json":{metadata}}}')
+    return f"[{','.join(parts)}]".encode("utf-8")
 
 
 def get_active_membership(group_id: int, user_id: int, db: DBSession) -> Optional[GroupMember]:
@@ -108,19 +149,136 @@ def get_group_for_member(group_id: int, user_id: int, db: DBSession) -> tuple[Gr
     return group, member
 
 
-def active_member_count(group_id: int, db: DBSession) -> int:
-    return db.query(func.count(GroupMember.id)).filter(
-        GroupMember.group_id == group_id,
+def adjust_member_count(group_id: int, delta: int, db: DBSession) -> None:
+    """Atomically shift the denormalized active member count of a group."""
+    db.query(Group).filter(Group.id == group_id).update(
+        {Group.member_count: Group.member_count + delta},
+        synchronize_session=False,
+    )
+
+
+def active_roles_by_group(group_ids: list[int], user_id: int, db: DBSession) -> dict[int, str]:
+    """Load a user's active roles for many groups in one query."""
+    if not group_ids:
+        return {}
+    return dict(db.query(GroupMember.group_id, GroupMember.role).filter(
+        GroupMember.group_id.in_(group_ids),
+        GroupMember.user_id == user_id,
         GroupMember.is_active == True,
-    ).scalar() or 0
+    ).all())
 
 
-def _day_bounds(value: DateType) -> tuple[datetime, datetime]:
+def day_bounds(value: DateType) -> tuple[datetime, datetime]:
     start = datetime.combine(value, time.min).replace(tzinfo=timezone.utc)
     end = datetime.combine(value, time.max).replace(tzinfo=timezone.utc)
     return start, end
 
 
+def daily_category_seconds(user_ids: list[int], day: DateType, db: DBSession) -> dict[int, dict[Optional[int], int]]:
+    """Tracked seconds per user and category on one UTC day, in one grouped query."""
+    start_dt, end_dt = day_bounds(day)
+    rows = db.query(
+        Session.user_id,
+        Session.category_id,
+        func.sum(func.coalesce(Session.effective_seconds, Session.duration_seconds)),
+    ).filter(
+        Session.user_id.in_(user_ids),
+        Session.end_time.isnot(None),
+        Session.start_time >= start_dt,
+        Session.start_time <= end_dt,
+    ).group_by(Session.user_id, Session.category_id).all()
+    seconds: dict[int, dict[Optional[int], int]] = {}
+    for user_id, category_id, total in rows:
+        seconds.setdefault(user_id, {})[category_id] = int(total or 0)
+    return seconds
+
+
+def daily_target_counts(
+    user_ids: list[int],
+    day: DateType,
+    category_seconds: dict[int, dict[Optional[int], int]],
+    db: DBSession,
+) -> dict[int, tuple[int, int]]:
+    """(completed, total) daily targets per user, as ``target_counts`` computes them one by one.
+
+    ``category_seconds`` is the day's ``daily_category_seconds`` of the same
+    users; targets are matched against it instead of summing sessions again.
+    """
+    start_dt, end_dt = day_bounds(day)
+    counts: dict[int, tuple[int, int]] = {}
+    evaluated = db.query(WorkEvaluation.user_id, WorkEvaluation.status).join(
+        WorkTarget, WorkEvaluation.target_id == WorkTarget.id
+    ).filter(
+        WorkEvaluation.user_id.in_(user_ids),
+        WorkTarget.period.in_([TargetPeriod.DAILY.value, TargetPeriod.TOMORROW.value]),
+        WorkEvaluation.period_start >= start_dt,
+        WorkEvaluation.period_start <= end_dt,
+    ).all()
+    for user_id, evaluation_status in evaluated:
+        completed, total = counts.get(user_id, (0, 0))
+        counts[user_id] = (completed + int(evaluation_status == EvaluationStatus.MET.value), total + 1)
+
+    pending = [user_id for user_id in user_ids if user_id not in counts]
+    if not pending:
+        return counts
+    targets = db.query(WorkTarget).filter(
+        WorkTarget.user_id.in_(pending),
+        WorkTarget.is_active == True,
+        WorkTarget.period.in_([TargetPeriod.DAILY.value, TargetPeriod.TOMORROW.value]),
+        WorkTarget.effective_from <= end_dt,
+    ).all()
+    for target in targets:
+        if target.period == TargetPeriod.TOMORROW.value:
+            effective = target.effective_from
+            if effective.tzinfo is None:
+                effective = effective.replace(tzinfo=timezone.utc)
+            if effective.date() != day:
+                continue
+        by_category = category_seconds.get(target.user_id, {})
+        actual = sum(
+            seconds
+            for category_id, seconds in by_category.items()
+            if not target.include_category_ids or category_id in target.include_category_ids
+        )
+        completed, total = counts.get(target.user_id, (0, 0))
+        counts[target.user_id] = (completed + int(actual >= target.target_seconds), total + 1)
+    return counts
+
+
+def streak_days_before(user_ids: list[int], day: DateType, db: DBSession) -> dict[int, int]:
+    """Consecutive days with tracked time ending the day before ``day``, per user.
+
+    One grouped query over the last ``MAX_STREAK_DAYS - 1`` days, the same
+    cap ``count_streak_days`` walks back to.
+    """
+    previous = day - timedelta(days=1)
+    start_dt, _ = day_bounds(day - timedelta(days=MAX_STREAK_DAYS - 1))
+    _, end_dt = day_bounds(previous)
+    session_day = func.date(Session.start_time)
+    rows = db.query(Session.user_id, session_day).filter(
+        Session.user_id.in_(user_ids),
+        Session.end_time.isnot(None),
+        Session.start_time >= start_dt,
+        Session.start_time <= end_dt,
+    ).group_by(
+        Session.user_id, session_day
+    ).having(
+        func.sum(func.coalesce(Session.effective_seconds, Session.duration_seconds)) > 0
+    ).all()
+    active: dict[int, set[DateType]] = {}
+    for user_id, value in rows:
+        active.setdefault(user_id, set()).add(DateType.fromisoformat(str(value)[:10]))
+
+    streaks = {}
+    for user_id in user_ids:
+        days, cursor, streak = active.get(user_id, set()), previous, 0
+        while cursor in days:
+            streak += 1
+            cursor -= timedelta(days=1)
+        streaks[user_id] = streak
+    return streaks
+
+
 def _format_seconds(seconds: int) -> str:
     total = max(0, int(seconds))
     hours = total // 3600
@@ -186,11 +344,12 @@ def _today_target_counts(user_id: int, today: DateType, start_dt: datetime, end_
     return completed, total
 
 
-def _streak_days(user_id: int, today: DateType, db: DBSession) -> int:
+def count_streak_days(user_id: int, today: DateType, db: DBSession) -> int:
+    """Consecutive days with tracked time ending at ``today``, from raw sessions."""
     streak = 0
     cursor = today
-    while streak < 366:
-        start_dt, end_dt = _day_bounds(cursor)
+    while streak < MAX_STREAK_DAYS:
+        start_dt, end_dt = day_bounds(cursor)
         total = db.query(
             func.coalesce(
                 func.sum(func.coalesce(Session.effective_seconds, Session.duration_seconds)),
@@ -209,11 +368,9 @@ def _streak_days(user_id: int, today: DateType, db: DBSession) -> int:
     return streak
 
 
-def build_today_status(user_id: int, db: DBSession, today: Optional[DateType] = None) -> tuple[str, dict[str, Any]]:
-    """Aggregate a user's current-day status for group sharing."""
-    value = today or datetime.now(timezone.utc).date()
-    start_dt, end_dt = _day_bounds(value)
-
+def category_totals(user_id: int, value: DateType, db: DBSession) -> list[dict[str, Any]]:
+    """Per-category tracked seconds of a user's finished sessions on one UTC day."""
+    start_dt, end_dt = day_bounds(value)
     rows = db.query(
         Session.category_id,
         Category.name.label("category_name"),
@@ -235,7 +392,7 @@ def build_today_status(user_id: int, db: DBSession, today: Optional[DateType] =
         Category.color,
     ).all()
 
-    categories = [
+    return [
         {
             "category_id": row.category_id,
             "category_name": row.category_name,
@@ -244,10 +401,24 @@ def build_today_status(user_id: int, db: DBSession, today: Optional[DateType] =
         }
         for row in rows
     ]
+
+
+def target_counts(user_id: int, value: DateType, db: DBSession) -> tuple[int, int]:
+    """(completed, total) daily targets of a user for one UTC day."""
+    start_dt, end_dt = day_bounds(value)
+    return _today_target_counts(user_id, value, start_dt, end_dt, db)
+
+
+def format_today_status(
+    value: DateType,
+    categories: list[dict[str, Any]],
+    target_completed_count: int,
+    target_total_count: int,
+    streak_days: int,
+) -> tuple[str, dict[str, Any]]:
+    """Render share text and metadata from a day's aggregates."""
     total_seconds = sum(item["seconds"] for item in categories)
     top_category = max(categories, key=lambda item: item["seconds"], default=None)
-    target_completed_count, target_total_count = _today_target_counts(user_id, value, start_dt, end_dt, db)
-    streak_days = _streak_days(user_id, value, db)
 
     top_name = (top_category or {}).get("category_name") or "暂无"
     content = (
@@ -267,20 +438,63 @@ def build_today_status(user_id: int, db: DBSession, today: Optional[DateType] =
     return content, metadata
 
 
+def build_today_status(user_id: int, db: DBSession, today: Optional[DateType] = None) -> tuple[str, dict[str, Any]]:
+    """Aggregate a user's current-day status from raw sessions.
+
+    Request paths read the cached copy in ``services.daily_status`` instead.
+    """
+    value = today or datetime.now(timezone.utc).date()
+    categories = category_totals(user_id, value, db)
+    target_completed_count, target_total_count = target_counts(user_id, value, db)
+    return format_today_status(
+        value,
+        categories,
+        target_completed_count,
+        target_total_count,
+        count_streak_days(user_id, value, db),
+    )
+
+
+def upsert_daily_snapshots(rows: list[dict[str, Any]], db: DBSession) -> None:
+    """Insert or overwrite (group, user, date) snapshot rows.
+
+    Session commits, shares and the hourly snapshot job write the same rows
+    concurrently, so conflicts are resolved by the database, never by a prior
+    SELECT.
+    """
+    if not rows:
+        return
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        for offset in range(0, len(rows), SNAPSHOT_UPSERT_BATCH_SIZE):
+            statement = dialect_insert(GroupDailySnapshot).values(rows[offset:offset + SNAPSHOT_UPSERT_BATCH_SIZE])
+            statement = statement.on_conflict_do_update(
+                index_elements=["group_id", "user_id", "date"],
+                set_={column: statement.excluded[column] for column in SNAPSHOT_VALUE_COLUMNS},
+            )
+            db.execute(statement)
+        return
+    for row in rows:
+        values = {column: row[column] for column in SNAPSHOT_VALUE_COLUMNS}
+        try:
+            with db.begin_nested():
+                db.execute(insert(GroupDailySnapshot).values(**row))
+        except IntegrityError:
+            db.execute(update(GroupDailySnapshot).where(
+                GroupDailySnapshot.group_id == row["group_id"],
+                GroupDailySnapshot.user_id == row["user_id"],
+                GroupDailySnapshot.date == row["date"],
+            ).values(**values))
+
+
 def save_daily_snapshot(group_id: int, user_id: int, metadata: dict[str, Any], db: DBSession) -> None:
-    snapshot_date = DateType.fromisoformat(metadata["date"])
-    snapshot = db.query(GroupDailySnapshot).filter(
-        GroupDailySnapshot.group_id == group_id,
-        GroupDailySnapshot.user_id == user_id,
-        GroupDailySnapshot.date == snapshot_date,
-    ).first()
-    if snapshot is None:
-        snapshot = GroupDailySnapshot(group_id=group_id, user_id=user_id, date=snapshot_date)
-        db.add(snapshot)
-    snapshot.total_seconds = int(metadata.get("total_seconds") or 0)
-    snapshot.target_completed_count = int(metadata.get("target_completed_count") or 0)
-    snapshot.target_total_count = int(metadata.get("target_total_count") or 0)
-    snapshot.streak_days = int(metadata.get("streak_days") or 0)
+    upsert_daily_snapshots([{
+        "group_id": group_id,
+        "user_id": user_id,
+        "date": DateType.fromisoformat(metadata["date"]),
+        **{column: int(metadata.get(column) or 0) for column in SNAPSHOT_VALUE_COLUMNS},
+    }], db)
 
 
 def create_group_message(
@@ -296,7 +510,7 @@ def create_group_message(
         user_id=user_id,
         message_type=message_type,
         content=content,
-        metadata_json=serialize_metadata(metadata),
+        metadata_json=metadata,
     )
     db.add(message)
     return message
@@ -0,0 +1,162 @@
+"""Run scheduled jobs once across all workers and nodes.
+
+Every uvicorn worker starts its own scheduler, so every job fires once per
+worker. ``run_exclusive_job`` guards a job with a row in ``job_leases``:
+
+- a fire is identified by its *slot*: the fire time floored to the job's
+  period (``HOURLY``, ``DAILY``), so a worker whose fire runs late still
+  lands in the slot the others already claimed;
+- a worker claims the slot with a single conditional UPDATE, which succeeds
+  only while the lease is free (released or expired) and the slot has not
+  been claimed yet. The first worker wins; the others skip the slot,
+  even if they fire after the winner has finished;
+- the lease expires after ``lease_seconds``, so a crashed worker cannot
+  block the job forever.
+
+Each claimed run is recorded in ``job_runs`` with its outcome, rows
+processed and job-specific stats.
+"""
+from __future__ import annotations
+
+import os
+import socket
+import traceback
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.db import SessionLocal
+from app.models.job import JobLease, JobRun
+
+
+DEFAULT_LEASE_SECONDS = 30 * 60
+MINUTELY = 60
+HOURLY = 60 * 60
+DAILY = 24 * 60 * 60
+MAX_ERROR_LENGTH = 4000
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# A job gets a session and returns (rows processed, stats for the run record).
+Job = Callable[[DBSession], tuple[int, Optional[dict[str, Any]]]]
+
+
+def job_slot(now: datetime, period_seconds: int = MINUTELY) -> datetime:
+    """Start of the UTC period of ``period_seconds`` containing ``now``."""
+    epoch = int(now.timestamp())
+    return datetime.fromtimestamp(epoch - epoch % period_seconds, tz=timezone.utc)
+
+
+def acquire_lease(
+    db: DBSession,
+    job_name: str,
+    slot: datetime,
+    owner: str = WORKER_ID,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    now: Optional[datetime] = None,
+) -> bool:
+    """Claim ``slot`` of a job for ``owner``; False when another worker has it."""
+    now = now or datetime.now(timezone.utc)
+    values = {
+        JobLease.owner: owner,
+        JobLease.locked_until: now + timedelta(seconds=lease_seconds),
+        JobLease.last_slot: slot,
+        JobLease.acquired_at: now,
+    }
+    claimed = db.query(JobLease).filter(
+        JobLease.job_name == job_name,
+        or_(JobLease.locked_until.is_(None), JobLease.locked_until < now),
+        or_(JobLease.last_slot.is_(None), JobLease.last_slot < slot),
+    ).update(values, synchronize_session=False)
+    if claimed:
+        db.commit()
+        return True
+
+    if db.query(JobLease.job_name).filter(JobLease.job_name == job_name).first() is not None:
+        db.rollback()
+        return False
+
+    db.add(JobLease(job_name=job_name, **{column.key: value for column, value in values.items()}))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker created the lease row first.
+        db.rollback()
+        return False
+    return True
+
+
+def release_lease(db: DBSession, job_name: str, owner: str = WORKER_ID) -> None:
+    db.query(JobLease).filter(
+        JobLease.job_name == job_name,
+        JobLease.owner == owner,
+    ).update({JobLease.locked_until: None}, synchronize_session=False)
+    db.commit()
+
+
+def run_exclusive_job(
+    job_name: str,
+    job: Job,
+    period_seconds: int = MINUTELY,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    session_factory: Callable[[], DBSession] = SessionLocal,
+    owner: str = WORKER_ID,
+    now: Optional[datetime] = None,
+) -> Optional[JobRun]:
+    """Run ``job`` unless another worker already claimed this slot.
+
+    ``period_seconds`` is how often the job is scheduled; one run per period
+    is allowed across all workers.
+
+    Returns the finished run record, or None when the slot was skipped.
+    Job errors are recorded on the run, not raised.
+    """
+    now = now or datetime.now(timezone.utc)
+    slot = job_slot(now, period_seconds)
+    db = session_factory()
+    try:
+        if not acquire_lease(db, job_name, slot, owner, lease_seconds, now):
+            db.close()
+            return None
+    except Exception:
+        db.close()
+        raise
+
+    try:
+        # Runs left "running" by a worker whose lease expired will never finish.
+        db.query(JobRun).filter(
+            JobRun.job_name == job_name,
+            JobRun.status == "running",
+        ).update({JobRun.status: "abandoned"}, synchronize_session=False)
+        run = JobRun(job_name=job_name, owner=owner, slot=slot, status="running", started_at=now)
+        db.add(run)
+        db.commit()
+
+        try:
+            rows, detail = job(db)
+        except Exception as exc:
+            db.rollback()
+            run.status = "failed"
+            run.error = "".join(traceback.format_exception(exc))[-MAX_ERROR_LENGTH:]
+            print(f"Job {job_name} failed: {exc}")
+        else:
+            run.status = "succeeded"
+            run.rows_processed = rows
+            run.detail_json = detail
+        run.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        db.refresh(run)
+        # Keep the record readable after the lease release commits and the session closes.
+        db.expunge(run)
+        return run
+    finally:
+        try:
+            release_lease(db, job_name, owner)
+        except Exception as exc:  # pragma: no cover - defensive logging
+            db.rollback()
+            print(f"Could not release lease of job {job_name}: {exc}")
+        db.close()
@@ -0,0 +1,87 @@
+"""Group leaderboards served from ``GroupDailySnapshot`` rows.
+
+Snapshots are upserted automatically alongside the cached daily status (see
+``services.daily_status``) whenever a member's sessions change, so
+leaderboards only sum snapshot rows instead of aggregating raw sessions per
+member.
+"""
+from __future__ import annotations
+
+from datetime import date as DateType
+from datetime import datetime, timedelta, timezone
+from typing import Literal, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session as ORMSession
+
+from app.models.group import GroupDailySnapshot, GroupMember
+from app.models.user import User
+
+
+LeaderboardRange = Literal["day", "week", "month"]
+
+
+def range_bounds(range_: LeaderboardRange, today: Optional[DateType] = None) -> tuple[DateType, DateType]:
+    """Inclusive date span of a leaderboard range ending today (UTC)."""
+    end = today or datetime.now(timezone.utc).date()
+    if range_ == "week":
+        return end - timedelta(days=end.weekday()), end
+    if range_ == "month":
+        return end.replace(day=1), end
+    return end, end
+
+
+def group_leaderboard(
+    group_id: int,
+    start: DateType,
+    end: DateType,
+    db: ORMSession,
+) -> list[dict]:
+    """Rank active members by snapshot seconds in ``[start, end]``."""
+    totals = db.query(
+        GroupDailySnapshot.user_id.label("user_id"),
+        func.sum(GroupDailySnapshot.total_seconds).label("total_seconds"),
+        func.sum(GroupDailySnapshot.target_completed_count).label("target_completed_count"),
+        func.sum(GroupDailySnapshot.target_total_count).label("target_total_count"),
+        func.max(GroupDailySnapshot.streak_days).label("streak_days"),
+    ).filter(
+        GroupDailySnapshot.group_id == group_id,
+        GroupDailySnapshot.date >= start,
+        GroupDailySnapshot.date <= end,
+    ).group_by(GroupDailySnapshot.user_id).subquery()
+
+    total_seconds = func.coalesce(totals.c.total_seconds, 0)
+    rows = db.query(
+        GroupMember.user_id,
+        User.username,
+        total_seconds.label("total_seconds"),
+        func.coalesce(totals.c.target_completed_count, 0).label("target_completed_count"),
+        func.coalesce(totals.c.target_total_count, 0).label("target_total_count"),
+        func.coalesce(totals.c.streak_days, 0).label("streak_days"),
+    ).join(
+        User, User.id == GroupMember.user_id
+    ).outerjoin(
+        totals, totals.c.user_id == GroupMember.user_id
+    ).filter(
+        GroupMember.group_id == group_id,
+        GroupMember.is_active == True,
+    ).order_by(total_seconds.desc(), GroupMember.user_id.asc()).all()
+
+    entries = []
+    previous_seconds = None
+    rank = 0
+    for position, row in enumerate(rows, start=1):
+        seconds = int(row.total_seconds)
+        if seconds != previous_seconds:
+            rank = position
+            previous_seconds = seconds
+        entries.append({
+            "rank": rank,
+            "user_id": row.user_id,
+            "username": row.username,
+            "total_seconds": seconds,
+            "target_completed_count": int(row.target_completed_count),
+            "target_total_count": int(row.target_total_count),
+            "streak_days": int(row.streak_days),
+        })
+    return entries
@@ -0,0 +1,134 @@
+"""Today's progress of every member of a group, in one round trip.
+
+The board takes three to five queries, whatever the group size:
+
+- the active members with their usernames;
+- one grouped aggregate of today's finished sessions, joined to
+  ``group_members`` and grouped by (member, category);
+- the members' cached ``UserDailyStatus`` rows for target completion.
+  Members without a row (e.g. sessions imported outside the ORM) get their
+  targets matched against the same aggregate, with one grouped evaluation
+  query and one target query.
+
+Boards are cached per group for a short TTL.
+"""
+from __future__ import annotations
+
+import time
+from datetime import date as DateType
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.category import Category
+from app.models.group import GroupMember
+from app.models.session import Session
+from app.models.user import User
+from app.models.user_daily_status import UserDailyStatus
+from app.services.groups import daily_target_counts, day_bounds
+
+
+MEMBERS_BOARD_CACHE_SECONDS = 30
+MEMBERS_BOARD_MAX_ENTRIES = 512
+
+_boards: dict[tuple[int, DateType], tuple[float, list[dict[str, Any]]]] = {}
+_boards_lock = Lock()
+
+
+def _build_board(group_id: int, day: DateType, db: DBSession) -> list[dict[str, Any]]:
+    members = db.query(GroupMember.user_id, GroupMember.role, User.username).join(
+        User, User.id == GroupMember.user_id
+    ).filter(
+        GroupMember.group_id == group_id,
+        GroupMember.is_active == True,
+    ).all()
+    if not members:
+        return []
+
+    start_dt, end_dt = day_bounds(day)
+    seconds_by_category = db.query(
+        Session.user_id,
+        Session.category_id,
+        Category.name.label("category_name"),
+        func.sum(func.coalesce(Session.effective_seconds, Session.duration_seconds)).label("seconds"),
+    ).join(
+        GroupMember, GroupMember.user_id == Session.user_id
+    ).outerjoin(
+        Category, Category.id == Session.category_id
+    ).filter(
+        GroupMember.group_id == group_id,
+        GroupMember.is_active == True,
+        Session.end_time.isnot(None),
+        Session.start_time >= start_dt,
+        Session.start_time <= end_dt,
+    ).group_by(Session.user_id, Session.category_id, Category.name).all()
+
+    totals: dict[int, int] = {}
+    category_seconds: dict[int, dict[Optional[int], int]] = {}
+    top: dict[int, Any] = {}
+    for row in seconds_by_category:
+        seconds = int(row.seconds or 0)
+        totals[row.user_id] = totals.get(row.user_id, 0) + seconds
+        category_seconds.setdefault(row.user_id, {})[row.category_id] = seconds
+        if seconds > 0 and (row.user_id not in top or seconds > int(top[row.user_id].seconds or 0)):
+            top[row.user_id] = row
+
+    user_ids = [member.user_id for member in members]
+    targets = {
+        row.user_id: (row.target_completed_count, row.target_total_count)
+        for row in db.query(
+            UserDailyStatus.user_id,
+            UserDailyStatus.target_completed_count,
+            UserDailyStatus.target_total_count,
+        ).filter(
+            UserDailyStatus.user_id.in_(user_ids),
+            UserDailyStatus.date == day,
+        )
+    }
+    missing = [user_id for user_id in user_ids if user_id not in targets]
+    if missing:
+        targets.update(daily_target_counts(missing, day, category_seconds, db))
+
+    board = []
+    for member in members:
+        best = top.get(member.user_id)
+        completed, total = targets.get(member.user_id, (0, 0))
+        board.append({
+            "user_id": member.user_id,
+            "username": member.username,
+            "role": member.role,
+            "total_seconds": totals.get(member.user_id, 0),
+            "top_category_id": best.category_id if best is not None else None,
+            "top_category_name": best.category_name if best is not None else None,
+            "top_category_seconds": int(best.seconds) if best is not None else 0,
+            "target_completed_count": completed,
+            "target_total_count": total,
+        })
+    board.sort(key=lambda entry: (-entry["total_seconds"], entry["username"]))
+    return board
+
+
+def members_board(group_id: int, db: DBSession, day: Optional[DateType] = None) -> tuple[DateType, list[dict[str, Any]]]:
+    """(day, entries) for a group, reusing a board built in the last few seconds."""
+    day = day or datetime.now(timezone.utc).date()
+    key = (group_id, day)
+    now = time.monotonic()
+    with _boards_lock:
+        cached = _boards.get(key)
+        if cached is not None and cached[0] > now:
+            return day, cached[1]
+
+    board = _build_board(group_id, day, db)
+    with _boards_lock:
+        if len(_boards) >= MEMBERS_BOARD_MAX_ENTRIES:
+            _boards.clear()
+        _boards[key] = (now + MEMBERS_BOARD_CACHE_SECONDS, board)
+    return day, board
+
+
+def reset_members_board_cache() -> None:
+    with _boards_lock:
+        _boards.clear()
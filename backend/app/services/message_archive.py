@@ -0,0 +1,174 @@
+"""Cold storage for group messages.
+
+The archive job moves messages older than ``GROUP_MESSAGE_ARCHIVE_DAYS`` and
+every soft-deleted message out of ``group_messages`` into
+``group_messages_archive``. On Postgres the archive is range-partitioned by
+``archive_month`` and the job creates missing monthly partitions as it goes.
+
+Reads stay on the hot table and only fall through to the archive when a page
+is not filled. Archived live messages are always older than the hot ones,
+so paging with ``before`` continues seamlessly into the archive.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import date as DateType
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import Text, case, cast, delete, func, insert, or_, select, text
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.group import GroupMessage, GroupMessageArchive
+from app.models.user import User
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+_ARCHIVED_COLUMNS = (
+    "id", "group_id", "user_id", "message_type", "content", "metadata_json", "created_at", "deleted_at",
+)
+
+
+@dataclass
+class ArchiveJobStats:
+    cutoff: datetime
+    moved: int = 0
+    deleted_moved: int = 0
+    batches: int = 0
+    partitions_created: int = 0
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["cutoff"] = self.cutoff.isoformat()
+        return data
+
+
+def archive_month(created_at: datetime) -> DateType:
+    return DateType(created_at.year, created_at.month, 1)
+
+
+def _ensure_partitions(months: Iterable[DateType], db: DBSession, known: set[DateType]) -> int:
+    """Create monthly archive partitions on Postgres; other databases use one table."""
+    if db.get_bind().dialect.name != "postgresql":
+        return 0
+    created = 0
+    for month in sorted(set(months) - known):
+        following = DateType(month.year + month.month // 12, month.month % 12 + 1, 1)
+        db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS group_messages_archive_{month:%Y%m} "
+            f"PARTITION OF group_messages_archive "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        ))
+        known.add(month)
+        created += 1
+    return created
+
+
+def run_message_archive_job(
+    db: DBSession,
+    older_than_days: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    now: Optional[datetime] = None,
+) -> ArchiveJobStats:
+    """Move old and soft-deleted messages to the archive, one committed batch at a time."""
+    started = time.perf_counter()
+    days = settings.GROUP_MESSAGE_ARCHIVE_DAYS if older_than_days is None else older_than_days
+    stats = ArchiveJobStats(cutoff=(now or datetime.now(timezone.utc)) - timedelta(days=days))
+    hot = GroupMessage.__table__
+    known_months: set[DateType] = set()
+
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(*(hot.c[name] for name in _ARCHIVED_COLUMNS)).where(
+                hot.c.id > last_id,
+                or_(hot.c.created_at < stats.cutoff, hot.c.deleted_at.isnot(None)),
+            ).order_by(hot.c.id).limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            break
+
+        archived = [{**row, "archive_month": archive_month(row["created_at"])} for row in rows]
+        stats.partitions_created += _ensure_partitions(
+            (row["archive_month"] for row in archived), db, known_months
+        )
+        ids = [row["id"] for row in rows]
+        db.execute(insert(GroupMessageArchive), archived)
+        db.execute(delete(GroupMessage).where(GroupMessage.id.in_(ids)))
+        db.commit()
+
+        stats.batches += 1
+        stats.moved += len(rows)
+        stats.deleted_moved += sum(1 for row in rows if row["deleted_at"] is not None)
+        last_id = ids[-1]
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def _metadata_text(model, db: DBSession):
+    """Metadata column as JSON text, NULL where it is not a JSON object.
+
+    Postgres stores JSONB, which is always valid. SQLite keeps whatever text
+    legacy rows were written with, so it is checked with ``json_valid``
+    rather than decoded in Python.
+    """
+    raw = cast(model.metadata_json, Text)
+    if db.get_bind().dialect.name != "sqlite":
+        return raw.label("metadata_raw")
+    column = model.__table__.c.metadata_json
+    # Nested so json_type never sees malformed text, which it rejects with an error.
+    is_object = case((func.json_valid(column) == 1, func.json_type(column)), else_=None) == "object"
+    return case((is_object, raw), else_=None).label("metadata_raw")
+
+
+def _page_query(model, group_id: int, before: Optional[int], limit: int, db: DBSession):
+    query = db.query(
+        model.id,
+        model.group_id,
+        model.user_id,
+        User.username,
+        model.message_type,
+        model.content,
+        _metadata_text(model, db),
+        model.created_at,
+        model.deleted_at,
+    ).join(
+        User, User.id == model.user_id
+    ).filter(
+        model.group_id == group_id,
+        model.deleted_at.is_(None),
+    )
+    if before is not None:
+        query = query.filter(model.id < before)
+    return query.order_by(model.id.desc()).limit(limit).all()
+
+
+def message_page_rows(group_id: int, before: Optional[int], limit: int, db: DBSession) -> list:
+    """Newest-first page of live messages, continuing into the archive when needed."""
+    rows = _page_query(GroupMessage, group_id, before, limit, db)
+    if len(rows) < limit:
+        archive_before = rows[-1].id if rows else before
+        rows.extend(_page_query(GroupMessageArchive, group_id, archive_before, limit - len(rows), db))
+    return rows
+
+
+def messages_by_id(message_ids: list[int], db: DBSession) -> dict[int, tuple[Any, str]]:
+    """Live messages with their author names, looked up in the hot table then the archive."""
+    found: dict[int, tuple[Any, str]] = {}
+    for model in (GroupMessage, GroupMessageArchive):
+        missing = [message_id for message_id in message_ids if message_id not in found]
+        if not missing:
+            break
+        rows = db.query(model, func.coalesce(User.username, "")).join(
+            User, User.id == model.user_id
+        ).filter(
+            model.id.in_(missing),
+            model.deleted_at.is_(None),
+        ).all()
+        found.update((message.id, (message, username)) for message, username in rows)
+    return found
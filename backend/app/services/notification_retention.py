@@ -0,0 +1,171 @@
+"""Retention for the notification inbox.
+
+Evaluation writes one notification per target per period, so inboxes grow
+without bound. The retention job keeps them small:
+
+- read notifications from weeks that ended more than
+  ``NOTIFICATION_DIGEST_AFTER_DAYS`` ago are collapsed into one read
+  ``weekly_digest`` row per (user, UTC week) holding counts per type, and the
+  originals are deleted. Notifications read late are folded into the existing
+  digest of their week;
+- digests older than ``NOTIFICATION_DIGEST_RETENTION_DAYS`` are deleted.
+
+Unread notifications are never touched, so the unread counter stays exact.
+Work is done in committed chunks of ``NOTIFICATION_RETENTION_BATCH_SIZE``.
+"""
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date as DateType
+from datetime import datetime, time as TimeType, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.notification import Notification
+from app.services.data_version import bump_data_version
+
+
+DIGEST_TYPE = "weekly_digest"
+
+TYPE_LABELS = {
+    "target_met": "目标已达成",
+    "target_missed": "目标未达成",
+    "group_public_request": "公开小组申请",
+}
+
+
+@dataclass
+class NotificationRetentionStats:
+    digest_cutoff: datetime
+    purge_cutoff: datetime
+    digested: int = 0
+    digests_created: int = 0
+    digests_updated: int = 0
+    digests_purged: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["digest_cutoff"] = self.digest_cutoff.isoformat()
+        data["purge_cutoff"] = self.purge_cutoff.isoformat()
+        return data
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def week_start(value: datetime) -> datetime:
+    """Monday 00:00 UTC of the week containing ``value``."""
+    day = _utc(value).date()
+    return datetime.combine(day - timedelta(days=day.weekday()), TimeType.min, tzinfo=timezone.utc)
+
+
+def _digest_text(start: datetime, counts: dict[str, int]) -> tuple[str, str]:
+    end: DateType = start.date() + timedelta(days=6)
+    title = f"通知周报 {start.date().isoformat()} 至 {end.isoformat()}"
+    content = "，".join(f"{TYPE_LABELS.get(kind, kind)} {count} 条" for kind, count in sorted(counts.items()))
+    return title, content
+
+
+def _save_digests(
+    groups: dict[tuple[int, datetime], dict[str, int]],
+    now: datetime,
+    db: DBSession,
+    stats: NotificationRetentionStats,
+) -> None:
+    existing = {
+        (row.user_id, _utc(row.created_at)): row
+        for row in db.query(Notification).filter(
+            Notification.type == DIGEST_TYPE,
+            Notification.user_id.in_(sorted({user_id for user_id, _ in groups})),
+            Notification.created_at.in_(sorted({start for _, start in groups})),
+        ).all()
+    }
+    for (user_id, start), counts in groups.items():
+        digest = existing.get((user_id, start))
+        if digest is None:
+            digest = Notification(user_id=user_id, type=DIGEST_TYPE, created_at=start, read_at=now)
+            db.add(digest)
+            stats.digests_created += 1
+        else:
+            merged = dict(digest.digest_counts or {})
+            for kind, count in counts.items():
+                merged[kind] = merged.get(kind, 0) + count
+            counts = merged
+            stats.digests_updated += 1
+        digest.digest_counts = counts
+        digest.title, digest.content = _digest_text(start, counts)
+
+
+def run_notification_retention_job(
+    db: DBSession,
+    digest_after_days: Optional[int] = None,
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> NotificationRetentionStats:
+    """Collapse old read notifications into weekly digests and purge expired digests."""
+    started = time.perf_counter()
+    now = now or datetime.now(timezone.utc)
+    digest_days = settings.NOTIFICATION_DIGEST_AFTER_DAYS if digest_after_days is None else digest_after_days
+    keep_days = settings.NOTIFICATION_DIGEST_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.NOTIFICATION_RETENTION_BATCH_SIZE
+    stats = NotificationRetentionStats(
+        # Only whole weeks, so a digest never covers a week that is still filling up.
+        digest_cutoff=week_start(now - timedelta(days=digest_days)),
+        purge_cutoff=now - timedelta(days=keep_days),
+    )
+    table = Notification.__table__
+
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.user_id, table.c.type, table.c.created_at).where(
+                table.c.id > last_id,
+                table.c.read_at.isnot(None),
+                table.c.type != DIGEST_TYPE,
+                table.c.created_at < stats.digest_cutoff,
+            ).order_by(table.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        groups: dict[tuple[int, datetime], dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for row in rows:
+            groups[(row.user_id, week_start(row.created_at))][row.type] += 1
+        _save_digests({key: dict(counts) for key, counts in groups.items()}, now, db, stats)
+        ids = [row.id for row in rows]
+        db.execute(delete(Notification).where(Notification.id.in_(ids)))
+        bump_data_version(db, {row.user_id for row in rows})
+        db.commit()
+
+        stats.batches += 1
+        stats.digested += len(rows)
+        last_id = ids[-1]
+
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.user_id).where(
+                table.c.type == DIGEST_TYPE,
+                table.c.created_at < stats.purge_cutoff,
+            ).order_by(table.c.id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        db.execute(delete(Notification).where(Notification.id.in_([row.id for row in rows])))
+        bump_data_version(db, {row.user_id for row in rows})
+        db.commit()
+        stats.batches += 1
+        stats.digests_purged += len(rows)
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
@@ -0,0 +1,78 @@
+"""Notification inbox helpers and the per-user unread counter.
+
+``users.unread_notification_count`` lets the app badge read the number of
+unread notifications without touching the inbox. Every write that creates a
+notification or changes its read state goes through these helpers, which
+adjust the counter in the same transaction.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import case, update
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.notification import Notification
+from app.models.user import User
+
+
+def _adjust_unread(db: DBSession, user_id: int, delta: int) -> None:
+    counter = User.unread_notification_count + delta
+    db.connection().execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(unread_notification_count=case((counter < 0, 0), else_=counter))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def add_notification(
+    db: DBSession,
+    user_id: int,
+    type: str,
+    title: str,
+    content: Optional[str] = None,
+) -> Notification:
+    """Add an unread notification and count it towards the user's badge."""
+    notification = Notification(user_id=user_id, type=type, title=title, content=content)
+    db.add(notification)
+    _adjust_unread(db, user_id, 1)
+    return notification
+
+
+def mark_read(db: DBSession, notification: Notification) -> bool:
+    """Mark one notification read; False when it already was.
+
+    The conditional UPDATE lets only one of several concurrent requests
+    flip the row, so the counter is decremented once.
+    """
+    updated = db.query(Notification).filter(
+        Notification.id == notification.id,
+        Notification.read_at.is_(None),
+    ).update(
+        {Notification.read_at: datetime.now(timezone.utc)},
+        synchronize_session=False,
+    )
+    db.expire(notification, ["read_at"])
+    if updated:
+        _adjust_unread(db, notification.user_id, -updated)
+    return bool(updated)
+
+
+def mark_all_read(db: DBSession, user_id: int) -> int:
+    """Mark every unread notification of a user read and reset the counter."""
+    updated_count = db.query(Notification).filter(
+        Notification.user_id == user_id,
+        Notification.read_at.is_(None),
+    ).update(
+        {Notification.read_at: datetime.now(timezone.utc)},
+        synchronize_session=False,
+    )
+    db.connection().execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(unread_notification_count=0)
+        .execution_options(synchronize_session=False)
+    )
+    return updated_count
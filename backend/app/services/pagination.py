@@ -0,0 +1,95 @@
+"""Keyset cursors and cheap row-count estimates for large listings."""
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import time
+from datetime import datetime
+from threading import Lock
+from typing import Any, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Query
+from sqlalchemy.orm import Session as DBSession
+
+
+COUNT_CACHE_SECONDS = 60
+COUNT_CACHE_MAX_ENTRIES = 256
+
+_count_cache: dict[str, tuple[float, int]] = {}
+_count_cache_lock = Lock()
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a cursor produced by ``encode_cursor``; raise 400 when malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def decode_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _planner_estimate(db: DBSession, query: Query) -> Optional[int]:
+    """Row estimate from the Postgres planner, without scanning the table."""
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+    compiled = query.statement.compile(dialect=bind.dialect)
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached_count(db: DBSession, query: Query) -> int:
+    """Exact count reused for COUNT_CACHE_SECONDS per distinct filter set."""
+    compiled = query.statement.compile(dialect=db.get_bind().dialect)
+    key = f"{compiled}|{sorted(compiled.params.items(), key=lambda item: item[0])!r}"
+    now = time.monotonic()
+    with _count_cache_lock:
+        cached = _count_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+    total = query.order_by(None).count()
+    with _count_cache_lock:
+        if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+            _count_cache.clear()
+        _count_cache[key] = (now + COUNT_CACHE_SECONDS, total)
+    return total
+
+
+def estimate_count(db: DBSession, query: Query) -> int:
+    """Approximate number of rows matched by ``query``.
+
+    Postgres answers from planner statistics; other databases fall back to a
+    short-lived cache of the exact count.
+    """
+    estimate = _planner_estimate(db, query.order_by(None))
+    if estimate is not None:
+        return estimate
+    return _cached_count(db, query)
+
+
+def reset_count_cache() -> None:
+    with _count_cache_lock:
+        _count_cache.clear()
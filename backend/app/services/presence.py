@@ -0,0 +1,316 @@
+"""Who is timing right now, per group.
+
+``PresenceRegistry`` keeps every running timer in memory, indexed by the
+groups its owner belongs to, so ``/groups/{id}/presence`` is answered from
+memory in O(focusing members).
+
+The registry is fed by a flush hook on sessions (start, stop, delete) and on
+group memberships (join, leave). Updates are published through the group
+backplane after commit, so every worker applies them. ``/sessions/active``
+repairs drift for the polling user, and each worker loads the running
+timers at startup.
+
+With ``GROUP_PRESENCE="database"`` (or "auto" without a shared backplane)
+presence is read from the database with one query instead. That covers
+multi-worker deployments that have no Postgres backplane.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session as ORMSession
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.group import GroupMember
+from app.models.session import Session
+from app.models.user import User
+from app.services.backplane import PostgresBackplane
+from app.services.events import run_after_commit
+from app.services.group_channels import backplane, register_backplane_handler
+
+
+PRESENCE_KIND = "presence"
+
+
+@dataclass
+class Focus:
+    user_id: int
+    username: str
+    session_id: int
+    start_time: datetime
+    category_id: Optional[int]
+    category_name: Optional[str]
+    group_ids: set[int] = field(default_factory=set)
+
+    def entry(self, now: datetime) -> dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "username": self.username,
+            "session_id": self.session_id,
+            "category_id": self.category_id,
+            "category_name": self.category_name,
+            "start_time": self.start_time,
+            "elapsed_seconds": max(0, int((now - self.start_time).total_seconds())),
+        }
+
+
+def _aware(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+class PresenceRegistry:
+    """Running timers of this worker's view of the world, indexed by group."""
+
+    def __init__(self) -> None:
+        self._focus: dict[int, Focus] = {}
+        self._by_group: dict[int, set[int]] = {}
+        self._lock = Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._focus.clear()
+            self._by_group.clear()
+
+    def start(self, focus: Focus) -> None:
+        with self._lock:
+            self._remove(focus.user_id)
+            self._focus[focus.user_id] = focus
+            for group_id in focus.group_ids:
+                self._by_group.setdefault(group_id, set()).add(focus.user_id)
+
+    def stop(self, user_id: int, session_id: Optional[int] = None) -> None:
+        with self._lock:
+            focus = self._focus.get(user_id)
+            if focus is not None and (session_id is None or focus.session_id == session_id):
+                self._remove(user_id)
+
+    def join(self, group_id: int, user_id: int) -> None:
+        with self._lock:
+            focus = self._focus.get(user_id)
+            if focus is not None:
+                focus.group_ids.add(group_id)
+                self._by_group.setdefault(group_id, set()).add(user_id)
+
+    def leave(self, group_id: int, user_id: int) -> None:
+        with self._lock:
+            focus = self._focus.get(user_id)
+            if focus is not None:
+                focus.group_ids.discard(group_id)
+            self._discard_member(group_id, user_id)
+
+    def current(self, user_id: int) -> Optional[Focus]:
+        with self._lock:
+            return self._focus.get(user_id)
+
+    def group_entries(self, group_id: int, now: Optional[datetime] = None) -> list[dict[str, Any]]:
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            focused = [self._focus[user_id] for user_id in self._by_group.get(group_id, ())]
+        return sorted((focus.entry(now) for focus in focused), key=lambda entry: entry["start_time"])
+
+    def _remove(self, user_id: int) -> None:
+        focus = self._focus.pop(user_id, None)
+        if focus is not None:
+            for group_id in focus.group_ids:
+                self._discard_member(group_id, user_id)
+
+    def _discard_member(self, group_id: int, user_id: int) -> None:
+        members = self._by_group.get(group_id)
+        if members is not None:
+            members.discard(user_id)
+            if not members:
+                del self._by_group[group_id]
+
+
+registry = PresenceRegistry()
+
+
+def presence_mode() -> str:
+    choice = settings.GROUP_PRESENCE
+    if choice == "auto":
+        # Memory is only complete when every worker hears every update.
+        choice = "memory" if isinstance(backplane, PostgresBackplane) else "database"
+    return choice
+
+
+def _focus_payload(focus: Focus) -> dict[str, Any]:
+    return {
+        "kind": PRESENCE_KIND,
+        "action": "start",
+        "user_id": focus.user_id,
+        "username": focus.username,
+        "session_id": focus.session_id,
+        "start_time": focus.start_time.isoformat(),
+        "category_id": focus.category_id,
+        "category_name": focus.category_name,
+        "group_ids": sorted(focus.group_ids),
+    }
+
+
+def apply_presence(payload: dict[str, Any]) -> None:
+    """Backplane handler: apply one presence update to this worker's registry."""
+    action = payload.get("action")
+    if action == "start":
+        registry.start(Focus(
+            user_id=payload["user_id"],
+            username=payload.get("username") or "",
+            session_id=payload["session_id"],
+            start_time=_aware(datetime.fromisoformat(payload["start_time"])),
+            category_id=payload.get("category_id"),
+            category_name=payload.get("category_name"),
+            group_ids=set(payload.get("group_ids") or ()),
+        ))
+    elif action == "stop":
+        registry.stop(payload["user_id"], payload.get("session_id"))
+    elif action == "join":
+        registry.join(payload["group_id"], payload["user_id"])
+    elif action == "leave":
+        registry.leave(payload["group_id"], payload["user_id"])
+
+
+register_backplane_handler(PRESENCE_KIND, apply_presence)
+
+
+def _load_focus(session: Session, connection) -> Focus:
+    username = connection.execute(select(User.username).where(User.id == session.user_id)).scalar()
+    category_name = None
+    if session.category_id is not None:
+        category_name = connection.execute(
+            select(Category.name).where(Category.id == session.category_id)
+        ).scalar()
+    group_ids = connection.execute(
+        select(GroupMember.group_id).where(
+            GroupMember.user_id == session.user_id,
+            GroupMember.is_active == True,
+        )
+    ).scalars().all()
+    return Focus(
+        user_id=session.user_id,
+        username=username or "",
+        session_id=session.id,
+        start_time=_aware(session.start_time),
+        category_id=session.category_id,
+        category_name=category_name,
+        group_ids=set(group_ids),
+    )
+
+
+def _publish_after_commit(db: ORMSession, payload: dict[str, Any]) -> None:
+    run_after_commit(db, lambda: backplane.publish(payload))
+
+
+def _changed(obj, attribute: str) -> bool:
+    return inspect(obj).attrs[attribute].history.has_changes()
+
+
+def _membership_payload(action: str, member: GroupMember) -> dict[str, Any]:
+    return {"kind": PRESENCE_KIND, "action": action, "group_id": member.group_id, "user_id": member.user_id}
+
+
+def _stop_payload(session: Session) -> dict[str, Any]:
+    return {"kind": PRESENCE_KIND, "action": "stop", "user_id": session.user_id, "session_id": session.id}
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _track_presence(session: ORMSession, flush_context) -> None:
+    if presence_mode() != "memory":
+        return
+    for obj in session.new:
+        if isinstance(obj, Session) and obj.end_time is None:
+            _publish_after_commit(session, _focus_payload(_load_focus(obj, session.connection())))
+        elif isinstance(obj, GroupMember) and obj.is_active:
+            _publish_after_commit(session, _membership_payload("join", obj))
+    for obj in session.dirty:
+        if isinstance(obj, Session) and obj.end_time is not None and _changed(obj, "end_time"):
+            _publish_after_commit(session, _stop_payload(obj))
+        elif isinstance(obj, GroupMember) and _changed(obj, "is_active"):
+            _publish_after_commit(session, _membership_payload("join" if obj.is_active else "leave", obj))
+    for obj in session.deleted:
+        if isinstance(obj, Session):
+            _publish_after_commit(session, _stop_payload(obj))
+        elif isinstance(obj, GroupMember):
+            _publish_after_commit(session, _membership_payload("leave", obj))
+
+
+def sync_user_presence(user_id: int, active: Optional[Session], db: ORMSession) -> None:
+    """Repair the registry from a fresh read of the user's running timer."""
+    if presence_mode() != "memory":
+        return
+    current = registry.current(user_id)
+    if active is None:
+        if current is not None:
+            backplane.publish({"kind": PRESENCE_KIND, "action": "stop", "user_id": user_id})
+        return
+    if current is None or current.session_id != active.id:
+        backplane.publish(_focus_payload(_load_focus(active, db.connection())))
+
+
+def load_presence(db: ORMSession) -> int:
+    """Fill this worker's registry with every running timer; called at startup."""
+    registry.clear()
+    if presence_mode() != "memory":
+        return 0
+    rows = db.query(
+        Session.id, Session.user_id, User.username, Session.start_time, Session.category_id, Category.name,
+    ).join(
+        User, User.id == Session.user_id
+    ).outerjoin(
+        Category, Category.id == Session.category_id
+    ).filter(Session.end_time.is_(None)).all()
+    memberships: dict[int, set[int]] = {}
+    user_ids = [row.user_id for row in rows]
+    if user_ids:
+        for user_id, group_id in db.query(GroupMember.user_id, GroupMember.group_id).filter(
+            GroupMember.user_id.in_(user_ids),
+            GroupMember.is_active == True,
+        ):
+            memberships.setdefault(user_id, set()).add(group_id)
+    for row in rows:
+        registry.start(Focus(
+            user_id=row.user_id,
+            username=row.username or "",
+            session_id=row.id,
+            start_time=_aware(row.start_time),
+            category_id=row.category_id,
+            category_name=row.name,
+            group_ids=memberships.get(row.user_id, set()),
+        ))
+    return len(rows)
+
+
+def group_presence(group_id: int, db: ORMSession) -> tuple[str, list[dict[str, Any]]]:
+    """(source, entries) of the members of a group timing right now."""
+    mode = presence_mode()
+    if mode == "memory":
+        return mode, registry.group_entries(group_id)
+
+    now = datetime.now(timezone.utc)
+    rows = db.query(
+        Session.id, Session.user_id, User.username, Session.start_time, Session.category_id, Category.name,
+    ).join(
+        GroupMember, GroupMember.user_id == Session.user_id
+    ).join(
+        User, User.id == Session.user_id
+    ).outerjoin(
+        Category, Category.id == Session.category_id
+    ).filter(
+        GroupMember.group_id == group_id,
+        GroupMember.is_active == True,
+        Session.end_time.is_(None),
+    ).order_by(Session.start_time).all()
+    return mode, [
+        Focus(
+            user_id=row.user_id,
+            username=row.username or "",
+            session_id=row.id,
+            start_time=_aware(row.start_time),
+            category_id=row.category_id,
+            category_name=row.name,
+        ).entry(now)
+        for row in rows
+    ]
@@ -0,0 +1,94 @@
+"""Cached directory of public groups.
+
+The directory is the same for every viewer apart from ``my_role``, so the
+ordered group list is built once and kept in process memory. Viewers only
+pay for the role lookup of the page they request.
+
+The cache is dropped after any commit that creates, edits or deletes a group
+(see the flush hook below) and after joins/leaves of a public group. A
+short TTL bounds staleness across worker processes, which do not share the
+cache.
+"""
+from __future__ import annotations
+
+import time
+from threading import Lock
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session as ORMSession
+
+from app.models.group import Group
+from app.services.events import run_after_commit
+
+
+PUBLIC_DIRECTORY_CACHE_SECONDS = 60
+DIRECTORY_DIRTY_KEY = "public_directory_dirty"
+
+_directory: Optional[tuple[float, list[dict[str, Any]]]] = None
+_generation = 0
+_lock = Lock()
+
+
+def _load_directory(db: ORMSession) -> list[dict[str, Any]]:
+    groups = db.query(Group).filter(
+        Group.visibility == "public",
+    ).order_by(Group.updated_at.desc(), Group.id.desc()).all()
+    return [
+        {
+            "id": group.id,
+            "name": group.name,
+            "description": group.description,
+            "owner_id": group.owner_id,
+            "invite_code": group.invite_code,
+            "visibility": group.visibility,
+            "created_at": group.created_at,
+            "updated_at": group.updated_at,
+            "member_count": group.member_count,
+        }
+        for group in groups
+    ]
+
+
+def public_directory(db: ORMSession) -> list[dict[str, Any]]:
+    """All public groups, most recently updated first."""
+    global _directory
+    now = time.monotonic()
+    with _lock:
+        if _directory is not None and _directory[0] > now:
+            return _directory[1]
+        generation = _generation
+
+    entries = _load_directory(db)
+    with _lock:
+        # Skip caching if an invalidation raced with the load.
+        if generation == _generation:
+            _directory = (now + PUBLIC_DIRECTORY_CACHE_SECONDS, entries)
+    return entries
+
+
+def invalidate_public_directory() -> None:
+    global _directory, _generation
+    with _lock:
+        _directory = None
+        _generation += 1
+
+
+def invalidate_public_directory_after_commit(db: ORMSession) -> None:
+    if not db.info.get(DIRECTORY_DIRTY_KEY):
+        db.info[DIRECTORY_DIRTY_KEY] = True
+        run_after_commit(db, invalidate_public_directory)
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _watch_groups(session: ORMSession, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Group):
+            invalidate_public_directory_after_commit(session)
+            return
+
+
+@event.listens_for(ORMSession, "after_commit")
+@event.listens_for(ORMSession, "after_rollback")
+def _reset_dirty(session: ORMSession) -> None:
+    session.info.pop(DIRECTORY_DIRTY_KEY, None)
@@ -0,0 +1,350 @@
+"""Calendar task reminders and the server-side reminder engine.
+
+Each worker keeps a ``ReminderSchedule``, a min-heap of upcoming reminder
+instants, so a tick that has nothing due never touches the database:
+
+- the schedule is loaded at startup with every unfired reminder due within
+  ``REMINDER_HORIZON_MINUTES`` and reloaded every ``REMINDER_RESYNC_SECONDS``,
+  which also picks up tasks written by other workers;
+- commits that create, edit or delete a calendar task update the schedule of
+  the committing worker right away;
+- ``fire_due_reminders`` pops the due instants, rechecks the tasks against
+  the database and fires them in batches: one UPDATE sets
+  ``reminder_fired_at`` only where it is still NULL, so a reminder fires once
+  across all workers. Fired reminders become a ``calendar_reminder``
+  notification and a ``reminder_due`` live event. The event is published
+  through the group backplane after commit, so the user's streams on every
+  worker receive it, not only those on the worker that won the claim.
+
+Clients only listen for those; ``/calendar-tasks/reminders/due`` stays as a
+fallback for clients without a live stream.
+"""
+from __future__ import annotations
+
+import heapq
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session as DBSession
+
+from app.core.config import settings
+from app.models.calendar_task import CalendarTask
+from app.models.user import User
+from app.services.events import hub, run_after_commit
+from app.services.group_channels import backplane, register_backplane_handler
+from app.services.notifications import add_notification
+from app.utils.timezones import get_zone
+
+
+DEFAULT_REMINDER_MINUTES = 10
+MAX_REMINDER_MINUTES = 1440
+REMINDER_NOTIFICATION_TYPE = "calendar_reminder"
+REMINDER_KIND = "reminder_due"
+
+
+def _ensure_timezone(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _instant(scheduled_start: Optional[datetime], minutes_before: Optional[int]) -> Optional[datetime]:
+    start = _ensure_timezone(scheduled_start)
+    if start is None:
+        return None
+    minutes = minutes_before if minutes_before is not None else DEFAULT_REMINDER_MINUTES
+    return start - timedelta(minutes=minutes)
+
+
+def reminder_time(task: CalendarTask) -> Optional[datetime]:
+    """Instant at which a task's reminder becomes due."""
+    return _instant(task.scheduled_start, task.reminder_minutes_before)
+
+
+def reminder_pending(task: CalendarTask) -> bool:
+    """Whether the task still has a reminder waiting to fire."""
+    return (
+        task.status == "scheduled"
+        and bool(task.reminder_enabled)
+        and task.reminder_fired_at is None
+        and task.scheduled_start is not None
+    )
+
+
+def due_reminder_tasks(
+    db: DBSession,
+    now: datetime,
+    user_ids: Optional[Iterable[int]] = None,
+) -> list[CalendarTask]:
+    """Reminder-enabled scheduled tasks whose reminder window has arrived."""
+    query = db.query(CalendarTask).filter(
+        CalendarTask.status == "scheduled",
+        CalendarTask.reminder_enabled == True,
+        CalendarTask.reminder_fired_at.is_(None),
+        CalendarTask.scheduled_start.isnot(None),
+    )
+    if user_ids is not None:
+        ids = list(user_ids)
+        if not ids:
+            return []
+        query = query.filter(CalendarTask.user_id.in_(ids))
+
+    tasks = query.order_by(CalendarTask.scheduled_start.asc(), CalendarTask.id.asc()).all()
+    return [task for task in tasks if reminder_time(task) <= now]
+
+
+def reminder_event_data(task: CalendarTask) -> dict:
+    return {
+        "task_id": task.id,
+        "title": task.title,
+        "scheduled_start": _ensure_timezone(task.scheduled_start).isoformat(),
+        "reminder_minutes_before": task.reminder_minutes_before,
+    }
+
+
+class ReminderSchedule:
+    """Min-heap of (reminder instant, task id) for this process.
+
+    Rescheduling or cancelling a task only updates ``_due_at``; heap entries
+    that no longer match it are dropped when they reach the top.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int]] = []
+        self._due_at: dict[int, datetime] = {}
+        self._lock = Lock()
+        self.synced_at: Optional[datetime] = None
+
+    def schedule(self, task_id: int, due_at: datetime) -> None:
+        with self._lock:
+            if self._due_at.get(task_id) == due_at:
+                return
+            self._due_at[task_id] = due_at
+            heapq.heappush(self._heap, (due_at, task_id))
+
+    def cancel(self, task_id: int) -> None:
+        with self._lock:
+            self._due_at.pop(task_id, None)
+
+    def next_due(self) -> Optional[datetime]:
+        with self._lock:
+            self._drop_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime, limit: int) -> list[tuple[int, datetime]]:
+        """Remove and return up to ``limit`` (task id, instant) pairs due by ``now``."""
+        due = []
+        with self._lock:
+            while len(due) < limit:
+                self._drop_stale()
+                if not self._heap or self._heap[0][0] > now:
+                    break
+                due_at, task_id = heapq.heappop(self._heap)
+                del self._due_at[task_id]
+                due.append((task_id, due_at))
+        return due
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._due_at.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._heap.clear()
+            self._due_at.clear()
+            self.synced_at = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._due_at)
+
+
+reminder_schedule = ReminderSchedule()
+
+
+@dataclass
+class ReminderFireStats:
+    loaded: int = 0
+    fired: int = 0
+    rescheduled: int = 0
+    skipped: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _grace_cutoff(now: datetime) -> datetime:
+    # Reminders of tasks that started long ago are stale; they are not fired late.
+    return now - timedelta(minutes=settings.REMINDER_GRACE_MINUTES)
+
+
+def _needs_resync(schedule: ReminderSchedule, now: datetime) -> bool:
+    return schedule.synced_at is None or now - schedule.synced_at >= timedelta(seconds=settings.REMINDER_RESYNC_SECONDS)
+
+
+def has_reminder_work(now: datetime, schedule: ReminderSchedule = reminder_schedule) -> bool:
+    """Whether a tick at ``now`` has a due reminder or a resync to do."""
+    next_due = schedule.next_due()
+    return _needs_resync(schedule, now) or (next_due is not None and next_due <= now)
+
+
+def load_reminders(
+    db: DBSession,
+    now: Optional[datetime] = None,
+    schedule: ReminderSchedule = reminder_schedule,
+) -> int:
+    """Add every unfired reminder due within the horizon to ``schedule``."""
+    now = now or datetime.now(timezone.utc)
+    horizon = now + timedelta(minutes=settings.REMINDER_HORIZON_MINUTES)
+    rows = db.query(
+        CalendarTask.id,
+        CalendarTask.scheduled_start,
+        CalendarTask.reminder_minutes_before,
+    ).filter(
+        CalendarTask.status == "scheduled",
+        CalendarTask.reminder_enabled == True,
+        CalendarTask.reminder_fired_at.is_(None),
+        CalendarTask.scheduled_start > _grace_cutoff(now),
+        CalendarTask.scheduled_start <= horizon + timedelta(minutes=MAX_REMINDER_MINUTES),
+    ).all()
+    loaded = 0
+    for row in rows:
+        due_at = _instant(row.scheduled_start, row.reminder_minutes_before)
+        if due_at <= horizon:
+            schedule.schedule(row.id, due_at)
+            loaded += 1
+    schedule.synced_at = now
+    return loaded
+
+
+def _claim(db: DBSession, task_ids: list[int], now: datetime) -> set[int]:
+    """Set ``reminder_fired_at`` where it is still unset; returns the ids this call fired."""
+    pending = (
+        CalendarTask.reminder_fired_at.is_(None),
+        CalendarTask.status == "scheduled",
+        CalendarTask.reminder_enabled == True,
+    )
+    if db.get_bind().dialect.update_returning:
+        statement = update(CalendarTask).where(CalendarTask.id.in_(task_ids), *pending).values(
+            reminder_fired_at=now,
+        ).returning(CalendarTask.id).execution_options(synchronize_session=False)
+        return set(db.execute(statement).scalars().all())
+    claimed = set()
+    for task_id in task_ids:
+        if db.query(CalendarTask).filter(CalendarTask.id == task_id, *pending).update(
+            {CalendarTask.reminder_fired_at: now},
+            synchronize_session=False,
+        ):
+            claimed.add(task_id)
+    return claimed
+
+
+def _notify(db: DBSession, task: CalendarTask, zone_name: Optional[str]) -> None:
+    start = _ensure_timezone(task.scheduled_start).astimezone(get_zone(zone_name))
+    add_notification(
+        db,
+        task.user_id,
+        REMINDER_NOTIFICATION_TYPE,
+        f"计划提醒：{task.title}",
+        f"{start:%m-%d %H:%M} 开始",
+    )
+    payload = {"kind": REMINDER_KIND, "user_id": task.user_id, "data": reminder_event_data(task)}
+    run_after_commit(db, lambda: backplane.publish(payload))
+
+
+def apply_reminder(payload: dict[str, Any]) -> None:
+    """Backplane handler: publish a fired reminder to this worker's streams."""
+    hub.publish(payload["user_id"], REMINDER_KIND, payload["data"])
+
+
+register_backplane_handler(REMINDER_KIND, apply_reminder)
+
+
+def fire_due_reminders(
+    db: DBSession,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+    schedule: ReminderSchedule = reminder_schedule,
+) -> ReminderFireStats:
+    """Fire every reminder in ``schedule`` that is due by ``now``."""
+    started = time.perf_counter()
+    now = now or datetime.now(timezone.utc)
+    batch_size = batch_size or settings.REMINDER_BATCH_SIZE
+    stats = ReminderFireStats()
+    if _needs_resync(schedule, now):
+        stats.loaded = load_reminders(db, now, schedule)
+
+    while True:
+        due = dict(schedule.pop_due(now, batch_size))
+        if not due:
+            break
+        tasks = {task.id: task for task in db.query(CalendarTask).filter(CalendarTask.id.in_(list(due)))}
+        fire = []
+        for task_id in due:
+            task = tasks.get(task_id)
+            if task is None:
+                stats.skipped += 1
+                continue
+            due_at = reminder_time(task)
+            if reminder_pending(task) and due_at > now:
+                # Rescheduled by another worker since this instant was loaded.
+                schedule.schedule(task.id, due_at)
+                stats.rescheduled += 1
+            elif reminder_pending(task) and _ensure_timezone(task.scheduled_start) > _grace_cutoff(now):
+                fire.append(task)
+            else:
+                # Cancelled, stale or fired by another worker, whose event reached every worker.
+                stats.skipped += 1
+
+        if fire:
+            claimed = _claim(db, [task.id for task in fire], now)
+            zones = dict(db.query(User.id, User.timezone).filter(
+                User.id.in_(sorted({task.user_id for task in fire})),
+            ).all())
+            for task in fire:
+                if task.id in claimed:
+                    _notify(db, task, zones.get(task.user_id))
+                    stats.fired += 1
+                else:
+                    stats.skipped += 1
+        db.commit()
+        stats.batches += 1
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
+
+
+def _schedule_entry(task: CalendarTask, deleted: bool) -> tuple[int, Optional[datetime]]:
+    if deleted or not reminder_pending(task):
+        return task.id, None
+    return task.id, reminder_time(task)
+
+
+def _apply_entries(entries: list[tuple[int, Optional[datetime]]]) -> None:
+    for task_id, due_at in entries:
+        if due_at is None:
+            reminder_schedule.cancel(task_id)
+        else:
+            reminder_schedule.schedule(task_id, due_at)
+
+
+@event.listens_for(DBSession, "after_flush")
+def _track_task_reminders(session: DBSession, flush_context) -> None:
+    entries = [_schedule_entry(obj, deleted=False) for obj in session.new if isinstance(obj, CalendarTask)]
+    entries.extend(
+        _schedule_entry(obj, deleted=False)
+        for obj in session.dirty
+        if isinstance(obj, CalendarTask) and session.is_modified(obj, include_collections=False)
+    )
+    entries.extend(_schedule_entry(obj, deleted=True) for obj in session.deleted if isinstance(obj, CalendarTask))
+    if entries:
+        # Apply only once the change is committed; dropped on rollback.
+        run_after_commit(session, lambda: _apply_entries(entries))
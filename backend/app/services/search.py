@@ -0,0 +1,206 @@
+"""Full-text search over group messages and time traces.
+
+Text is tokenized in Python so Chinese content is searchable without database
+extensions: runs of CJK characters become unigrams plus overlapping bigrams,
+everything else becomes lowercase words. The tokens are stored in
+``search_documents`` and indexed natively:
+
+- Postgres: a GIN index on ``array_to_tsvector`` of the tokens, queried with
+  ``@@`` and ranked with ``ts_rank``.
+- SQLite: an FTS5 table over the tokens, ranked with ``bm25``.
+
+Documents are written by a flush hook in the same transaction as the
+message or note they mirror.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Iterable, Optional
+
+from sqlalchemy import Float, Integer, and_, cast, delete, event, func, insert, literal_column, text
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.orm import Session as ORMSession
+
+from app.models.group import GroupMessage
+from app.models.search_document import SearchDocument
+from app.models.time_trace import TimeTrace
+
+
+GROUP_MESSAGE = "group_message"
+TIME_TRACE = "time_trace"
+
+MAX_QUERY_TOKENS = 32
+
+_WORD_RUN = re.compile(r"[^\W_]+")
+_CJK_RUN = re.compile(
+    r"[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]+"
+)
+
+
+def _runs(value: str) -> Iterable[tuple[bool, str]]:
+    """Yield (is_cjk, run) pieces of the normalized text."""
+    normalized = unicodedata.normalize("NFKC", value or "").lower()
+    for word in _WORD_RUN.findall(normalized):
+        position = 0
+        for match in _CJK_RUN.finditer(word):
+            if match.start() > position:
+                yield False, word[position:match.start()]
+            yield True, match.group()
+            position = match.end()
+        if position < len(word):
+            yield False, word[position:]
+
+
+def tokenize(value: str) -> list[str]:
+    """Index-side tokens: words, CJK unigrams and CJK bigrams."""
+    tokens = []
+    for is_cjk, run in _runs(value):
+        if not is_cjk:
+            tokens.append(run)
+            continue
+        tokens.extend(run)
+        tokens.extend(run[index:index + 2] for index in range(len(run) - 1))
+    return tokens
+
+
+def tokenize_query(value: str) -> list[str]:
+    """Query-side tokens: CJK runs match through their bigrams."""
+    tokens: list[str] = []
+    for is_cjk, run in _runs(value):
+        if is_cjk and len(run) > 1:
+            tokens.extend(run[index:index + 2] for index in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    # Keep order but drop repeats; every token must match.
+    return list(dict.fromkeys(tokens))[:MAX_QUERY_TOKENS]
+
+
+def _document(obj) -> Optional[tuple[str, int, str]]:
+    if isinstance(obj, GroupMessage):
+        if obj.deleted_at is not None:
+            return None
+        return GROUP_MESSAGE, obj.group_id, obj.content
+    if isinstance(obj, TimeTrace):
+        return TIME_TRACE, obj.user_id, obj.content
+    return None
+
+
+def _doc_type(obj) -> Optional[str]:
+    if isinstance(obj, GroupMessage):
+        return GROUP_MESSAGE
+    if isinstance(obj, TimeTrace):
+        return TIME_TRACE
+    return None
+
+
+def index_documents(db: ORMSession, objects: Iterable[object]) -> None:
+    """Replace the search documents of the given messages/notes."""
+    rows = []
+    stale: dict[str, list[int]] = {}
+    for obj in objects:
+        doc_type = _doc_type(obj)
+        if doc_type is None or obj.id is None:
+            continue
+        stale.setdefault(doc_type, []).append(obj.id)
+        document = _document(obj)
+        if document is not None:
+            rows.append({
+                "doc_type": document[0],
+                "doc_id": obj.id,
+                "scope_id": document[1],
+                "tokens": " ".join(tokenize(document[2])),
+            })
+    remove_documents(db, stale)
+    if rows:
+        db.connection().execute(insert(SearchDocument), rows)
+
+
+def remove_documents(db: ORMSession, doc_ids_by_type: dict[str, list[int]]) -> None:
+    connection = db.connection()
+    for doc_type, doc_ids in doc_ids_by_type.items():
+        if doc_ids:
+            connection.execute(
+                delete(SearchDocument).where(
+                    SearchDocument.doc_type == doc_type,
+                    SearchDocument.doc_id.in_(doc_ids),
+                )
+            )
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _sync_search_documents(session: ORMSession, flush_context) -> None:
+    changed = [obj for obj in session.new if _doc_type(obj) is not None]
+    changed.extend(
+        obj for obj in session.dirty
+        if _doc_type(obj) is not None and session.is_modified(obj, include_collections=False)
+    )
+    if changed:
+        index_documents(session, changed)
+
+    removed: dict[str, list[int]] = {}
+    for obj in session.deleted:
+        doc_type = _doc_type(obj)
+        if doc_type is not None:
+            removed.setdefault(doc_type, []).append(obj.id)
+    if removed:
+        remove_documents(session, removed)
+
+
+def search_documents(
+    db: ORMSession,
+    doc_type: str,
+    scope_id: int,
+    query: str,
+    offset: int = 0,
+    limit: int = 20,
+) -> tuple[list[int], bool]:
+    """Return (doc_ids best match first, has_more) for one scope."""
+    tokens = tokenize_query(query)
+    if not tokens:
+        return [], False
+
+    scoped = and_(SearchDocument.doc_type == doc_type, SearchDocument.scope_id == scope_id)
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        vector = func.array_to_tsvector(func.string_to_array(SearchDocument.tokens, literal_column("' '")))
+        tsquery = cast(" & ".join(f"'{token}'" for token in tokens), TSQUERY)
+        rows = db.query(SearchDocument.doc_id).filter(
+            scoped,
+            vector.op("@@")(tsquery),
+        ).order_by(func.ts_rank(vector, tsquery).desc(), SearchDocument.doc_id.desc())
+    elif dialect == "sqlite":
+        matches = text(
+            "SELECT rowid AS id, bm25(search_documents_fts) AS score "
+            "FROM search_documents_fts WHERE search_documents_fts MATCH :match"
+        ).bindparams(match=" AND ".join(f'"{token}"' for token in tokens)).columns(
+            id=Integer, score=Float
+        ).subquery()
+        rows = db.query(SearchDocument.doc_id).join(
+            matches, matches.c.id == SearchDocument.id
+        ).filter(scoped).order_by(matches.c.score.asc(), SearchDocument.doc_id.desc())
+    else:
+        padded = literal_column("' '") + SearchDocument.tokens + literal_column("' '")
+        rows = db.query(SearchDocument.doc_id).filter(
+            scoped,
+            *[padded.like(f"% {token} %") for token in tokens],
+        ).order_by(SearchDocument.doc_id.desc())
+
+    doc_ids = [doc_id for (doc_id,) in rows.offset(offset).limit(limit + 1).all()]
+    return doc_ids[:limit], len(doc_ids) > limit
+
+
+def rebuild_search_index(db: ORMSession, batch_size: int = 1000) -> int:
+    """Re-tokenize every message and note; used for repairs."""
+    db.connection().execute(delete(SearchDocument))
+    indexed = 0
+    for model in (GroupMessage, TimeTrace):
+        last_id = 0
+        while True:
+            batch = db.query(model).filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not batch:
+                break
+            index_documents(db, batch)
+            indexed += len(batch)
+            last_id = batch[-1].id
+    return indexed
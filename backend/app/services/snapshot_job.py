@@ -0,0 +1,171 @@
+"""Batch job that writes group daily snapshots for every active member.
+
+Session-driven refreshes (``services.daily_status``) only touch members whose
+sessions changed. This job fills in everyone else, so leaderboards list idle
+members too and history imported before the cache existed gets snapshots.
+
+Work is done per chunk of users. Each user's numbers are computed once and
+reused for every group they belong to:
+
+- users with a cached ``UserDailyStatus`` row reuse it (one query);
+- the rest get one grouped (user, category) seconds aggregate, one grouped
+  evaluation query and one target query. Streaks of those who tracked time
+  chain from yesterday's cached rows, or else come from one grouped per-day
+  lookback bounded like ``count_streak_days``.
+
+The per-user exact path (``refresh_daily_status``) is never taken here: on
+the first run after a deploy no one has a cached row yet.
+
+Rows are written with batched ``INSERT .. ON CONFLICT DO UPDATE`` statements
+and committed per chunk.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date as DateType
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.group import GroupMember
+from app.models.user_daily_status import UserDailyStatus
+from app.services.groups import (
+    daily_category_seconds,
+    daily_target_counts,
+    streak_days_before,
+    upsert_daily_snapshots,
+)
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+@dataclass
+class SnapshotJobStats:
+    day: DateType
+    dry_run: bool
+    users: int = 0
+    memberships: int = 0
+    chunks: int = 0
+    rows_written: int = 0
+    cached_users: int = 0
+    aggregated_users: int = 0
+    timings: dict[str, float] = field(default_factory=lambda: {"load": 0.0, "aggregate": 0.0, "upsert": 0.0})
+    elapsed_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["day"] = self.day.isoformat()
+        return data
+
+
+def _memberships_by_user(db: DBSession) -> dict[int, list[int]]:
+    memberships: dict[int, list[int]] = {}
+    rows = db.query(GroupMember.user_id, GroupMember.group_id).filter(
+        GroupMember.is_active == True,
+    ).order_by(GroupMember.user_id, GroupMember.group_id).all()
+    for user_id, group_id in rows:
+        memberships.setdefault(user_id, []).append(group_id)
+    return memberships
+
+
+def _previous_streaks(user_ids: list[int], day: DateType, db: DBSession) -> dict[int, int]:
+    """Streaks ending yesterday, from cached rows where they exist."""
+    if not user_ids:
+        return {}
+    streaks = dict(db.query(UserDailyStatus.user_id, UserDailyStatus.streak_days).filter(
+        UserDailyStatus.user_id.in_(user_ids),
+        UserDailyStatus.date == day - timedelta(days=1),
+    ).all())
+    uncached = [user_id for user_id in user_ids if user_id not in streaks]
+    if uncached:
+        streaks.update(streak_days_before(uncached, day, db))
+    return streaks
+
+
+def _chunk_values(user_ids: list[int], day: DateType, db: DBSession, stats: SnapshotJobStats) -> dict[int, dict[str, int]]:
+    """Snapshot numbers for each user of a chunk, computed once per user."""
+    values: dict[int, dict[str, int]] = {}
+    cached = db.query(UserDailyStatus).filter(
+        UserDailyStatus.user_id.in_(user_ids),
+        UserDailyStatus.date == day,
+    ).all()
+    for row in cached:
+        values[row.user_id] = {
+            "total_seconds": row.total_seconds,
+            "target_completed_count": row.target_completed_count,
+            "target_total_count": row.target_total_count,
+            "streak_days": row.streak_days,
+        }
+    stats.cached_users += len(cached)
+
+    missing = [user_id for user_id in user_ids if user_id not in values]
+    if not missing:
+        return values
+
+    category_seconds = daily_category_seconds(missing, day, db)
+    target_counts = daily_target_counts(missing, day, category_seconds, db)
+    totals = {user_id: sum(category_seconds.get(user_id, {}).values()) for user_id in missing}
+    streaks = _previous_streaks([user_id for user_id in missing if totals[user_id] > 0], day, db)
+
+    for user_id in missing:
+        completed, total = target_counts.get(user_id, (0, 0))
+        values[user_id] = {
+            "total_seconds": totals[user_id],
+            "target_completed_count": completed,
+            "target_total_count": total,
+            "streak_days": streaks[user_id] + 1 if totals[user_id] > 0 else 0,
+        }
+    stats.aggregated_users += len(missing)
+    return values
+
+
+def run_group_snapshot_job(
+    db: DBSession,
+    day: Optional[DateType] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> SnapshotJobStats:
+    """Write snapshots of ``day`` (today UTC by default) for every active member.
+
+    With ``dry_run`` everything is computed and timed but rolled back, which
+    makes the job usable as a benchmark against production-sized data.
+    """
+    started = time.perf_counter()
+    stats = SnapshotJobStats(day=day or datetime.now(timezone.utc).date(), dry_run=dry_run)
+
+    phase = time.perf_counter()
+    memberships = _memberships_by_user(db)
+    stats.timings["load"] += time.perf_counter() - phase
+    stats.users = len(memberships)
+    stats.memberships = sum(len(group_ids) for group_ids in memberships.values())
+
+    user_ids = list(memberships)
+    try:
+        for offset in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[offset:offset + chunk_size]
+            stats.chunks += 1
+
+            phase = time.perf_counter()
+            values = _chunk_values(chunk, stats.day, db, stats)
+            stats.timings["aggregate"] += time.perf_counter() - phase
+
+            rows = [
+                {"group_id": group_id, "user_id": user_id, "date": stats.day, **values[user_id]}
+                for user_id in chunk
+                for group_id in memberships[user_id]
+            ]
+            phase = time.perf_counter()
+            upsert_daily_snapshots(rows, db)
+            if not dry_run:
+                db.commit()
+            stats.timings["upsert"] += time.perf_counter() - phase
+            stats.rows_written += len(rows)
+    finally:
+        if dry_run:
+            db.rollback()
+
+    stats.elapsed_seconds = time.perf_counter() - started
+    return stats
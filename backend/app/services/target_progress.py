@@ -0,0 +1,233 @@
+"""Cached per-period target progress behind the dashboard, reviews and evaluation.
+
+``TargetProgress`` holds one row per (target, period start) with the seconds
+counted towards the target in that period, honouring ``include_category_ids``
+and session multipliers. Rows are built on first read and then kept current:
+every flush that closes, edits, re-weights or deletes a finished session marks
+the owner's rows covering the session's start as stale, and stale rows are
+recomputed right before the transaction commits. Changing a target's category
+filter drops its rows, which are rebuilt on the next read.
+
+Only periods that are still being read are cached: evaluation reads finished
+periods without storing them and drops their rows once evaluated.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import event, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session as ORMSession
+from sqlalchemy.orm import attributes
+
+from app.models.session import Session
+from app.models.target_progress import TargetProgress
+from app.models.work_target import WorkTarget
+
+
+STALE_PROGRESS_KEY = "stale_target_progress"
+STALE_TARGETS_KEY = "stale_target_progress_targets"
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _key(target_id: int, period_start: datetime) -> tuple[int, datetime]:
+    return target_id, _utc(period_start)
+
+
+def sum_target_seconds(
+    target: WorkTarget,
+    period_start: datetime,
+    period_end: datetime,
+    db: ORMSession,
+) -> int:
+    """Raw SUM of a target's finished sessions started within the period."""
+    query = db.query(
+        func.coalesce(
+            func.sum(func.coalesce(Session.effective_seconds, Session.duration_seconds)),
+            0,
+        ).label("total")
+    ).filter(
+        Session.user_id == target.user_id,
+        Session.end_time.isnot(None),
+        Session.start_time >= period_start,
+        Session.start_time <= period_end,
+    )
+
+    if target.include_category_ids:
+        query = query.filter(Session.category_id.in_(target.include_category_ids))
+
+    result = query.first()
+    return int(result.total) if result else 0
+
+
+def _insert_progress(rows: list[dict], db: ORMSession) -> None:
+    """Insert progress rows, leaving rows another request created first."""
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        db.execute(insert(TargetProgress).values(rows).on_conflict_do_nothing(
+            index_elements=["target_id", "period_start"],
+        ))
+        return
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.add(TargetProgress(**row))
+        except IntegrityError:
+            pass
+
+
+def load_target_progress(
+    periods: Iterable[tuple[WorkTarget, datetime, datetime]],
+    db: ORMSession,
+    cache: bool = True,
+) -> dict[tuple[int, datetime], int]:
+    """Seconds per (target id, UTC period start) for the given periods.
+
+    Cached rows are read with one query; missing rows are computed once and,
+    with ``cache``, stored. Concurrent first reads of a period may both
+    compute it; only one row is kept.
+    """
+    periods = list(periods)
+    if not periods:
+        return {}
+
+    rows = db.query(TargetProgress).filter(
+        TargetProgress.target_id.in_(sorted({target.id for target, _, _ in periods})),
+        TargetProgress.period_start.in_(sorted({_utc(start) for _, start, _ in periods})),
+    ).all()
+    progress = {_key(row.target_id, row.period_start): row.actual_seconds for row in rows}
+
+    missing = []
+    for target, period_start, period_end in periods:
+        key = _key(target.id, period_start)
+        if key in progress:
+            continue
+        seconds = sum_target_seconds(target, period_start, period_end, db)
+        missing.append({
+            "target_id": target.id,
+            "user_id": target.user_id,
+            "period_start": _utc(period_start),
+            "period_end": _utc(period_end),
+            "actual_seconds": seconds,
+        })
+        progress[key] = seconds
+    if missing and cache:
+        _insert_progress(missing, db)
+    return progress
+
+
+def target_period_seconds(
+    target: WorkTarget,
+    period_start: datetime,
+    period_end: datetime,
+    db: ORMSession,
+    cache: bool = True,
+) -> int:
+    """Cached seconds counted towards ``target`` in one period."""
+    return load_target_progress([(target, period_start, period_end)], db, cache)[_key(target.id, period_start)]
+
+
+def drop_target_progress(db: ORMSession, keys: Iterable[tuple[int, datetime]]) -> None:
+    """Delete cached rows of finished (target id, period start) periods."""
+    for target_id, period_start in set(keys):
+        db.query(TargetProgress).filter(
+            TargetProgress.target_id == target_id,
+            TargetProgress.period_start == _utc(period_start),
+        ).delete(synchronize_session=False)
+
+
+def purge_finished_progress(db: ORMSession, before: datetime) -> int:
+    """Delete cached rows of periods that ended before ``before``."""
+    return db.query(TargetProgress).filter(
+        TargetProgress.period_end < before,
+    ).delete(synchronize_session=False)
+
+
+def invalidate_user_progress(db: ORMSession, user_id: int) -> None:
+    """Drop every cached row of a user; they are rebuilt on the next read.
+
+    For writes that change sessions behind the ORM's back, such as
+    ``ON DELETE SET NULL`` when a category is hard-deleted.
+    """
+    db.query(TargetProgress).filter(TargetProgress.user_id == user_id).delete(synchronize_session=False)
+
+
+def _session_starts(session: Session, deleted: bool) -> set[datetime]:
+    if deleted:
+        return {_utc(session.start_time)} if session.end_time is not None else set()
+    if session.end_time is None and not attributes.get_history(session, "end_time").deleted:
+        # Still running and never closed: nothing to count yet.
+        return set()
+    history = attributes.get_history(session, "start_time")
+    return {_utc(value) for value in (*history.added, *history.unchanged, *history.deleted) if value is not None}
+
+
+def _mark(session: ORMSession, user_id: Optional[int], starts: Iterable[datetime]) -> None:
+    stale = session.info.setdefault(STALE_PROGRESS_KEY, set())
+    stale.update((user_id, start) for start in starts)
+
+
+@event.listens_for(ORMSession, "after_flush")
+def _mark_stale_progress(session: ORMSession, flush_context) -> None:
+    for obj in session.new:
+        if isinstance(obj, Session):
+            _mark(session, obj.user_id, _session_starts(obj, deleted=False))
+    for obj in session.dirty:
+        if isinstance(obj, Session) and session.is_modified(obj, include_collections=False):
+            _mark(session, obj.user_id, _session_starts(obj, deleted=False))
+        elif isinstance(obj, WorkTarget) and attributes.get_history(obj, "include_category_ids").has_changes():
+            session.info.setdefault(STALE_TARGETS_KEY, set()).add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, Session):
+            _mark(session, obj.user_id, _session_starts(obj, deleted=True))
+        elif isinstance(obj, WorkTarget):
+            session.info.setdefault(STALE_TARGETS_KEY, set()).add(obj.id)
+
+
+@event.listens_for(ORMSession, "before_commit")
+def _refresh_stale_progress(session: ORMSession) -> None:
+    if not (session.info.get(STALE_PROGRESS_KEY) or session.new or session.dirty or session.deleted):
+        return
+    # Flush first so pending changes are both marked and visible to the sums.
+    session.flush()
+    stale = session.info.pop(STALE_PROGRESS_KEY, None) or set()
+    stale_targets = session.info.pop(STALE_TARGETS_KEY, None) or set()
+
+    if stale_targets:
+        session.query(TargetProgress).filter(
+            TargetProgress.target_id.in_(sorted(stale_targets)),
+        ).delete(synchronize_session="fetch")
+
+    rows: dict[int, TargetProgress] = {}
+    for user_id, start in sorted(stale):
+        for row in session.query(TargetProgress).filter(
+            TargetProgress.user_id == user_id,
+            TargetProgress.period_start <= start,
+            TargetProgress.period_end >= start,
+        ).all():
+            rows[row.id] = row
+    for row in rows.values():
+        target = session.get(WorkTarget, row.target_id)
+        if target is None:
+            session.delete(row)
+            continue
+        row.actual_seconds = sum_target_seconds(target, row.period_start, row.period_end, session)
+    if rows:
+        session.flush()
+    # Refreshing flushes progress rows; nothing they touch needs another pass.
+    session.info.pop(STALE_PROGRESS_KEY, None)
+    session.info.pop(STALE_TARGETS_KEY, None)
+
+
+@event.listens_for(ORMSession, "after_rollback")
+def _discard_stale_progress(session: ORMSession) -> None:
+    session.info.pop(STALE_PROGRESS_KEY, None)
+    session.info.pop(STALE_TARGETS_KEY, None)
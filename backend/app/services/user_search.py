@@ -0,0 +1,101 @@
+"""Indexed username/email search for the admin console.
+
+- Postgres: ``lower(column) LIKE`` is served by pg_trgm GIN indexes created
+  in the ``20261021_user_search`` migration.
+- SQLite: an FTS5 trigram table (``users_search``) narrows candidates before
+  the same LIKE predicate is applied.
+
+Results are ranked exact match > prefix match > substring match and capped at
+SEARCH_RESULT_CAP so typeahead never counts or pages through the whole table.
+"""
+from __future__ import annotations
+
+from typing import Literal
+
+from sqlalchemy import Integer, case, func, or_, select, text
+from sqlalchemy.orm import Session as DBSession
+
+from app.models.user import User
+
+
+SearchMode = Literal["substring", "prefix"]
+
+SEARCH_RESULT_CAP = 1000
+# Trigram indexes cannot answer terms shorter than one trigram.
+MIN_TRIGRAM_LENGTH = 3
+
+_fts_ready_binds: set[str] = set()
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _sqlite_fts_ready(db: DBSession) -> bool:
+    bind = db.get_bind()
+    key = str(bind.url)
+    if key in _fts_ready_binds:
+        return True
+    exists = db.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users_search'")
+    ).first()
+    if exists:
+        _fts_ready_binds.add(key)
+    return exists is not None
+
+
+def _sqlite_candidates(term: str):
+    phrase = '"' + term.replace('"', '""') + '"'
+    matches = text("SELECT rowid FROM users_search WHERE users_search MATCH :phrase").bindparams(
+        phrase=phrase
+    ).columns(rowid=Integer).subquery()
+    return select(matches.c.rowid)
+
+
+def search_users(
+    db: DBSession,
+    term: str,
+    mode: SearchMode = "substring",
+    offset: int = 0,
+    limit: int = 20,
+) -> tuple[list[User], int, bool]:
+    """Return (users, total, total_is_capped) for a username/email search."""
+    needle = term.strip().lower()
+    if not needle:
+        return [], 0, False
+
+    username = func.lower(User.username)
+    email = func.lower(User.email)
+    escaped = _escape_like(needle)
+    prefix_pattern = f"{escaped}%"
+    pattern = prefix_pattern if mode == "prefix" else f"%{escaped}%"
+
+    query = db.query(User).filter(
+        or_(username.like(pattern, escape="\\"), email.like(pattern, escape="\\"))
+    )
+    if (
+        db.get_bind().dialect.name == "sqlite"
+        and len(needle) >= MIN_TRIGRAM_LENGTH
+        and _sqlite_fts_ready(db)
+    ):
+        query = query.filter(User.id.in_(_sqlite_candidates(needle)))
+
+    total = db.query(func.count()).select_from(
+        query.with_entities(User.id).limit(SEARCH_RESULT_CAP + 1).subquery()
+    ).scalar()
+    capped = total > SEARCH_RESULT_CAP
+    total = min(total, SEARCH_RESULT_CAP)
+
+    remaining = SEARCH_RESULT_CAP - offset
+    if remaining <= 0:
+        return [], total, capped
+
+    rank = case(
+        (or_(username == needle, email == needle), 0),
+        (or_(username.like(prefix_pattern, escape="\\"), email.like(prefix_pattern, escape="\\")), 1),
+        else_=2,
+    )
+    users = query.order_by(rank, func.length(User.username), User.id).offset(offset).limit(
+        min(limit, remaining)
+    ).all()
+    return users, total, capped
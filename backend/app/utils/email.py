@@ -6,30 +6,49 @@ from typing import Optional
 from app.core.config import settings
 
 
-def send_email(to_email: str, subject: str, content: str) -> None:
-    """Send a plain text email via configured SMTP server.
+def smtp_configured() -> bool:
+    return bool(settings.SMTP_HOST and settings.SMTP_USER and settings.SMTP_PASSWORD)
 
-    Raises RuntimeError if SMTP is not configured or authentication fails.
-    """
-    if not settings.SMTP_HOST or not settings.SMTP_USER or not settings.SMTP_PASSWORD:
-        raise RuntimeError("SMTP is not configured")
 
+def build_message(to_email: str, subject: str, content: str) -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = settings.SMTP_FROM or settings.SMTP_USER
     msg["To"] = to_email
     msg.set_content(content)
+    return msg
+
+
+def open_smtp_connection() -> smtplib.SMTP:
+    """Open and log in to the configured SMTP server; the caller closes it.
+
+    Raises RuntimeError if SMTP is not configured.
+    """
+    if not smtp_configured():
+        raise RuntimeError("SMTP is not configured")
 
     if settings.SMTP_SSL:
-        with smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=15) as server:
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
+        server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=15)
     else:
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=15) as server:
-            if settings.SMTP_TLS:
-                server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=15)
+    try:
+        if not settings.SMTP_SSL and settings.SMTP_TLS:
+            server.starttls()
+        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+def send_email(to_email: str, subject: str, content: str) -> None:
+    """Send a plain text email via configured SMTP server.
+
+    Raises RuntimeError if SMTP is not configured or authentication fails.
+    Request handlers should queue mail with ``services.email_outbox`` instead.
+    """
+    with open_smtp_connection() as server:
+        server.send_message(build_message(to_email, subject, content))
 
 
 def build_reset_email(to_email: str, token: str) -> tuple[str, str]:
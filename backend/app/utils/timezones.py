@@ -0,0 +1,27 @@
+"""IANA timezone helpers for per-user local days."""
+from datetime import timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+DEFAULT_TIMEZONE = "UTC"
+
+
+def is_valid_timezone(name: str) -> bool:
+    """Return True when ``name`` is a known IANA timezone."""
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+    return True
+
+
+@lru_cache(maxsize=512)
+def get_zone(name: str | None) -> tzinfo:
+    """Resolve a timezone name, falling back to UTC for unknown or empty names."""
+    if not name or name == DEFAULT_TIMEZONE:
+        return timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return timezone.utc
@@ -0,0 +1,44 @@
+"""Re-evaluate targets for all users over a date range.
+
+Usage:
+    python backfill_evaluations.py --start YYYY-MM-DD [--end YYYY-MM-DD]
+        [--workers N] [--chunk-size N] [--checkpoint PATH]
+"""
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.evaluation_backfill import DEFAULT_CHUNK_SIZE, DEFAULT_WORKERS, run_evaluation_backfill
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate targets of every user over a range of local days")
+    parser.add_argument("--start", type=date.fromisoformat, required=True, help="First local day to evaluate")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="Last local day to evaluate (default: --start)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Worker processes (1 runs inline)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Users per commit")
+    parser.add_argument("--checkpoint", default=None, help="JSON file recording finished users, for resuming")
+    args = parser.parse_args()
+
+    try:
+        stats = run_evaluation_backfill(
+            args.start,
+            args.end or args.start,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            checkpoint_path=args.checkpoint,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    print(json.dumps(stats.as_dict(), indent=2))
+    if stats.failed_users:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
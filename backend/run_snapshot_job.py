@@ -0,0 +1,35 @@
+"""Run the group snapshot job once, optionally as a dry-run benchmark.
+
+Usage:
+    python run_snapshot_job.py [--date YYYY-MM-DD] [--chunk-size N] [--dry-run]
+"""
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.db import SessionLocal
+from app.services.snapshot_job import DEFAULT_CHUNK_SIZE, run_group_snapshot_job
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write group daily snapshots for every active member")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="UTC day to snapshot (default: today)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Users per aggregate query")
+    parser.add_argument("--dry-run", action="store_true", help="Compute and time everything, then roll back")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = run_group_snapshot_job(db, day=args.date, chunk_size=args.chunk_size, dry_run=args.dry_run)
+        print(json.dumps(stats.as_dict(), indent=2))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,11 @@ os.environ["AUTO_INIT_ADMIN"] = "false"
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 os.environ["DEBUG"] = "false"
 
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.main import app
 from app.core.db import Base, get_db
@@ -45,3 +47,23 @@ def client(db_session):
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+def count_statements(db_session):
+    """Context manager collecting the SQL statements run inside it"""
+    @contextmanager
+    def counting():
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+
+    return counting
@@ -279,6 +279,78 @@ def test_admin_can_list_sessions(client: TestClient, db_session):
     print("✓ Admin can list sessions with filters and pagination")
 
 
+def test_admin_sessions_keyset_pagination(client: TestClient, db_session):
+    """Test admin can walk sessions with keyset cursors and approximate totals"""
+    from app.models.user import User, UserRole
+    from app.models.session import Session as SessionModel
+    from app.services.pagination import reset_count_cache
+
+    admin_data = {
+        "email": "keysetadmin@example.com",
+        "username": "keysetadmin",
+        "password": "adminpass123"
+    }
+    client.post("/api/v1/auth/register", json=admin_data)
+    admin_user = db_session.query(User).filter(User.username == "keysetadmin").first()
+    admin_user.role = UserRole.ADMIN
+    db_session.commit()
+    login = client.post("/api/v1/auth/login", json={
+        "username": admin_data["username"],
+        "password": admin_data["password"]
+    })
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+    # Pairs of sessions share a start time so the id tie-breaker matters
+    base = datetime(2025, 12, 1, 8, 0, 0, tzinfo=timezone.utc)
+    for i in range(7):
+        db_session.add(SessionModel(
+            user_id=admin_user.id,
+            start_time=base + timedelta(hours=i // 2),
+            end_time=base + timedelta(hours=i // 2, minutes=30),
+            duration_seconds=1800,
+            source="manual",
+        ))
+    db_session.commit()
+    expected = [
+        s.id for s in db_session.query(SessionModel).order_by(
+            SessionModel.start_time.desc(), SessionModel.id.desc()
+        )
+    ]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"page_size": 3, "total_mode": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/admin/sessions", params=params, headers=headers)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        seen.extend(item["id"] for item in data["sessions"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+    # Offset pages still work and hand out a cursor for the following page
+    page = client.get("/api/v1/admin/sessions?page=2&page_size=3", headers=headers).json()
+    assert [item["id"] for item in page["sessions"]] == expected[3:6]
+    assert page["total"] == 7 and page["total_is_estimate"] is False
+    following = client.get(
+        "/api/v1/admin/sessions", params={"cursor": page["next_cursor"], "page_size": 3}, headers=headers
+    ).json()
+    assert [item["id"] for item in following["sessions"]] == expected[6:]
+
+    reset_count_cache()
+    estimate = client.get("/api/v1/admin/sessions?total_mode=estimate", headers=headers).json()
+    assert estimate["total"] == 7
+    assert estimate["total_is_estimate"] is True
+
+    invalid = client.get("/api/v1/admin/sessions?cursor=not-a-cursor", headers=headers)
+    assert invalid.status_code == 400
+
+
 def test_admin_can_delete_session(client: TestClient, db_session):
     """Test admin can delete session and audit log is created"""
     # Setup admin
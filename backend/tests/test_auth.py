@@ -9,8 +9,8 @@ This test demonstrates the complete authentication workflow:
 import pytest
 from fastapi.testclient import TestClient
 
-from app.api.endpoints import auth as auth_endpoint
 from app.core.config import settings
+from app.services.email_outbox import run_email_outbox_job
 from app.utils.rate_limit import clear_rate_limits
 
 
@@ -168,14 +168,16 @@ def test_invalid_credentials(client: TestClient):
     print("✓ Invalid credentials correctly rejected")
 
 
-def test_password_reset_token_cannot_be_replayed(client: TestClient, monkeypatch):
+def test_password_reset_token_cannot_be_replayed(client: TestClient, db_session):
     """A reset token should become invalid after the password changes."""
     sent_messages = []
 
-    def fake_send_email(to_email: str, subject: str, content: str) -> None:
-        sent_messages.append((to_email, subject, content))
+    class FakeConnection:
+        def send_message(self, message):
+            sent_messages.append((message["To"], message["Subject"], message.get_content()))
 
-    monkeypatch.setattr(auth_endpoint, "send_email", fake_send_email)
+        def quit(self):
+            pass
 
     register_data = {
         "email": "reset@example.com",
@@ -187,6 +189,9 @@ def test_password_reset_token_cannot_be_replayed(client: TestClient, monkeypatch
 
     response = client.post("/api/v1/auth/forgot-password", json={"email": register_data["email"]})
     assert response.status_code == 200
+    assert sent_messages == []
+
+    run_email_outbox_job(db_session, connect=FakeConnection)
     assert len(sent_messages) == 1
 
     token = next(line for line in sent_messages[0][2].splitlines() if line.startswith("eyJ"))
@@ -1,9 +1,17 @@
 """Test calendar task API endpoints."""
+import asyncio
 from datetime import datetime, timedelta, timezone
 from urllib.parse import quote
 
 from fastapi.testclient import TestClient
 
+from app.core.config import settings
+from app.models.calendar_task import CalendarTask
+from app.models.notification import Notification
+from app.services.events import hub
+from app.services.group_channels import backplane
+from app.services.reminders import ReminderSchedule, fire_due_reminders, load_reminders, reminder_schedule
+
 
 def _auth_headers(client: TestClient, username: str) -> dict[str, str]:
     payload = {
@@ -100,6 +108,67 @@ def test_calendar_task_reminders_due_and_fired(client: TestClient):
     assert due_again.json() == []
 
 
+def test_reminder_engine_fires_once_and_follows_reschedules(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "REMINDER_RESYNC_SECONDS", 3600)
+    published = []
+    forward = backplane.publish
+
+    def record(payload):
+        published.append(payload)
+        forward(payload)
+
+    monkeypatch.setattr(backplane, "publish", record)
+    headers = _auth_headers(client, "planner_engine")
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    start = now + timedelta(minutes=30)
+
+    response = client.post("/api/v1/calendar-tasks", json={
+        "title": "Engine",
+        "scheduled_start": start.isoformat(),
+        "scheduled_end": (start + timedelta(minutes=30)).isoformat(),
+        "reminder_enabled": True,
+        "reminder_minutes_before": 15,
+    }, headers=headers)
+    assert response.status_code == 201, response.text
+    task_id = response.json()["id"]
+
+    # Two workers that loaded the schedule before the task was re-timed
+    worker, other_worker = ReminderSchedule(), ReminderSchedule()
+    assert load_reminders(db_session, now, worker) == 1
+    assert load_reminders(db_session, now, other_worker) == 1
+    assert fire_due_reminders(db_session, now, schedule=worker).fired == 0
+
+    response = client.patch(f"/api/v1/calendar-tasks/{task_id}", json={"reminder_minutes_before": 5}, headers=headers)
+    assert response.status_code == 200, response.text
+    # The committing worker's schedule follows the edit right away
+    assert (task_id, now + timedelta(minutes=25)) in reminder_schedule.pop_due(now + timedelta(minutes=25), 10_000)
+
+    stats = fire_due_reminders(db_session, now + timedelta(minutes=16), schedule=worker)
+    assert (stats.fired, stats.rescheduled) == (0, 1)
+
+    stats = fire_due_reminders(db_session, now + timedelta(minutes=26), schedule=worker)
+    assert stats.fired == 1
+    stats = fire_due_reminders(db_session, now + timedelta(minutes=26), schedule=other_worker)
+    assert (stats.fired, stats.skipped) == (0, 1)
+
+    db_session.expire_all()
+    assert db_session.get(CalendarTask, task_id).reminder_fired_at is not None
+    [notification] = db_session.query(Notification).filter(Notification.user_id == user_id).all()
+    assert (notification.type, notification.title) == ("calendar_reminder", "计划提醒：Engine")
+
+    async def replay():
+        subscription, events, _ = hub.subscribe(user_id, f"{hub.epoch}-0")
+        hub.unsubscribe(subscription)
+        return events
+
+    reminders = [item for item in asyncio.run(replay()) if item.event == "reminder_due"]
+    assert [item.data["task_id"] for item in reminders] == [task_id]
+    # Sent once, by the winning worker, through the backplane every worker listens on
+    sent = [payload for payload in published if payload["kind"] == "reminder_due"]
+    assert [(payload["user_id"], payload["data"]["task_id"]) for payload in sent] == [(user_id, task_id)]
+
+
 def test_calendar_task_complete_and_convert_session(client: TestClient):
     headers = _auth_headers(client, "planner_complete")
     category = _create_category(client, headers)
@@ -187,3 +256,45 @@ def test_calendar_task_permission_isolation(client: TestClient):
         "category_id": other_category["id"],
     }, headers=other_headers)
     assert other_task.status_code == 201
+
+
+def test_month_view_resolves_categories_with_constant_queries(client: TestClient, db_session, count_statements):
+    headers = _auth_headers(client, "planner_month")
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    categories = [_create_category(client, headers, f"Area {index}") for index in range(3)]
+    month_start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    params = {
+        "start": month_start.isoformat(),
+        "end": datetime(2026, 3, 31, 23, 59, tzinfo=timezone.utc).isoformat(),
+        "include_unscheduled": "false",
+    }
+
+    def add_tasks(count: int, offset: int) -> None:
+        for index in range(offset, offset + count):
+            start = month_start + timedelta(minutes=40 * index)
+            db_session.add(CalendarTask(
+                user_id=user_id,
+                title=f"Task {index}",
+                category_id=categories[index % 3]["id"] if index % 4 else None,
+                status="scheduled",
+                scheduled_start=start,
+                scheduled_end=start + timedelta(minutes=30),
+            ))
+        db_session.commit()
+
+    def list_month() -> tuple[list, int]:
+        with count_statements() as statements:
+            response = client.get("/api/v1/calendar-tasks", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json(), len(statements)
+
+    add_tasks(10, 0)
+    small, small_queries = list_month()
+    add_tasks(990, 10)
+    month, month_queries = list_month()
+
+    assert len(small) == 10 and len(month) == 1000
+    assert month_queries == small_queries
+    assert {task["category_name"] for task in month} == {None, "Area 0", "Area 1", "Area 2"}
+    first_categorized = next(task for task in month if task["category_id"] is not None)
+    assert first_categorized["category_color"] == "#2f855a"
@@ -0,0 +1,131 @@
+"""Tests for the cached per-user daily status."""
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.models.group import GroupDailySnapshot
+from app.models.user_daily_status import UserDailyStatus
+from app.services import daily_status
+from app.services.daily_status import get_daily_status, refresh_daily_status
+from app.services.groups import save_daily_snapshot
+from app.services.evaluation import evaluate_targets_for_date
+
+
+def _auth(client: TestClient, email: str, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = client.get("/api/v1/users/me", headers=headers)
+    return headers, me.json()["id"]
+
+
+def _status(db_session, user_id: int, day) -> UserDailyStatus:
+    db_session.expire_all()
+    return db_session.query(UserDailyStatus).filter(
+        UserDailyStatus.user_id == user_id,
+        UserDailyStatus.date == day,
+    ).first()
+
+
+def test_status_refreshes_on_session_changes_and_chains_streaks(client: TestClient, db_session):
+    headers, user_id = _auth(client, "status_streak@example.com", "statusstreak")
+    today = datetime.now(timezone.utc).date()
+    yesterday = today - timedelta(days=1)
+
+    earlier = client.post(
+        "/api/v1/sessions/manual", json={"entry_date": yesterday.isoformat(), "hours": 1}, headers=headers
+    ).json()
+    client.post("/api/v1/sessions/manual", json={"entry_date": today.isoformat(), "minutes": 45}, headers=headers)
+
+    assert _status(db_session, user_id, yesterday).streak_days == 1
+    current = _status(db_session, user_id, today)
+    assert current.total_seconds == 45 * 60
+    assert current.streak_days == 2
+
+    # Editing a past day carries the new streak forward
+    client.delete(f"/api/v1/sessions/{earlier['id']}", headers=headers)
+    assert _status(db_session, user_id, yesterday).total_seconds == 0
+    assert _status(db_session, user_id, today).streak_days == 1
+
+    # A new day starts from its own row; an idle day breaks the streak
+    tomorrow = get_daily_status(user_id, db_session, today + timedelta(days=1))
+    assert tomorrow.total_seconds == 0 and tomorrow.streak_days == 0
+
+
+def test_share_status_reads_cached_status(client: TestClient, db_session):
+    headers, user_id = _auth(client, "status_share@example.com", "statusshare")
+    group = client.post("/api/v1/groups", json={"name": "缓存小组"}, headers=headers).json()
+    today = datetime.now(timezone.utc).date()
+    client.post("/api/v1/sessions/manual", json={"entry_date": today.isoformat(), "hours": 2}, headers=headers)
+
+    cached = _status(db_session, user_id, today)
+    assert cached.total_seconds == 7200
+    # Share text comes from the cached row, not from re-aggregating sessions
+    cached.by_category = [{**cached.by_category[0], "seconds": 60}]
+    db_session.commit()
+
+    shared = client.post(f"/api/v1/groups/{group['id']}/share-status", headers=headers)
+    assert shared.status_code == 201, shared.text
+    assert shared.json()["metadata_json"]["total_seconds"] == 60
+
+
+def test_evaluation_refreshes_target_counts(client: TestClient, db_session):
+    headers, user_id = _auth(client, "status_eval@example.com", "statuseval")
+    today = datetime.now(timezone.utc).date()
+    client.post(
+        "/api/v1/targets",
+        json={
+            "period": "daily",
+            "target_seconds": 3600,
+            "effective_from": datetime.combine(today - timedelta(days=1), datetime.min.time()).isoformat(),
+        },
+        headers=headers,
+    )
+    client.post("/api/v1/sessions/manual", json={"entry_date": today.isoformat(), "hours": 2}, headers=headers)
+    assert _status(db_session, user_id, today).target_completed_count == 1
+
+    evaluate_targets_for_date(today, db_session)
+
+    evaluated = _status(db_session, user_id, today)
+    assert (evaluated.target_completed_count, evaluated.target_total_count) == (1, 1)
+
+
+def test_concurrent_refreshes_keep_one_row(client: TestClient, db_session, monkeypatch):
+    headers, user_id = _auth(client, "status_race@example.com", "statusrace")
+    group = client.post("/api/v1/groups", json={"name": "并发小组"}, headers=headers).json()
+    today = datetime.now(timezone.utc).date()
+    client.post("/api/v1/sessions/manual", json={"entry_date": today.isoformat(), "hours": 1}, headers=headers)
+    db_session.query(UserDailyStatus).delete()
+    db_session.query(GroupDailySnapshot).delete()
+    db_session.commit()
+
+    other = sessionmaker(bind=db_session.get_bind())()
+    previous_streak = daily_status._previous_streak
+
+    def racing_streak(user_id, day, db):
+        if db is db_session:
+            # Another commit writes the same (user, day) rows first.
+            row = refresh_daily_status(user_id, day, other)
+            save_daily_snapshot(group["id"], user_id, daily_status.status_metadata(row)[1], other)
+            other.commit()
+        return previous_streak(user_id, day, db)
+
+    monkeypatch.setattr(daily_status, "_previous_streak", racing_streak)
+    try:
+        row = refresh_daily_status(user_id, today, db_session)
+        save_daily_snapshot(group["id"], user_id, daily_status.status_metadata(row)[1], db_session)
+        db_session.commit()
+    finally:
+        other.close()
+
+    assert (row.total_seconds, row.streak_days) == (3600, 1)
+    assert db_session.query(UserDailyStatus).filter(UserDailyStatus.user_id == user_id).count() == 1
+    snapshot = db_session.query(GroupDailySnapshot).filter(GroupDailySnapshot.user_id == user_id).one()
+    assert snapshot.total_seconds == 3600
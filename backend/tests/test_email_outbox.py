@@ -0,0 +1,263 @@
+"""Tests for the transactional email outbox."""
+import base64
+import smtplib
+import socketserver
+import ssl
+import threading
+from datetime import datetime, timedelta, timezone
+from email import message_from_bytes
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from app.core.config import settings
+from app.main import email_outbox_task, scheduler
+from app.models.email_outbox import EmailOutbox
+from app.services.email_outbox import (
+    acquire_sender_slots,
+    claim_batch,
+    enqueue_email,
+    release_sender_slots,
+    run_email_outbox_job,
+)
+
+
+class StubSmtp:
+    """Local stand-in for an SMTP server connection."""
+
+    opened = []
+
+    def __init__(self, refuse=()):
+        self.refuse = set(refuse)
+        self.sent = []
+        self.closed = False
+        StubSmtp.opened.append(self)
+
+    def send_message(self, message):
+        if message["To"] in self.refuse:
+            raise smtplib.SMTPRecipientsRefused({message["To"]: (550, b"mailbox unavailable")})
+        self.sent.append(message["To"])
+
+    def quit(self):
+        self.closed = True
+
+
+def test_outbox_reuses_connections_and_backs_off_failures(db_session):
+    StubSmtp.opened = []
+    now = datetime(2026, 1, 5, 12, 0, tzinfo=timezone.utc)
+    for index in range(6):
+        enqueue_email(db_session, f"user{index}@example.com", "Hello", "body")
+    enqueue_email(db_session, "bounce@example.com", "Hello", "body")
+    db_session.commit()
+    for email in db_session.query(EmailOutbox):
+        email.next_attempt_at = now
+    db_session.commit()
+
+    connect = lambda: StubSmtp(refuse={"bounce@example.com"})  # noqa: E731
+    stats = run_email_outbox_job(
+        db_session, connect=connect, batch_size=4, concurrency=2, max_attempts=2, backoff_seconds=60, now=now,
+    )
+    assert (stats.claimed, stats.sent, stats.retried, stats.failed, stats.batches) == (7, 6, 1, 0, 2)
+    # Two sender threads per batch, plus one reconnect after the refused recipient
+    assert stats.connections <= 5
+    assert sum(len(connection.sent) for connection in StubSmtp.opened) == 6
+    assert all(connection.closed for connection in StubSmtp.opened)
+
+    bounce = db_session.query(EmailOutbox).filter(EmailOutbox.to_email == "bounce@example.com").one()
+    assert (bounce.status, bounce.attempts) == ("pending", 1)
+    assert bounce.next_attempt_at.replace(tzinfo=timezone.utc) == now + timedelta(seconds=60)
+    assert "mailbox unavailable" in bounce.last_error
+
+    # Not due yet
+    assert run_email_outbox_job(db_session, connect=connect, now=now + timedelta(seconds=30)).claimed == 0
+    stats = run_email_outbox_job(db_session, connect=connect, max_attempts=2, now=now + timedelta(seconds=60))
+    assert (stats.claimed, stats.failed) == (1, 1)
+    db_session.refresh(bounce)
+    assert (bounce.status, bounce.attempts) == ("failed", 2)
+    assert db_session.query(EmailOutbox).filter(EmailOutbox.status == "sent").count() == 6
+    # Bodies may carry reset links; they are not kept once the row is done
+    assert {email.body for email in db_session.query(EmailOutbox)} == {""}
+
+
+def test_claimed_emails_are_not_claimed_twice(db_session):
+    now = datetime(2026, 1, 5, 12, 0, tzinfo=timezone.utc)
+    enqueue_email(db_session, "once@example.com", "Hello", "body").next_attempt_at = now
+    db_session.commit()
+
+    [email] = claim_batch(db_session, 10, now)
+    assert (email.status, email.attempts) == ("sending", 1)
+    assert claim_batch(db_session, 10, now + timedelta(seconds=1)) == []
+
+    # A claim left behind by a crashed worker expires
+    [reclaimed] = claim_batch(db_session, 10, now + timedelta(hours=1))
+    assert (reclaimed.id, reclaimed.attempts) == (email.id, 2)
+
+    def unreachable():
+        raise OSError("connection refused")
+
+    stats = run_email_outbox_job(db_session, connect=unreachable, now=now + timedelta(hours=2))
+    assert (stats.claimed, stats.retried, stats.connections) == (1, 1, 0)
+    db_session.refresh(email)
+    assert email.last_error == "connect: connection refused"
+
+
+def test_sender_slots_cap_connections_across_workers(db_session):
+    StubSmtp.opened = []
+    now = datetime(2026, 1, 5, 12, 0, tzinfo=timezone.utc)
+    for index in range(4):
+        enqueue_email(db_session, f"capped{index}@example.com", "Hello", "body").next_attempt_at = now
+    db_session.commit()
+    connect = lambda: StubSmtp()  # noqa: E731
+
+    # Another worker is sending with both slots of the cluster
+    held = acquire_sender_slots(db_session, 2, "worker-a", now)
+    assert len(held) == 2
+    stats = run_email_outbox_job(db_session, connect=connect, concurrency=2, owner="worker-b", now=now)
+    assert (stats.sender_slots, stats.claimed, stats.connections) == (0, 0, 0)
+
+    # With one slot free, this worker sends everything over a single connection
+    release_sender_slots(db_session, held[:1], "worker-a")
+    later = now + timedelta(seconds=15)
+    stats = run_email_outbox_job(db_session, connect=connect, concurrency=2, owner="worker-b", now=later)
+    assert (stats.sender_slots, stats.sent, stats.connections) == (1, 4, 1)
+    # Its slot is free again for the next tick
+    assert acquire_sender_slots(db_session, 2, "worker-c", later + timedelta(seconds=15)) == held[:1]
+
+
+def test_outbox_job_is_scheduled(client):
+    job = scheduler.get_job("email_outbox")
+    assert job is not None
+    assert job.func is email_outbox_task
+
+
+def _self_signed_context(tmp_path) -> ssl.SSLContext:
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.now(timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    cert_path, key_path = tmp_path / "cert.pem", tmp_path / "key.pem"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+class SmtpStubServer(socketserver.ThreadingTCPServer):
+    """Local SMTP server speaking just enough ESMTP for smtplib: STARTTLS, AUTH PLAIN, DATA."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, tls_context: ssl.SSLContext, username: str, password: str):
+        super().__init__(("127.0.0.1", 0), SmtpStubHandler)
+        self.tls_context = tls_context
+        self.credentials = (username, password)
+        self.connections = 0
+        self.messages = []
+        self.lock = threading.Lock()
+
+
+class SmtpStubHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        sock, tls, authenticated = self.request, False, False
+        reader = sock.makefile("rb")
+
+        def reply(line: str) -> None:
+            sock.sendall(f"{line}\r\n".encode())
+
+        reply("220 stub ESMTP")
+        while True:
+            line = reader.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                reply("250-stub")
+                reply("250 AUTH PLAIN" if tls else "250 STARTTLS")
+            elif verb == "STARTTLS":
+                reply("220 Ready to start TLS")
+                sock = self.server.tls_context.wrap_socket(sock, server_side=True)
+                reader, tls = sock.makefile("rb"), True
+            elif verb == "AUTH":
+                _, username, password = base64.b64decode(command.split()[2]).decode().split("\0")
+                if tls and (username, password) == self.server.credentials:
+                    authenticated = True
+                    reply("235 Authentication successful")
+                else:
+                    reply("535 Authentication failed")
+            elif verb in {"MAIL", "RCPT"}:
+                reply("250 OK" if authenticated else "530 Authentication required")
+            elif verb == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while (chunk := reader.readline()) != b".\r\n":
+                    data += chunk
+                with self.server.lock:
+                    self.server.messages.append(message_from_bytes(data))
+                reply("250 OK queued")
+            elif verb in {"RSET", "NOOP"}:
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 Bye")
+                return
+            else:
+                reply("502 Command not implemented")
+
+
+def test_outbox_delivers_through_local_smtp_server(db_session, monkeypatch, tmp_path):
+    server = SmtpStubServer(_self_signed_context(tmp_path), "mailer", "secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        monkeypatch.setattr(settings, "SMTP_HOST", "127.0.0.1")
+        monkeypatch.setattr(settings, "SMTP_PORT", server.server_address[1])
+        monkeypatch.setattr(settings, "SMTP_USER", "mailer")
+        monkeypatch.setattr(settings, "SMTP_PASSWORD", "secret")
+        monkeypatch.setattr(settings, "SMTP_FROM", "noreply@example.com")
+        monkeypatch.setattr(settings, "SMTP_SSL", False)
+        monkeypatch.setattr(settings, "SMTP_TLS", True)
+
+        now = datetime.now(timezone.utc) + timedelta(seconds=1)
+        for index in range(3):
+            enqueue_email(db_session, f"reader{index}@example.com", f"Hello {index}", f"body {index}")
+        db_session.commit()
+
+        stats = run_email_outbox_job(db_session, concurrency=1, now=now)
+        assert (stats.sent, stats.connections) == (3, 1)
+        assert server.connections == 1
+        assert sorted(message["To"] for message in server.messages) == [
+            "reader0@example.com", "reader1@example.com", "reader2@example.com",
+        ]
+        assert {message["From"] for message in server.messages} == {"noreply@example.com"}
+
+        # Rejected credentials keep the mail queued for a retry
+        monkeypatch.setattr(settings, "SMTP_PASSWORD", "wrong")
+        enqueue_email(db_session, "late@example.com", "Hello", "body")
+        db_session.commit()
+        stats = run_email_outbox_job(db_session, now=now + timedelta(seconds=1))
+        assert (stats.sent, stats.retried) == (0, 1)
+        late = db_session.query(EmailOutbox).filter(EmailOutbox.to_email == "late@example.com").one()
+        assert late.status == "pending"
+        assert "535" in late.last_error
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,93 @@
+"""Tests for ETag / If-None-Match support on user-scoped reads."""
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+
+def _auth(client: TestClient, email: str, username: str) -> dict:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_categories_return_304_until_a_write(client: TestClient):
+    headers = _auth(client, "etag_categories@example.com", "etagcategories")
+    client.post("/api/v1/categories", json={"name": "阅读"}, headers=headers)
+
+    first = client.get("/api/v1/categories", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    cached = client.get("/api/v1/categories", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    client.post("/api/v1/categories", json={"name": "写作"}, headers=headers)
+    refreshed = client.get("/api/v1/categories", headers={**headers, "If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert {item["name"] for item in refreshed.json()} == {"阅读", "写作"}
+
+
+def test_session_write_invalidates_stats_and_heatmap(client: TestClient):
+    headers = _auth(client, "etag_stats@example.com", "etagstats")
+
+    stats = client.get("/api/v1/stats/summary?range=today", headers=headers)
+    heatmap = client.get("/api/v1/heatmap", headers=headers)
+    dashboard = client.get("/api/v1/targets/dashboard", headers=headers)
+    assert client.get(
+        "/api/v1/stats/summary?range=today",
+        headers={**headers, "If-None-Match": stats.headers["etag"]},
+    ).status_code == 304
+    assert stats.headers["etag"] != heatmap.headers["etag"]
+
+    now = datetime.now(timezone.utc).replace(hour=6, minute=0, second=0, microsecond=0)
+    created = client.post(
+        "/api/v1/sessions/manual",
+        json={"start_time": now.isoformat(), "end_time": (now + timedelta(hours=1)).isoformat()},
+        headers=headers,
+    )
+    assert created.status_code == 201, created.text
+
+    for path, etag in [
+        ("/api/v1/stats/summary?range=today", stats.headers["etag"]),
+        ("/api/v1/heatmap", heatmap.headers["etag"]),
+        ("/api/v1/targets/dashboard", dashboard.headers["etag"]),
+    ]:
+        response = client.get(path, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200, path
+
+
+def test_etag_is_per_user(client: TestClient):
+    first_headers = _auth(client, "etag_first@example.com", "etagfirst")
+    second_headers = _auth(client, "etag_second@example.com", "etagsecond")
+
+    etag = client.get("/api/v1/quick-start-templates", headers=first_headers).headers["etag"]
+    other = client.get(
+        "/api/v1/quick-start-templates",
+        headers={**second_headers, "If-None-Match": etag},
+    )
+    assert other.status_code == 200
+
+
+def test_read_all_notifications_bumps_version(client: TestClient, db_session):
+    from app.models.notification import Notification
+    from app.models.user import User
+
+    headers = _auth(client, "etag_notify@example.com", "etagnotify")
+    user = db_session.query(User).filter(User.username == "etagnotify").first()
+    db_session.add(Notification(user_id=user.id, type="target_met", title="done"))
+    db_session.commit()
+
+    etag = client.get("/api/v1/categories", headers=headers).headers["etag"]
+    assert client.post("/api/v1/notifications/read-all", headers=headers).json()["updated_count"] == 1
+    response = client.get("/api/v1/categories", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
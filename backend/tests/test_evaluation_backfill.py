@@ -0,0 +1,67 @@
+"""Tests for the chunked target re-evaluation backfill."""
+import json
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.models.work_evaluation import WorkEvaluation
+from app.services.evaluation_backfill import run_evaluation_backfill
+
+
+def _user_with_daily_target(client: TestClient, username: str) -> None:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{username}@example.com", "username": username, "password": "testpass123"},
+    )
+    login = client.post("/api/v1/auth/login", json={"username": username, "password": "testpass123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    response = client.post(
+        "/api/v1/targets",
+        json={"period": "daily", "target_seconds": 3600, "effective_from": "2025-12-01T00:00:00+00:00"},
+        headers=headers,
+    )
+    assert response.status_code == 201, response.text
+
+
+def test_backfill_is_idempotent_and_resumable(client: TestClient, db_session, tmp_path):
+    for username in ("backfill_a", "backfill_b", "backfill_c"):
+        _user_with_daily_target(client, username)
+    factory = sessionmaker(bind=db_session.get_bind())
+    checkpoint = tmp_path / "backfill.json"
+    lines = []
+
+    stats = run_evaluation_backfill(
+        date(2025, 12, 1),
+        date(2025, 12, 3),
+        workers=1,
+        chunk_size=2,
+        checkpoint_path=str(checkpoint),
+        session_factory=factory,
+        progress=lines.append,
+    )
+    assert (stats.users, stats.chunks, stats.evaluations, stats.failed_users) == (3, 2, 9, 0)
+    assert db_session.query(WorkEvaluation).count() == 9
+    assert len(lines) == 2 and "user-days/s" in lines[-1]
+    assert len(json.loads(checkpoint.read_text())["done_user_ids"]) == 3
+
+    # Resuming from the checkpoint skips every finished user
+    resumed = run_evaluation_backfill(
+        date(2025, 12, 1), date(2025, 12, 3), workers=1,
+        checkpoint_path=str(checkpoint), session_factory=factory, progress=lines.append,
+    )
+    assert (resumed.skipped_users, resumed.chunks) == (3, 0)
+
+    # Without a checkpoint, existing evaluations are left alone
+    rerun = run_evaluation_backfill(
+        date(2025, 12, 1), date(2025, 12, 3), workers=1, session_factory=factory, progress=lines.append,
+    )
+    assert rerun.evaluations == 0
+    assert db_session.query(WorkEvaluation).count() == 9
+
+    with pytest.raises(ValueError):
+        run_evaluation_backfill(
+            date(2025, 12, 1), date(2025, 12, 5), workers=1,
+            checkpoint_path=str(checkpoint), session_factory=factory, progress=lines.append,
+        )
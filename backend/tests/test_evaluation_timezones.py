@@ -0,0 +1,95 @@
+"""Tests for timezone-aware target periods and hourly evaluation batches."""
+from datetime import date, datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.models.work_evaluation import WorkEvaluation
+from app.services.evaluation import (
+    evaluate_finished_local_days,
+    evaluate_targets_for_date,
+    timezones_ending_day,
+)
+
+
+def _auth(client: TestClient, username: str, tz_name: str | None = None) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{username}@example.com", "username": username, "password": "testpass123"},
+    )
+    login = client.post("/api/v1/auth/login", json={"username": username, "password": "testpass123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    if tz_name is not None:
+        updated = client.patch("/api/v1/users/me", json={"timezone": tz_name}, headers=headers)
+        assert updated.status_code == 200, updated.text
+        assert updated.json()["timezone"] == tz_name
+    return headers, client.get("/api/v1/users/me", headers=headers).json()["id"]
+
+
+def _daily_target_with_session(client: TestClient, headers: dict, start: datetime, end: datetime) -> None:
+    target = client.post(
+        "/api/v1/targets",
+        json={"period": "daily", "target_seconds": 3600, "effective_from": "2025-12-01T00:00:00+00:00"},
+        headers=headers,
+    )
+    assert target.status_code == 201, target.text
+    session = client.post(
+        "/api/v1/sessions/manual",
+        json={"start_time": start.isoformat(), "end_time": end.isoformat(), "note": "work"},
+        headers=headers,
+    )
+    assert session.status_code == 201, session.text
+
+
+def test_daily_period_follows_local_midnight(client: TestClient, db_session):
+    headers, user_id = _auth(client, "tz_shanghai", "Asia/Shanghai")
+    # 01:00-03:00 on Dec 11 in Shanghai is still Dec 10 in UTC
+    _daily_target_with_session(
+        client,
+        headers,
+        datetime(2025, 12, 10, 17, 0, tzinfo=timezone.utc),
+        datetime(2025, 12, 10, 19, 0, tzinfo=timezone.utc),
+    )
+
+    assert evaluate_targets_for_date(date(2025, 12, 10), db_session, user_id=user_id)[0].status == "missed"
+    [evaluation] = evaluate_targets_for_date(date(2025, 12, 11), db_session, user_id=user_id)
+    assert evaluation.status == "met"
+    assert evaluation.actual_seconds == 7200
+    assert evaluation.period_start.replace(tzinfo=None) == datetime(2025, 12, 10, 16, 0)
+
+
+def test_hourly_run_only_evaluates_zones_past_midnight(client: TestClient, db_session):
+    shanghai_headers, shanghai_id = _auth(client, "tz_hourly_cn", "Asia/Shanghai")
+    utc_headers, utc_id = _auth(client, "tz_hourly_utc")
+    for headers in (shanghai_headers, utc_headers):
+        _daily_target_with_session(
+            client,
+            headers,
+            datetime(2025, 12, 11, 2, 0, tzinfo=timezone.utc),
+            datetime(2025, 12, 11, 4, 0, tzinfo=timezone.utc),
+        )
+
+    # 16:00 UTC is midnight in Shanghai; the UTC day is not over yet
+    now = datetime(2025, 12, 11, 16, 0, tzinfo=timezone.utc)
+    assert timezones_ending_day(now, db_session) == {date(2025, 12, 11): ["Asia/Shanghai"]}
+    evaluations = evaluate_finished_local_days(db_session, now)
+    assert {evaluation.user_id for evaluation in evaluations} == {shanghai_id}
+
+    evaluations = evaluate_finished_local_days(db_session, datetime(2025, 12, 12, 0, 5, tzinfo=timezone.utc))
+    assert {evaluation.user_id for evaluation in evaluations} == {utc_id}
+    assert db_session.query(WorkEvaluation).count() == 2
+
+
+def test_zone_skipping_local_midnight_is_still_evaluated(client: TestClient, db_session):
+    _auth(client, "tz_santiago", "America/Santiago")
+    # 2026-09-06 00:00 does not exist in Santiago: clocks go from 23:00 to 01:00
+    assert timezones_ending_day(datetime(2026, 9, 6, 3, 0, tzinfo=timezone.utc), db_session) == {}
+    assert timezones_ending_day(datetime(2026, 9, 6, 4, 0, tzinfo=timezone.utc), db_session) == {
+        date(2026, 9, 5): ["America/Santiago"],
+    }
+    assert timezones_ending_day(datetime(2026, 9, 6, 5, 0, tzinfo=timezone.utc), db_session) == {}
+
+
+def test_rejects_unknown_timezone(client: TestClient, db_session):
+    headers, _ = _auth(client, "tz_invalid")
+    response = client.patch("/api/v1/users/me", json={"timezone": "Mars/Olympus"}, headers=headers)
+    assert response.status_code == 422
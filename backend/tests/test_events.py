@@ -0,0 +1,208 @@
+"""Tests for the live event hub and the SSE stream endpoint."""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.evaluation import evaluate_targets_for_date
+from app.services.events import EventHub, hub
+
+
+def _auth(client: TestClient, email: str, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = client.get("/api/v1/users/me", headers=headers)
+    return headers, me.json()["id"]
+
+
+def _replay(user_id: int):
+    async def run():
+        subscription, replay, complete = hub.subscribe(user_id, f"{hub.epoch}-0")
+        hub.unsubscribe(subscription)
+        return replay, complete
+
+    return asyncio.run(run())
+
+
+def test_hub_delivers_and_resumes_from_last_event_id():
+    local_hub = EventHub(buffer_size=3)
+
+    async def run():
+        subscription, replay, complete = local_hub.subscribe(7)
+        assert replay == [] and complete
+        first = local_hub.publish(7, "notification", {"id": 1})
+        local_hub.publish(8, "notification", {"id": 2})
+        received = await asyncio.wait_for(subscription.queue.get(), timeout=1)
+        assert received.id == first.id
+        assert subscription.queue.empty()
+        local_hub.unsubscribe(subscription)
+
+        second = local_hub.publish(7, "session_started", {"session_id": 3})
+        resumed, replay, complete = local_hub.subscribe(7, first.event_id)
+        assert [item.id for item in replay] == [second.id]
+        assert complete
+        local_hub.unsubscribe(resumed)
+
+        for index in range(4):
+            local_hub.publish(7, "notification", {"id": 10 + index})
+        evicted, replay, complete = local_hub.subscribe(7, first.event_id)
+        assert len(replay) == 3
+        assert not complete
+        local_hub.unsubscribe(evicted)
+
+        # Same sequence number from another process lifetime
+        restarted, replay, complete = EventHub(buffer_size=3).subscribe(7, first.event_id)
+        assert replay == [] and not complete
+        local_hub.unsubscribe(restarted)
+        assert local_hub.subscribed_user_ids() == set()
+
+    asyncio.run(run())
+
+
+def test_session_start_stop_events_published_after_commit(client: TestClient):
+    hub.reset()
+    headers, user_id = _auth(client, "events_session@example.com", "eventssession")
+
+    started = client.post("/api/v1/sessions/start", json={}, headers=headers)
+    assert started.status_code == 201
+    stopped = client.post("/api/v1/sessions/stop", json={}, headers=headers)
+    assert stopped.status_code == 200
+
+    replay, complete = _replay(user_id)
+    assert complete
+    assert [item.event for item in replay] == ["session_started", "session_stopped"]
+    assert replay[0].data["session_id"] == started.json()["id"]
+    assert replay[1].data["end_time"] is not None
+
+
+def test_rejected_start_does_not_publish(client: TestClient):
+    hub.reset()
+    headers, user_id = _auth(client, "events_conflict@example.com", "eventsconflict")
+    client.post("/api/v1/sessions/start", json={}, headers=headers)
+    conflict = client.post("/api/v1/sessions/start", json={}, headers=headers)
+    assert conflict.status_code == 409
+
+    replay, _ = _replay(user_id)
+    assert [item.event for item in replay] == ["session_started"]
+
+
+def test_evaluation_notifications_are_pushed(client: TestClient, db_session):
+    hub.reset()
+    headers, user_id = _auth(client, "events_eval@example.com", "eventseval")
+    today = datetime.now(timezone.utc).date()
+    client.post(
+        "/api/v1/targets",
+        json={
+            "period": "daily",
+            "target_seconds": 3600,
+            "effective_from": datetime.combine(today - timedelta(days=1), datetime.min.time()).isoformat(),
+        },
+        headers=headers,
+    )
+
+    evaluate_targets_for_date(today, db_session)
+
+    replay, _ = _replay(user_id)
+    notifications = [item for item in replay if item.event == "notification"]
+    assert len(notifications) == 1
+    assert notifications[0].data["type"] == "target_missed"
+    assert notifications[0].data["id"] is not None
+
+
+def test_stream_requires_authentication(client: TestClient):
+    response = client.get("/api/v1/events/stream")
+    assert response.status_code == 401
+
+
+def _read_stream(token: str, count: int, last_event_id: Optional[str] = None, publish=None) -> list[dict]:
+    """Run the stream endpoint until ``count`` events arrived, then disconnect."""
+    headers = [(b"host", b"testserver")]
+    if last_event_id is not None:
+        headers.append((b"last-event-id", last_event_id.encode()))
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/events/stream",
+        "raw_path": b"/api/v1/events/stream",
+        "query_string": f"access_token={token}".encode(),
+        "root_path": "",
+        "headers": headers,
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+
+    async def run():
+        disconnected = asyncio.Event()
+        requested = False
+        body = []
+        events: list[dict] = []
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] != "http.response.body":
+                return
+            body.append(message.get("body", b"").decode())
+            blocks = "".join(body).split("\n\n")
+            events[:] = [
+                dict(line.split(": ", 1) for line in block.split("\n") if ": " in line and not line.startswith(":"))
+                for block in blocks[:-1]
+            ]
+            events[:] = [item for item in events if "event" in item]
+            if len(events) >= count:
+                disconnected.set()
+
+        task = asyncio.create_task(app(scope, receive, send))
+        if publish is not None:
+            while not task.done() and not hub.subscribed_user_ids():
+                await asyncio.sleep(0.01)
+            publish()
+        await asyncio.wait_for(task, timeout=5)
+        return events
+
+    return asyncio.run(run())
+
+
+def test_stream_delivers_live_events_and_replays_from_last_event_id(client: TestClient):
+    hub.reset()
+    _auth(client, "events_stream@example.com", "eventsstream")
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"username": "eventsstream", "password": "testpass123"},
+    ).json()["access_token"]
+    user_id = client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}).json()["id"]
+
+    live = _read_stream(token, 1, publish=lambda: hub.publish(user_id, "notification", {"id": 1}))
+    assert [(item["event"], json.loads(item["data"])) for item in live] == [("notification", {"id": 1})]
+    assert live[0]["id"].startswith(f"{hub.epoch}-")
+
+    # Events published while the client was away are replayed on reconnect
+    hub.publish(user_id, "notification", {"id": 2})
+    hub.publish(user_id, "session_started", {"session_id": 3})
+    replayed = _read_stream(token, 2, last_event_id=live[0]["id"])
+    assert [item["event"] for item in replayed] == ["notification", "session_started"]
+    assert json.loads(replayed[0]["data"]) == {"id": 2}
+
+    # An id from a previous process lifetime cannot be replayed
+    sequence = live[0]["id"].rsplit("-", 1)[1]
+    stale = _read_stream(token, 1, last_event_id=f"0restart-{sequence}")
+    assert [item["event"] for item in stale] == ["resync"]
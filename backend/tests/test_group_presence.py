@@ -0,0 +1,89 @@
+"""Tests for the group presence board."""
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.services.presence import registry
+
+
+def _auth(client: TestClient, email: str, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = client.get("/api/v1/users/me", headers=headers)
+    return headers, me.json()["id"]
+
+
+def _setup_group(client: TestClient) -> tuple[dict, dict, int, dict]:
+    owner_headers, _ = _auth(client, "presence_owner@example.com", "presenceowner")
+    group = client.post("/api/v1/groups", json={"name": "专注小组"}, headers=owner_headers).json()
+    member_headers, member_id = _auth(client, "presence_member@example.com", "presencemember")
+    category = client.post("/api/v1/categories", json={"name": "英语"}, headers=member_headers).json()
+    return owner_headers, member_headers, member_id, {"group": group, "category": category}
+
+
+def _presence(client: TestClient, group_id: int, headers: dict) -> dict:
+    response = client.get(f"/api/v1/groups/{group_id}/presence", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_memory_presence_follows_sessions_and_membership(client: TestClient, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "GROUP_PRESENCE", "memory")
+    owner_headers, member_headers, member_id, data = _setup_group(client)
+    group_id = data["group"]["id"]
+
+    # Timing before joining: shows up once the member joins
+    client.post("/api/v1/sessions/start", json={"category_id": data["category"]["id"]}, headers=member_headers)
+    assert _presence(client, group_id, owner_headers)["entries"] == []
+    client.post("/api/v1/groups/join", json={"invite_code": data["group"]["invite_code"]}, headers=member_headers)
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        board = _presence(client, group_id, owner_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    assert board["source"] == "memory"
+    assert not any("FROM sessions" in statement for statement in statements)
+    [entry] = board["entries"]
+    assert (entry["user_id"], entry["username"], entry["category_name"]) == (member_id, "presencemember", "英语")
+    assert entry["elapsed_seconds"] >= 0
+
+    # /sessions/active repairs a registry that missed the start
+    registry.clear()
+    client.get("/api/v1/sessions/active", headers=member_headers)
+    assert [item["user_id"] for item in _presence(client, group_id, owner_headers)["entries"]] == [member_id]
+
+    client.post("/api/v1/sessions/stop", json={}, headers=member_headers)
+    assert _presence(client, group_id, owner_headers)["entries"] == []
+
+    client.post("/api/v1/sessions/start", json={}, headers=member_headers)
+    client.post(f"/api/v1/groups/{group_id}/leave", headers=member_headers)
+    assert _presence(client, group_id, owner_headers)["entries"] == []
+
+
+def test_database_presence_fallback(client: TestClient, monkeypatch):
+    monkeypatch.setattr(settings, "GROUP_PRESENCE", "database")
+    owner_headers, member_headers, member_id, data = _setup_group(client)
+    group_id = data["group"]["id"]
+    client.post("/api/v1/groups/join", json={"invite_code": data["group"]["invite_code"]}, headers=member_headers)
+    client.post("/api/v1/sessions/start", json={"category_id": data["category"]["id"]}, headers=member_headers)
+
+    board = _presence(client, group_id, owner_headers)
+    assert board["source"] == "database"
+    assert [(item["user_id"], item["category_name"]) for item in board["entries"]] == [(member_id, "英语")]
+
+    outsider_headers, _ = _auth(client, "presence_outsider@example.com", "presenceoutsider")
+    assert client.get(f"/api/v1/groups/{group_id}/presence", headers=outsider_headers).status_code == 404
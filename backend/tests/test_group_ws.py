@@ -0,0 +1,81 @@
+"""Tests for the group chat WebSocket channel."""
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.services.backplane import LocalBackplane
+
+
+def _auth(client: TestClient, email: str, username: str) -> tuple[dict, str]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    token = login.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}, token
+
+
+def _group_with_member(client: TestClient):
+    owner_headers, owner_token = _auth(client, "ws_owner@example.com", "wsowner")
+    member_headers, member_token = _auth(client, "ws_member@example.com", "wsmember")
+    group = client.post("/api/v1/groups", json={"name": "WS Group"}, headers=owner_headers).json()
+    client.post("/api/v1/groups/join", json={"invite_code": group["invite_code"]}, headers=member_headers)
+    return group, (owner_headers, owner_token), (member_headers, member_token)
+
+
+def test_member_receives_posted_message(client: TestClient):
+    group, (owner_headers, _), (_, member_token) = _group_with_member(client)
+
+    with client.websocket_connect(f"/api/v1/groups/{group['id']}/ws?access_token={member_token}") as socket:
+        posted = client.post(
+            f"/api/v1/groups/{group['id']}/messages",
+            json={"content": "hello live"},
+            headers=owner_headers,
+        )
+        assert posted.status_code == 201
+        received = socket.receive_json()
+
+    assert received["type"] == "message"
+    assert received["message"]["id"] == posted.json()["id"]
+    assert received["message"]["content"] == "hello live"
+    assert received["message"]["username"] == "wsowner"
+
+
+def test_non_member_connection_is_rejected(client: TestClient):
+    group, _, _ = _group_with_member(client)
+    _, outsider_token = _auth(client, "ws_outsider@example.com", "wsoutsider")
+
+    with pytest.raises(WebSocketDisconnect) as rejected:
+        with client.websocket_connect(f"/api/v1/groups/{group['id']}/ws?access_token={outsider_token}"):
+            pass
+    assert rejected.value.code == 1008
+
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect(f"/api/v1/groups/{group['id']}/ws"):
+            pass
+
+
+def test_leaving_group_closes_socket(client: TestClient):
+    group, _, (member_headers, member_token) = _group_with_member(client)
+
+    with client.websocket_connect(f"/api/v1/groups/{group['id']}/ws?access_token={member_token}") as socket:
+        left = client.post(f"/api/v1/groups/{group['id']}/leave", headers=member_headers)
+        assert left.status_code == 204
+        with pytest.raises(WebSocketDisconnect) as closed:
+            socket.receive_json()
+    assert closed.value.code == 1008
+
+
+def test_local_backplane_dispatches_only_while_started():
+    received = []
+    backplane = LocalBackplane()
+    backplane.publish({"kind": "message", "group_id": 1})
+    backplane.start(received.append)
+    backplane.publish({"kind": "message", "group_id": 2})
+    backplane.stop()
+    backplane.publish({"kind": "message", "group_id": 3})
+    assert received == [{"kind": "message", "group_id": 2}]
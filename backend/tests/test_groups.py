@@ -1,8 +1,11 @@
 """Tests for group MVP APIs."""
+import os
 from datetime import datetime, timezone, timedelta
 
+import pytest
 from fastapi.testclient import TestClient
 
+from app.core.init_db import ensure_public_groups
 from app.models.user import User, UserRole
 from app.utils.security import hash_password
 
@@ -65,15 +68,30 @@ def test_join_group_by_invite_code_and_members_list(client: TestClient):
     assert any(item["user_id"] == member_id and item["username"] == "joinmember" for item in members.json())
 
 
-def test_public_exam_group_invite_is_visible_and_joinable(client: TestClient):
+def test_public_exam_group_invite_is_visible_and_joinable(client: TestClient, db_session):
     viewer_headers, _ = _auth(client, "group_public_viewer@example.com", "publicviewer")
+    # Listing is read-only: without the startup bootstrap there is no exam group
+    assert client.get("/api/v1/groups/public", headers=viewer_headers).json() == []
+
+    admin = User(
+        email="group_exam_admin@example.com",
+        username="examadmin",
+        password_hash=hash_password("testpass123"),
+        role=UserRole.ADMIN.value,
+        is_active=True,
+    )
+    db_session.add(admin)
+    db_session.commit()
+    ensure_public_groups()
+
     public_response = client.get("/api/v1/groups/public", headers=viewer_headers)
     assert public_response.status_code == 200, public_response.text
     public_groups = public_response.json()
     exam_group = next(item for item in public_groups if item["name"] == "考研小组")
     assert exam_group["visibility"] == "public"
     assert exam_group["invite_code"]
-    assert exam_group["my_role"] == "owner"
+    assert exam_group["owner_id"] == admin.id
+    assert exam_group["my_role"] is None
 
     member_headers, _ = _auth(client, "group_public_member@example.com", "publicmember")
     visible_to_member = client.get("/api/v1/groups/public", headers=member_headers)
@@ -90,6 +108,46 @@ def test_public_exam_group_invite_is_visible_and_joinable(client: TestClient):
     assert join.json()["name"] == "考研小组"
     assert join.json()["my_role"] == "member"
 
+    # Joining refreshes the cached member count
+    listed = client.get("/api/v1/groups/public", headers=viewer_headers).json()
+    assert next(item for item in listed if item["name"] == "考研小组")["member_count"] == 2
+
+
+def test_public_directory_is_cached_paginated_and_invalidated(client: TestClient, db_session):
+    from sqlalchemy import event
+
+    owner_headers, _ = _auth(client, "directory_owner@example.com", "directoryowner")
+    groups = [
+        client.post("/api/v1/groups", json={"name": f"目录小组{i}", "visibility": "public"}, headers=owner_headers).json()
+        for i in range(3)
+    ]
+    viewer_headers, _ = _auth(client, "directory_viewer@example.com", "directoryviewer")
+
+    first_page = client.get("/api/v1/groups/public", params={"limit": 2}, headers=viewer_headers).json()
+    assert [item["id"] for item in first_page] == [groups[2]["id"], groups[1]["id"]]
+    second_page = client.get("/api/v1/groups/public", params={"offset": 2, "limit": 2}, headers=viewer_headers).json()
+    assert [item["id"] for item in second_page] == [groups[0]["id"]]
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        client.get("/api/v1/groups/public", headers=viewer_headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    assert not any("FROM groups" in statement for statement in statements)
+
+    client.patch(f"/api/v1/groups/{groups[0]['id']}", json={"visibility": "invite_code"}, headers=owner_headers)
+    listed = client.get("/api/v1/groups/public", headers=viewer_headers).json()
+    assert groups[0]["id"] not in [item["id"] for item in listed]
+    client.patch(f"/api/v1/groups/{groups[1]['id']}", json={"name": "改名小组"}, headers=owner_headers)
+    listed = client.get("/api/v1/groups/public", headers=viewer_headers).json()
+    assert "改名小组" in [item["name"] for item in listed]
+
 
 def test_public_group_request_notifies_admin(client: TestClient, db_session):
     admin = User(
@@ -209,3 +267,314 @@ def test_owner_permission_and_leave_rules(client: TestClient):
 
     hidden_after_leave = client.get(f"/api/v1/groups/{group['id']}/messages", headers=member_headers)
     assert hidden_after_leave.status_code == 404
+
+
+def test_leaderboard_ranks_members_from_snapshots(client: TestClient, db_session):
+    from app.models.group import GroupDailySnapshot
+
+    owner_headers, owner_id = _auth(client, "board_owner@example.com", "boardowner")
+    group = _create_group(client, owner_headers)
+    member_headers, member_id = _auth(client, "board_member@example.com", "boardmember")
+    client.post("/api/v1/groups/join", json={"invite_code": group["invite_code"]}, headers=member_headers)
+
+    today = datetime.now(timezone.utc).date().isoformat()
+    client.post("/api/v1/sessions/manual", json={"entry_date": today, "hours": 1}, headers=owner_headers)
+    member_session = client.post(
+        "/api/v1/sessions/manual", json={"entry_date": today, "hours": 2}, headers=member_headers
+    ).json()
+
+    # Closing sessions upserts snapshots without anyone sharing a status
+    assert db_session.query(GroupDailySnapshot).filter(GroupDailySnapshot.group_id == group["id"]).count() == 2
+
+    board = client.get(f"/api/v1/groups/{group['id']}/leaderboard?range=week", headers=owner_headers)
+    assert board.status_code == 200, board.text
+    data = board.json()
+    assert [(entry["rank"], entry["user_id"]) for entry in data["entries"]] == [(1, member_id), (2, owner_id)]
+    assert data["entries"][0]["total_seconds"] == 7200
+    assert data["me"]["user_id"] == owner_id
+
+    deleted = client.delete(f"/api/v1/sessions/{member_session['id']}", headers=member_headers)
+    assert deleted.status_code == 204
+    board = client.get(f"/api/v1/groups/{group['id']}/leaderboard", headers=owner_headers).json()
+    assert [(entry["rank"], entry["user_id"]) for entry in board["entries"]] == [(1, owner_id), (2, member_id)]
+    assert board["entries"][1]["total_seconds"] == 0
+
+    outsider_headers, _ = _auth(client, "board_outsider@example.com", "boardoutsider")
+    hidden = client.get(f"/api/v1/groups/{group['id']}/leaderboard", headers=outsider_headers)
+    assert hidden.status_code == 404
+
+
+def test_members_board_uses_constant_queries(client: TestClient, db_session):
+    from sqlalchemy import event
+
+    from app.services.members_board import reset_members_board_cache
+
+    reset_members_board_cache()
+    today = datetime.now(timezone.utc).date().isoformat()
+    owner_headers, owner_id = _auth(client, "mboard_owner@example.com", "mboardowner")
+    group = _create_group(client, owner_headers, "看板小组")
+    math = client.post("/api/v1/categories", json={"name": "数学"}, headers=owner_headers).json()
+    english = client.post("/api/v1/categories", json={"name": "英语"}, headers=owner_headers).json()
+    client.post("/api/v1/sessions/manual", json={"entry_date": today, "hours": 1, "category_id": math["id"]}, headers=owner_headers)
+    client.post("/api/v1/sessions/manual", json={"entry_date": today, "hours": 2, "category_id": english["id"]}, headers=owner_headers)
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def board_queries() -> tuple[int, dict]:
+        reset_members_board_cache()
+        statements.clear()
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            response = client.get(f"/api/v1/groups/{group['id']}/members/board", headers=owner_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        assert response.status_code == 200, response.text
+        return len(statements), response.json()
+
+    few_queries, _ = board_queries()
+    for i in range(5):
+        headers, _ = _auth(client, f"mboard_{i}@example.com", f"mboardmember{i}")
+        client.post("/api/v1/groups/join", json={"invite_code": group["invite_code"]}, headers=headers)
+        client.post("/api/v1/sessions/manual", json={"entry_date": today, "minutes": 10 * (i + 1)}, headers=headers)
+    many_queries, board = board_queries()
+
+    assert many_queries == few_queries
+    assert len(board["entries"]) == 6
+    top = board["entries"][0]
+    assert (top["user_id"], top["total_seconds"], top["top_category_name"]) == (owner_id, 3 * 3600, "英语")
+    assert board["entries"][1]["total_seconds"] == 50 * 60
+
+    # Served from the short-lived cache until it expires
+    client.post("/api/v1/sessions/manual", json={"entry_date": today, "hours": 1}, headers=owner_headers)
+    cached = client.get(f"/api/v1/groups/{group['id']}/members/board", headers=owner_headers).json()
+    assert cached["entries"][0]["total_seconds"] == 3 * 3600
+
+
+def test_members_board_counts_targets_of_members_without_a_cached_status(client: TestClient, db_session):
+    from sqlalchemy import insert
+
+    from app.models.session import Session
+    from app.models.user_daily_status import UserDailyStatus
+    from app.services.members_board import reset_members_board_cache
+
+    reset_members_board_cache()
+    now = datetime.now(timezone.utc)
+    owner_headers, _ = _auth(client, "mboard_import_owner@example.com", "mboardimportowner")
+    group = _create_group(client, owner_headers, "导入小组")
+    headers, user_id = _auth(client, "mboard_import@example.com", "mboardimport")
+    client.post("/api/v1/groups/join", json={"invite_code": group["invite_code"]}, headers=headers)
+    client.post(
+        "/api/v1/targets",
+        json={"period": "daily", "target_seconds": 1800, "effective_from": (now - timedelta(days=1)).isoformat()},
+        headers=headers,
+    )
+    # An import writes sessions without going through the ORM hooks
+    start = now.replace(hour=0, minute=5, second=0, microsecond=0)
+    db_session.execute(insert(Session).values(
+        user_id=user_id,
+        start_time=start,
+        end_time=start + timedelta(hours=1),
+        duration_seconds=3600,
+        effective_seconds=3600,
+    ))
+    db_session.query(UserDailyStatus).filter(UserDailyStatus.user_id == user_id).delete()
+    db_session.commit()
+
+    board = client.get(f"/api/v1/groups/{group['id']}/members/board", headers=owner_headers).json()
+    entry = next(item for item in board["entries"] if item["user_id"] == user_id)
+    assert entry["total_seconds"] == 3600
+    assert (entry["target_completed_count"], entry["target_total_count"]) == (1, 1)
+
+
+def test_member_count_is_maintained_and_listing_is_batched(client: TestClient, db_session):
+    from sqlalchemy import event
+
+    owner_headers, _ = _auth(client, "count_owner@example.com", "countowner")
+    groups = [
+        client.post(
+            "/api/v1/groups",
+            json={"name": f"公开小组{i}", "visibility": "public"},
+            headers=owner_headers,
+        ).json()
+        for i in range(4)
+    ]
+    member_headers, _ = _auth(client, "count_member@example.com", "countmember")
+    client.post("/api/v1/groups/join", json={"invite_code": groups[0]["invite_code"]}, headers=member_headers)
+    client.post("/api/v1/groups/join", json={"invite_code": groups[0]["invite_code"]}, headers=member_headers)
+
+    detail = client.get(f"/api/v1/groups/{groups[0]['id']}", headers=owner_headers).json()
+    assert detail["member_count"] == 2
+    client.post(f"/api/v1/groups/{groups[0]['id']}/leave", headers=member_headers)
+    detail = client.get(f"/api/v1/groups/{groups[0]['id']}", headers=owner_headers).json()
+    assert detail["member_count"] == 1
+    client.post("/api/v1/groups/join", json={"invite_code": groups[1]["invite_code"]}, headers=member_headers)
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def public_listing_queries() -> int:
+        statements.clear()
+        response = client.get("/api/v1/groups/public", headers=member_headers)
+        assert response.status_code == 200
+        return len(statements), response.json()
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        few_queries, listed = public_listing_queries()
+        for i in range(4, 10):
+            client.post(
+                "/api/v1/groups",
+                json={"name": f"公开小组{i}", "visibility": "public"},
+                headers=owner_headers,
+            )
+        many_queries, more_listed = public_listing_queries()
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert len(more_listed) > len(listed)
+    assert many_queries == few_queries
+    roles = {item["id"]: item["my_role"] for item in more_listed}
+    assert roles[groups[1]["id"]] == "member"
+    assert roles[groups[0]["id"]] is None
+
+
+def test_deleting_a_user_drops_them_from_member_counts(client: TestClient, db_session):
+    owner_headers, _ = _auth(client, "delcount_owner@example.com", "delcountowner")
+    group = _create_group(client, owner_headers, "删号小组")
+    member_headers, member_id = _auth(client, "delcount_member@example.com", "delcountmember")
+    client.post("/api/v1/groups/join", json={"invite_code": group["invite_code"]}, headers=member_headers)
+
+    admin_headers, admin_id = _auth(client, "delcount_admin@example.com", "delcountadmin")
+    db_session.query(User).filter(User.id == admin_id).update({User.role: UserRole.ADMIN})
+    db_session.commit()
+    response = client.delete(f"/api/v1/admin/users/{member_id}", headers=admin_headers)
+    assert response.status_code == 204, response.text
+
+    detail = client.get(f"/api/v1/groups/{group['id']}", headers=owner_headers).json()
+    assert detail["member_count"] == 1
+
+
+def test_message_list_passes_stored_metadata_through(client: TestClient):
+    headers, _ = _auth(client, "group_meta@example.com", "metauser")
+    group = _create_group(client, headers)
+    metadata = {"card": {"title": "周报", "items": [1, 2.5, None, "中文"], "done": True}}
+
+    card = client.post(
+        f"/api/v1/groups/{group['id']}/share-card",
+        json={"content": "本周总结", "metadata_json": metadata},
+        headers=headers,
+    )
+    assert card.status_code == 201, card.text
+
+    messages = client.get(f"/api/v1/groups/{group['id']}/messages", headers=headers).json()
+    listed = next(item for item in messages if item["id"] == card.json()["id"])
+    assert listed == card.json()
+    assert listed["metadata_json"] == metadata
+    system = next(item for item in messages if item["message_type"] == "system")
+    assert system["metadata_json"] is None
+
+
+def test_message_list_nulls_malformed_legacy_metadata(client: TestClient, db_session):
+    import json
+
+    from sqlalchemy import text
+
+    headers, _ = _auth(client, "group_legacy_meta@example.com", "legacymeta")
+    group = _create_group(client, headers)
+    cards = [
+        client.post(
+            f"/api/v1/groups/{group['id']}/share-card",
+            json={"content": f"卡片{index}", "metadata_json": {"index": index}},
+            headers=headers,
+        ).json()
+        for index in range(3)
+    ]
+    # Text written before metadata became a JSON column
+    for card, legacy in zip(cards, ['{"index": 0, "title": "周报"', "[1, 2]"]):
+        db_session.execute(
+            text("UPDATE group_messages SET metadata_json = :legacy WHERE id = :id"),
+            {"legacy": legacy, "id": card["id"]},
+        )
+    db_session.commit()
+
+    response = client.get(f"/api/v1/groups/{group['id']}/messages", headers=headers)
+    assert response.status_code == 200
+    listed = {item["id"]: item["metadata_json"] for item in json.loads(response.content)}
+    assert [listed[card["id"]] for card in cards] == [None, None, {"index": 2}]
+
+
+@pytest.mark.skipif(
+    not os.environ.get("ETIME_MESSAGES_BENCHMARK"),
+    reason="set ETIME_MESSAGES_BENCHMARK=1 to run the message page rendering benchmark",
+)
+def test_message_page_rendering_benchmark(client: TestClient, db_session):
+    import json
+    import time
+
+    from pydantic import TypeAdapter
+
+    from app.models.group import GroupMessage
+    from app.schemas.group import GroupMessageResponse
+    from app.services.groups import build_today_status, message_page_json
+
+    headers, user_id = _auth(client, "group_bench@example.com", "benchuser")
+    group = _create_group(client, headers)
+    _, metadata = build_today_status(user_id, db_session)
+    metadata["by_category"] = [
+        {"category_id": i, "category_name": f"分类{i}", "category_color": "#3366ff", "seconds": i * 60}
+        for i in range(200)
+    ]
+    for _ in range(100):
+        db_session.add(GroupMessage(
+            group_id=group["id"], user_id=user_id, message_type="status_share",
+            content="今天已投入", metadata_json=metadata,
+        ))
+    db_session.commit()
+
+    rows = [
+        type("Row", (), {
+            "id": i, "group_id": group["id"], "user_id": user_id, "username": "benchuser",
+            "message_type": "status_share", "content": "今天已投入",
+            "metadata_raw": json.dumps(metadata, ensure_ascii=False),
+            "created_at": datetime.now(timezone.utc), "deleted_at": None,
+        })
+        for i in range(100)
+    ]
+    rounds = 50
+
+    # Previous path: decode each row's metadata, build models, encode again
+    adapter = TypeAdapter(list[GroupMessageResponse])
+    started = time.perf_counter()
+    for _ in range(rounds):
+        adapter.dump_json([
+            GroupMessageResponse(
+                id=row.id, group_id=row.group_id, user_id=row.user_id, username=row.username,
+                message_type=row.message_type, content=row.content,
+                metadata_json=json.loads(row.metadata_raw),
+                created_at=row.created_at, deleted_at=row.deleted_at,
+            )
+            for row in rows
+        ])
+    decoded = (time.perf_counter() - started) / rounds
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        message_page_json(rows)
+    passthrough = (time.perf_counter() - started) / rounds
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        page = client.get(f"/api/v1/groups/{group['id']}/messages?limit=100", headers=headers)
+    endpoint = (time.perf_counter() - started) / rounds
+    assert len(page.json()) == 100
+
+    print(f"\n100-message page: decode+re-encode {decoded * 1000:.2f}ms, "
+          f"passthrough {passthrough * 1000:.2f}ms, endpoint {endpoint * 1000:.2f}ms")
+    assert passthrough < decoded
@@ -0,0 +1,97 @@
+"""Tests for the cross-worker job runner."""
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.models.job import JobLease, JobRun
+from app.models.user import User, UserRole
+from app.services.job_runner import HOURLY, acquire_lease, run_exclusive_job
+
+
+def _admin_headers(client: TestClient, db_session) -> dict:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": "jobs_admin@example.com", "username": "jobsadmin", "password": "adminpass123"},
+    )
+    admin = db_session.query(User).filter(User.username == "jobsadmin").first()
+    admin.role = UserRole.ADMIN
+    db_session.commit()
+    login = client.post("/api/v1/auth/login", json={"username": "jobsadmin", "password": "adminpass123"})
+    return {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+
+def test_each_slot_runs_once_across_workers(client: TestClient, db_session):
+    factory = sessionmaker(bind=db_session.get_bind())
+    now = datetime(2026, 10, 19, 23, 59, 2, tzinfo=timezone.utc)
+    calls = []
+
+    def job(db):
+        calls.append(db)
+        return 7, {"note": "ok"}
+
+    first = run_exclusive_job("nightly", job, session_factory=factory, owner="worker-a", now=now)
+    # A second worker firing later in the same minute skips the slot
+    second = run_exclusive_job("nightly", job, session_factory=factory, owner="worker-b", now=now + timedelta(seconds=20))
+    assert (first.status, first.rows_processed, first.detail_json) == ("succeeded", 7, {"note": "ok"})
+    assert second is None
+    assert len(calls) == 1
+
+    # The next slot runs again, and failures are recorded rather than raised
+    def broken(db):
+        raise RuntimeError("boom")
+
+    failed = run_exclusive_job("nightly", broken, session_factory=factory, owner="worker-b", now=now + timedelta(days=1))
+    assert failed.status == "failed" and "boom" in failed.error
+    assert db_session.query(JobRun).count() == 2
+
+    lease = db_session.query(JobLease).filter(JobLease.job_name == "nightly").one()
+    assert lease.locked_until is None
+
+
+def test_late_fire_stays_in_the_period_slot(db_session):
+    factory = sessionmaker(bind=db_session.get_bind())
+    now = datetime(2026, 10, 19, 12, 0, 1, tzinfo=timezone.utc)
+    calls = []
+
+    def job(db):
+        calls.append(db)
+        return 1, None
+
+    assert run_exclusive_job("hourly", job, HOURLY, session_factory=factory, owner="worker-a", now=now)
+    # A worker whose fire of the same hour runs a minute late, after worker-a released the lease
+    late = now + timedelta(minutes=1, seconds=30)
+    assert run_exclusive_job("hourly", job, HOURLY, session_factory=factory, owner="worker-b", now=late) is None
+    assert len(calls) == 1
+
+    lease = db_session.query(JobLease).filter(JobLease.job_name == "hourly").one()
+    assert lease.last_slot.replace(tzinfo=timezone.utc) == datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+    assert run_exclusive_job("hourly", job, HOURLY, session_factory=factory, owner="worker-b", now=now + timedelta(hours=1))
+    assert len(calls) == 2
+
+
+def test_held_lease_blocks_until_it_expires(db_session):
+    now = datetime(2026, 10, 20, 3, 30, tzinfo=timezone.utc)
+    assert acquire_lease(db_session, "archive", now, owner="worker-a", lease_seconds=600, now=now)
+    later_slot = now + timedelta(minutes=1)
+    assert not acquire_lease(db_session, "archive", later_slot, owner="worker-b", now=later_slot)
+    expired = now + timedelta(minutes=11)
+    assert acquire_lease(db_session, "archive", expired, owner="worker-b", now=expired)
+
+
+def test_admin_lists_jobs_and_runs(client: TestClient, db_session):
+    headers = _admin_headers(client, db_session)
+    factory = sessionmaker(bind=db_session.get_bind())
+    now = datetime(2026, 10, 19, 12, 5, tzinfo=timezone.utc)
+    run_exclusive_job("group_snapshots", lambda db: (3, None), session_factory=factory, owner="worker-a", now=now)
+    run_exclusive_job("group_snapshots", lambda db: (4, None), session_factory=factory, owner="worker-a", now=now + timedelta(hours=1))
+
+    jobs = client.get("/api/v1/admin/jobs", headers=headers)
+    assert jobs.status_code == 200, jobs.text
+    [job] = jobs.json()
+    assert job["job_name"] == "group_snapshots"
+    assert job["last_run"]["rows_processed"] == 4
+
+    runs = client.get("/api/v1/admin/jobs/runs", params={"job_name": "group_snapshots"}, headers=headers).json()
+    assert [run["rows_processed"] for run in runs] == [4, 3]
+    assert client.get("/api/v1/admin/jobs/runs", params={"status": "failed"}, headers=headers).json() == []
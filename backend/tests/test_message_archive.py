@@ -0,0 +1,62 @@
+"""Tests for group message archival."""
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.models.group import GroupMessage, GroupMessageArchive
+from app.services.message_archive import run_message_archive_job
+
+
+def _auth(client: TestClient, email: str, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = client.get("/api/v1/users/me", headers=headers)
+    return headers, me.json()["id"]
+
+
+def test_archive_moves_old_and_deleted_messages_and_reads_page_through(client: TestClient, db_session):
+    headers, _ = _auth(client, "archive_owner@example.com", "archiveowner")
+    group = client.post("/api/v1/groups", json={"name": "归档小组"}, headers=headers).json()
+    url = f"/api/v1/groups/{group['id']}/messages"
+    ids = [
+        client.post(url, json={"content": f"旧消息{index}", "metadata_json": {"n": index}}, headers=headers).json()["id"]
+        for index in range(4)
+    ]
+    recent = [client.post(url, json={"content": f"新消息{index}"}, headers=headers).json()["id"] for index in range(2)]
+
+    now = datetime.now(timezone.utc)
+    # Age everything before the recent messages, including the group's system message
+    older = db_session.query(GroupMessage).filter(GroupMessage.id < recent[0]).order_by(GroupMessage.id).all()
+    for offset, message in enumerate(older):
+        message.created_at = now - timedelta(days=200 - offset)
+    older_ids = [message.id for message in older]
+    db_session.get(GroupMessage, recent[0]).deleted_at = now
+    db_session.commit()
+
+    stats = run_message_archive_job(db_session, older_than_days=90, batch_size=2)
+    assert (stats.moved, stats.deleted_moved, stats.batches) == (len(older_ids) + 1, 1, 3)
+    db_session.expire_all()
+    assert [message.id for message in db_session.query(GroupMessage).filter(GroupMessage.group_id == group["id"])] == [
+        recent[1]
+    ]
+    assert db_session.query(GroupMessageArchive).count() == len(older_ids) + 1
+
+    first = client.get(url, params={"limit": 3}, headers=headers).json()
+    assert [message["id"] for message in first] == [ids[2], ids[3], recent[1]]
+    assert first[0]["metadata_json"] == {"n": 2}
+    second = client.get(url, params={"before": ids[2], "limit": 3}, headers=headers).json()
+    assert [message["id"] for message in second] == older_ids[:-2][-3:]
+    assert [message["content"] for message in second][-2:] == ["旧消息0", "旧消息1"]
+
+    # Archived messages stay searchable; deleted ones do not come back
+    found = client.get(f"{url}/search", params={"q": "消息"}, headers=headers).json()
+    assert sorted(item["id"] for item in found["items"]) == sorted(ids + [recent[1]])
+
+    assert run_message_archive_job(db_session, older_than_days=90).moved == 0
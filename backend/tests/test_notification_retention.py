@@ -0,0 +1,69 @@
+"""Tests for notification digesting and purging."""
+from datetime import datetime, timezone
+
+from app.models.notification import Notification
+from app.services.events import hub
+from app.services.notification_retention import DIGEST_TYPE, run_notification_retention_job
+
+
+def _notification(db_session, user_id: int, kind: str, created_at: datetime, read: bool = True) -> Notification:
+    notification = Notification(
+        user_id=user_id,
+        type=kind,
+        title=kind,
+        created_at=created_at,
+        read_at=created_at if read else None,
+    )
+    db_session.add(notification)
+    return notification
+
+
+def test_old_read_notifications_collapse_into_weekly_digests(db_session):
+    now = datetime(2026, 3, 1, 4, 0, tzinfo=timezone.utc)
+    # Week of Monday 2025-12-01
+    for day in (1, 2, 3):
+        _notification(db_session, 1, "target_met", datetime(2025, 12, day, 23, 59, tzinfo=timezone.utc))
+    _notification(db_session, 1, "target_missed", datetime(2025, 12, 4, 23, 59, tzinfo=timezone.utc))
+    unread = _notification(db_session, 1, "target_missed", datetime(2025, 12, 5, 23, 59, tzinfo=timezone.utc), read=False)
+    # Recent enough to keep
+    _notification(db_session, 1, "target_met", datetime(2026, 2, 20, 23, 59, tzinfo=timezone.utc))
+    # Old digest past retention
+    _notification(db_session, 2, DIGEST_TYPE, datetime(2024, 1, 1, tzinfo=timezone.utc))
+    db_session.commit()
+
+    stats = run_notification_retention_job(db_session, digest_after_days=30, retention_days=365, batch_size=2, now=now)
+    assert (stats.digested, stats.digests_created, stats.digests_purged) == (4, 1, 1)
+    # Batches of two notifications: the second batch folds into the first digest
+    assert stats.digests_updated == 1
+
+    digest = db_session.query(Notification).filter(Notification.type == DIGEST_TYPE).one()
+    assert digest.digest_counts == {"target_met": 3, "target_missed": 1}
+    assert digest.created_at.replace(tzinfo=None) == datetime(2025, 12, 1)
+    assert digest.read_at is not None
+    assert "目标已达成 3 条" in digest.content
+    assert {row.type for row in db_session.query(Notification).filter(Notification.user_id == 1)} == {
+        DIGEST_TYPE, "target_met", "target_missed",
+    }
+    assert db_session.get(Notification, unread.id) is not None
+
+    # Read late: folded into the same week's digest
+    db_session.get(Notification, unread.id).read_at = now
+    db_session.commit()
+    run_notification_retention_job(db_session, digest_after_days=30, retention_days=365, now=now)
+    db_session.expire_all()
+    digest = db_session.query(Notification).filter(Notification.type == DIGEST_TYPE).one()
+    assert digest.digest_counts == {"target_met": 3, "target_missed": 2}
+
+
+def test_digests_are_not_published_as_live_notifications(db_session, monkeypatch):
+    published = []
+    monkeypatch.setattr(hub, "publish", lambda user_id, event, data: published.append((user_id, event, data["type"])))
+    now = datetime(2026, 3, 1, 4, 0, tzinfo=timezone.utc)
+    _notification(db_session, 1, "target_met", datetime(2025, 12, 1, 23, 59, tzinfo=timezone.utc))
+    _notification(db_session, 1, "target_missed", datetime(2026, 2, 28, 23, 59, tzinfo=timezone.utc), read=False)
+    db_session.commit()
+    assert published == [(1, "notification", "target_missed")]
+
+    stats = run_notification_retention_job(db_session, digest_after_days=30, retention_days=365, now=now)
+    assert stats.digests_created == 1
+    assert published == [(1, "notification", "target_missed")]
@@ -0,0 +1,91 @@
+"""Tests for notification paging and the unread counter."""
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.models.notification import Notification
+from app.models.user import User
+from app.services.notifications import add_notification, mark_read
+
+
+def _auth(client: TestClient, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{username}@example.com", "username": username, "password": "testpass123"},
+    )
+    login = client.post("/api/v1/auth/login", json={"username": username, "password": "testpass123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    return headers, client.get("/api/v1/users/me", headers=headers).json()["id"]
+
+
+def _unread(client: TestClient, headers: dict) -> int:
+    response = client.get("/api/v1/notifications/unread-count", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["unread_count"]
+
+
+def test_pages_unread_first_and_counts_unread(client: TestClient, db_session):
+    headers, user_id = _auth(client, "inbox_owner")
+    base = datetime(2025, 12, 1, 8, 0, tzinfo=timezone.utc)
+    notifications = []
+    for index in range(5):
+        notification = add_notification(db_session, user_id, "target_met", f"n{index}")
+        notification.created_at = base + timedelta(hours=index)
+        notifications.append(notification)
+    db_session.commit()
+    assert _unread(client, headers) == 5
+
+    for notification in notifications[3:]:
+        assert client.post(f"/api/v1/notifications/{notification.id}/read", headers=headers).status_code == 200
+    # Marking twice does not count twice
+    client.post(f"/api/v1/notifications/{notifications[4].id}/read", headers=headers)
+    assert _unread(client, headers) == 3
+
+    titles = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/v1/notifications", params=params, headers=headers)
+        assert page.status_code == 200, page.text
+        titles.extend(item["title"] for item in page.json())
+        cursor = page.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert titles == ["n2", "n1", "n0", "n4", "n3"]
+
+    assert client.post("/api/v1/notifications/read-all", headers=headers).json()["updated_count"] == 3
+    assert _unread(client, headers) == 0
+    assert db_session.query(Notification).filter(Notification.read_at.is_(None)).count() == 0
+
+    bad = client.get("/api/v1/notifications", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert bad.status_code == 400
+
+
+def test_concurrent_mark_read_counts_once(client: TestClient, db_session):
+    headers, user_id = _auth(client, "inbox_race")
+    notification = add_notification(db_session, user_id, "target_met", "race")
+    add_notification(db_session, user_id, "target_met", "other")
+    db_session.commit()
+    notification_id = notification.id
+
+    factory = sessionmaker(bind=db_session.get_bind())
+    first, second = factory(), factory()
+    try:
+        # Both requests load the row while it is still unread
+        loaded = [session.get(Notification, notification_id) for session in (first, second)]
+        assert all(item.read_at is None for item in loaded)
+        assert mark_read(first, loaded[0])
+        first.commit()
+        assert not mark_read(second, loaded[1])
+        second.commit()
+        assert loaded[1].read_at is not None
+    finally:
+        first.close()
+        second.close()
+
+    db_session.expire_all()
+    assert db_session.get(User, user_id).unread_notification_count == 1
+    assert _unread(client, headers) == 1
@@ -158,3 +158,32 @@ def test_quick_start_template_start_rejects_existing_active_session(client: Test
     response = client.post(f"/api/v1/quick-start-templates/{template['id']}/start", headers=headers)
     assert response.status_code == 409
     assert "already have an active session" in response.json()["detail"].lower()
+
+
+def test_template_list_resolves_categories_with_constant_queries(client: TestClient, count_statements):
+    headers = _auth_headers(client, "quicklist")
+    category_ids = [_create_category(client, headers, name) for name in ("Reading", "Writing")]
+
+    def add_templates(count: int, offset: int) -> None:
+        for index in range(offset, offset + count):
+            response = client.post(
+                "/api/v1/quick-start-templates",
+                json={"title": f"模板 {index}", "category_id": category_ids[index % 2], "duration_seconds": 1500},
+                headers=headers,
+            )
+            assert response.status_code == 201, response.text
+
+    def list_templates() -> tuple[list, int]:
+        with count_statements() as statements:
+            response = client.get("/api/v1/quick-start-templates", headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json(), len(statements)
+
+    add_templates(2, 0)
+    few, few_queries = list_templates()
+    add_templates(18, 2)
+    many, many_queries = list_templates()
+
+    assert (len(few), len(many)) == (2, 20)
+    assert many_queries == few_queries
+    assert {template["category_name"] for template in many} == {"Reading", "Writing"}
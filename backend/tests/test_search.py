@@ -0,0 +1,95 @@
+"""Tests for message and note full-text search."""
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+
+from app.models.group import GroupMessage
+from app.models.search_document import SearchDocument
+from app.services.search import rebuild_search_index, tokenize, tokenize_query
+
+
+def _auth(client: TestClient, email: str, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = client.get("/api/v1/users/me", headers=headers)
+    return headers, me.json()["id"]
+
+
+def test_tokenizer_splits_cjk_into_bigrams():
+    assert tokenize("复习 English 数学") == ["复", "习", "复习", "english", "数", "学", "数学"]
+    assert tokenize_query("高等数学") == ["高等", "等数", "数学"]
+    assert tokenize_query("数") == ["数"]
+    assert tokenize_query("Ｍath！") == ["math"]
+
+
+def test_message_search_ranks_and_paginates(client: TestClient, db_session):
+    headers, _ = _auth(client, "search_owner@example.com", "searchowner")
+    group = client.post("/api/v1/groups", json={"name": "搜索小组"}, headers=headers).json()
+    other = client.post("/api/v1/groups", json={"name": "别的小组"}, headers=headers).json()
+    url = f"/api/v1/groups/{group['id']}/messages"
+
+    client.post(url, json={"content": "今天复习高等数学"}, headers=headers)
+    client.post(url, json={"content": "数学数学，还是数学"}, headers=headers)
+    client.post(url, json={"content": "明天学英语"}, headers=headers)
+    client.post(f"/api/v1/groups/{other['id']}/messages", json={"content": "数学作业"}, headers=headers)
+
+    first = client.get(f"{url}/search", params={"q": "数学", "page_size": 1}, headers=headers)
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert body["has_more"] is True
+    assert body["items"][0]["content"] == "数学数学，还是数学"
+
+    second = client.get(f"{url}/search", params={"q": "数学", "page": 2, "page_size": 1}, headers=headers).json()
+    assert second["has_more"] is False
+    assert [item["content"] for item in second["items"]] == ["今天复习高等数学"]
+
+    # Bigrams must appear together: "高数" is not in the text
+    assert client.get(f"{url}/search", params={"q": "高数"}, headers=headers).json()["items"] == []
+
+    outsider, _ = _auth(client, "search_outsider@example.com", "searchoutsider")
+    assert client.get(f"{url}/search", params={"q": "数学"}, headers=outsider).status_code == 404
+
+
+def test_message_edits_and_deletes_update_the_index(client: TestClient, db_session):
+    headers, _ = _auth(client, "search_edit@example.com", "searchedit")
+    group = client.post("/api/v1/groups", json={"name": "编辑小组"}, headers=headers).json()
+    url = f"/api/v1/groups/{group['id']}/messages"
+    message_id = client.post(url, json={"content": "物理实验报告"}, headers=headers).json()["id"]
+
+    message = db_session.get(GroupMessage, message_id)
+    message.content = "化学实验报告"
+    db_session.commit()
+    assert client.get(f"{url}/search", params={"q": "物理"}, headers=headers).json()["items"] == []
+    assert len(client.get(f"{url}/search", params={"q": "化学"}, headers=headers).json()["items"]) == 1
+
+    message.deleted_at = datetime.now(timezone.utc)
+    db_session.commit()
+    assert client.get(f"{url}/search", params={"q": "实验"}, headers=headers).json()["items"] == []
+    assert db_session.query(SearchDocument).filter(SearchDocument.doc_id == message_id).count() == 0
+
+
+def test_time_trace_search_is_scoped_to_the_owner(client: TestClient, db_session):
+    alice, _ = _auth(client, "search_alice@example.com", "searchalice")
+    bob, _ = _auth(client, "search_bob@example.com", "searchbob")
+    client.post("/api/v1/time-traces", json={"content": "背单词 vocabulary list"}, headers=alice)
+    client.post("/api/v1/time-traces", json={"content": "背单词第二轮"}, headers=bob)
+
+    found = client.get("/api/v1/time-traces/search", params={"q": "单词"}, headers=alice).json()
+    assert [item["content"] for item in found["items"]] == ["背单词 vocabulary list"]
+    english = client.get("/api/v1/time-traces/search", params={"q": "Vocabulary"}, headers=alice).json()
+    assert len(english["items"]) == 1
+
+    # The rebuild used for backfills produces the same index
+    db_session.query(SearchDocument).delete()
+    db_session.commit()
+    assert rebuild_search_index(db_session) == 2
+    db_session.commit()
+    found = client.get("/api/v1/time-traces/search", params={"q": "单词"}, headers=bob).json()
+    assert [item["content"] for item in found["items"]] == ["背单词第二轮"]
@@ -0,0 +1,89 @@
+"""Tests for the batch group snapshot job."""
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.models.group import GroupDailySnapshot
+from app.models.user_daily_status import UserDailyStatus
+from app.services.snapshot_job import run_group_snapshot_job
+
+
+def _auth(client: TestClient, email: str, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "username": username, "password": "testpass123"},
+    )
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "testpass123"},
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    me = client.get("/api/v1/users/me", headers=headers)
+    return headers, me.json()["id"]
+
+
+def test_snapshot_job_covers_every_member_once_per_user(client: TestClient, db_session):
+    today = datetime.now(timezone.utc).date()
+    owner_headers, owner_id = _auth(client, "job_owner@example.com", "jobowner")
+    first = client.post("/api/v1/groups", json={"name": "任务一组"}, headers=owner_headers).json()
+    second = client.post("/api/v1/groups", json={"name": "任务二组"}, headers=owner_headers).json()
+
+    idle_headers, idle_id = _auth(client, "job_idle@example.com", "jobidle")
+    client.post("/api/v1/groups/join", json={"invite_code": first["invite_code"]}, headers=idle_headers)
+    client.post(
+        "/api/v1/targets",
+        json={
+            "period": "daily",
+            "target_seconds": 3600,
+            "effective_from": datetime.combine(today - timedelta(days=1), datetime.min.time()).isoformat(),
+        },
+        headers=idle_headers,
+    )
+
+    legacy_headers, legacy_id = _auth(client, "job_legacy@example.com", "joblegacy")
+    client.post("/api/v1/groups/join", json={"invite_code": second["invite_code"]}, headers=legacy_headers)
+    client.post(
+        "/api/v1/targets",
+        json={
+            "period": "daily",
+            "target_seconds": 1800,
+            "effective_from": datetime.combine(today - timedelta(days=1), datetime.min.time()).isoformat(),
+        },
+        headers=legacy_headers,
+    )
+    for entry_date in (today - timedelta(days=2), today - timedelta(days=1), today):
+        client.post("/api/v1/sessions/manual", json={"entry_date": entry_date.isoformat(), "hours": 1}, headers=legacy_headers)
+    client.post("/api/v1/sessions/manual", json={"entry_date": today.isoformat(), "hours": 3}, headers=owner_headers)
+
+    # Simulate data that predates the cache: no status rows, no snapshots
+    db_session.query(UserDailyStatus).filter(UserDailyStatus.user_id != owner_id).delete()
+    db_session.query(GroupDailySnapshot).delete()
+    db_session.commit()
+
+    dry = run_group_snapshot_job(db_session, chunk_size=2, dry_run=True)
+    assert dry.rows_written == 4
+    assert db_session.query(GroupDailySnapshot).count() == 0
+
+    stats = run_group_snapshot_job(db_session, chunk_size=2)
+    assert (stats.users, stats.memberships, stats.chunks, stats.rows_written) == (3, 4, 2, 4)
+    # Users without a cached row are aggregated per chunk, never rebuilt one by one
+    assert (stats.cached_users, stats.aggregated_users) == (1, 2)
+    assert db_session.query(UserDailyStatus).filter(UserDailyStatus.user_id != owner_id).count() == 0
+    assert set(stats.timings) == {"load", "aggregate", "upsert"}
+
+    snapshots = {
+        (row.group_id, row.user_id): row
+        for row in db_session.query(GroupDailySnapshot).filter(GroupDailySnapshot.date == today)
+    }
+    assert snapshots[(first["id"], owner_id)].total_seconds == 3 * 3600
+    assert snapshots[(second["id"], owner_id)].total_seconds == 3 * 3600
+    legacy = snapshots[(second["id"], legacy_id)]
+    assert (legacy.total_seconds, legacy.target_completed_count, legacy.target_total_count) == (3600, 1, 1)
+    assert legacy.streak_days == 3
+    idle = snapshots[(first["id"], idle_id)]
+    assert (idle.total_seconds, idle.target_total_count, idle.streak_days) == (0, 1, 0)
+
+    # Re-running updates rows in place
+    again = run_group_snapshot_job(db_session)
+    assert again.rows_written == 4
+    assert db_session.query(GroupDailySnapshot).count() == 4
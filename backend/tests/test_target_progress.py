@@ -0,0 +1,126 @@
+"""Tests for cached per-period target progress."""
+from datetime import date, datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.models.target_progress import TargetProgress
+from app.models.work_target import WorkTarget
+from app.services import target_progress
+from app.services.evaluation import build_target_dashboard, evaluate_targets_for_date
+
+
+def _auth(client: TestClient, username: str) -> tuple[dict, int]:
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{username}@example.com", "username": username, "password": "testpass123"},
+    )
+    login = client.post("/api/v1/auth/login", json={"username": username, "password": "testpass123"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    return headers, client.get("/api/v1/users/me", headers=headers).json()["id"]
+
+
+def _session(client: TestClient, headers: dict, start_hour: int, end_hour: int, category_id=None) -> int:
+    payload = {
+        "start_time": datetime(2025, 12, 10, start_hour, 0, tzinfo=timezone.utc).isoformat(),
+        "end_time": datetime(2025, 12, 10, end_hour, 0, tzinfo=timezone.utc).isoformat(),
+        "note": "work",
+    }
+    if category_id is not None:
+        payload["category_id"] = category_id
+    response = client.post("/api/v1/sessions/manual", json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _progress(db_session, user_id: int) -> int:
+    as_of = datetime(2025, 12, 10, 20, 0, tzinfo=timezone.utc)
+    [item] = build_target_dashboard(user_id, db_session, as_of=as_of)["progress"]
+    db_session.commit()
+    return item["actual_seconds"]
+
+
+def test_progress_follows_session_writes(client: TestClient, db_session):
+    headers, user_id = _auth(client, "progress_owner")
+    category = client.post("/api/v1/categories", json={"name": "Deep work", "color": "#123456"}, headers=headers)
+    assert category.status_code == 201, category.text
+    category_id = category.json()["id"]
+    target = client.post(
+        "/api/v1/targets",
+        json={
+            "period": "daily",
+            "target_seconds": 7200,
+            "include_category_ids": [category_id],
+            "effective_from": "2025-12-01T00:00:00+00:00",
+        },
+        headers=headers,
+    )
+    assert target.status_code == 201, target.text
+
+    counted = _session(client, headers, 8, 10, category_id)
+    _session(client, headers, 11, 12)  # Outside the category filter
+    assert _progress(db_session, user_id) == 7200
+    assert db_session.query(TargetProgress).count() == 1
+
+    # Later writes update the cached row instead of creating new ones
+    _session(client, headers, 13, 14, category_id)
+    assert db_session.query(TargetProgress).one().actual_seconds == 10800
+
+    response = client.patch(f"/api/v1/sessions/{counted}/multiplier", json={"multiplier": 0.5}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert _progress(db_session, user_id) == 7200
+
+    assert client.delete(f"/api/v1/sessions/{counted}", headers=headers).status_code == 204
+    assert _progress(db_session, user_id) == 3600
+
+    [evaluation] = evaluate_targets_for_date(date(2025, 12, 10), db_session, user_id=user_id)
+    assert (evaluation.status, evaluation.actual_seconds) == ("missed", 3600)
+    # The evaluated period is finished; its cached row is dropped
+    assert db_session.query(TargetProgress).count() == 0
+
+
+def test_hard_deleting_a_category_drops_cached_progress(client: TestClient, db_session):
+    headers, user_id = _auth(client, "progress_category")
+    category_id = client.post("/api/v1/categories", json={"name": "Gone", "color": "#654321"}, headers=headers).json()["id"]
+    client.post(
+        "/api/v1/targets",
+        json={
+            "period": "daily",
+            "target_seconds": 3600,
+            "include_category_ids": [category_id],
+            "effective_from": "2025-12-01T00:00:00+00:00",
+        },
+        headers=headers,
+    )
+    _session(client, headers, 8, 9, category_id)
+    assert _progress(db_session, user_id) == 3600
+
+    response = client.delete(f"/api/v1/categories/{category_id}", params={"hard_delete": True}, headers=headers)
+    assert response.status_code == 204, response.text
+    assert db_session.query(TargetProgress).count() == 0
+
+
+def test_concurrent_first_reads_keep_one_row(client: TestClient, db_session, monkeypatch):
+    headers, user_id = _auth(client, "progress_race")
+    client.post(
+        "/api/v1/targets",
+        json={"period": "daily", "target_seconds": 3600, "effective_from": "2025-12-01T00:00:00+00:00"},
+        headers=headers,
+    )
+    _session(client, headers, 8, 9)
+    other = sessionmaker(bind=db_session.get_bind())()
+    compute = target_progress.sum_target_seconds
+
+    def racing_sum(target, period_start, period_end, db):
+        if db is db_session:
+            # Another request builds and commits the same row first.
+            target_progress.load_target_progress([(other.get(WorkTarget, target.id), period_start, period_end)], other)
+            other.commit()
+        return compute(target, period_start, period_end, db)
+
+    monkeypatch.setattr(target_progress, "sum_target_seconds", racing_sum)
+    try:
+        assert _progress(db_session, user_id) == 3600
+    finally:
+        other.close()
+    assert db_session.query(TargetProgress).count() == 1
@@ -0,0 +1,104 @@
+"""Tests for the indexed admin user search."""
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.models.user import User
+from app.services import user_search
+from app.services.user_search import search_users
+
+
+def _add_users(db_session, names):
+    for name in names:
+        db_session.add(User(email=f"{name}@example.com", username=name, password_hash="x"))
+    db_session.commit()
+
+
+def test_search_ranks_exact_then_prefix_then_substring(db_session):
+    _add_users(db_session, ["mylinda", "linda", "lindAsmith", "bob"])
+
+    users, total, capped = search_users(db_session, "Linda")
+    assert [user.username for user in users] == ["linda", "lindAsmith", "mylinda"]
+    assert total == 3 and not capped
+
+    prefix, total, _ = search_users(db_session, "lin", mode="prefix")
+    assert [user.username for user in prefix] == ["linda", "lindAsmith"]
+    assert total == 2
+
+    by_email, _, _ = search_users(db_session, "bob@exa")
+    assert [user.username for user in by_email] == ["bob"]
+
+    # Short terms fall back to LIKE; wildcards in the term are literal
+    short, _, _ = search_users(db_session, "bo")
+    assert [user.username for user in short] == ["bob"]
+    assert search_users(db_session, "li%")[1] == 0
+
+
+def test_search_index_follows_renames_and_deletes(db_session):
+    _add_users(db_session, ["renameme"])
+    user = db_session.query(User).filter(User.username == "renameme").one()
+    user.username = "freshname"
+    user.email = "freshname@example.com"
+    db_session.commit()
+
+    assert search_users(db_session, "renameme")[1] == 0
+    assert [found.username for found in search_users(db_session, "freshna")[0]] == ["freshname"]
+
+    db_session.delete(user)
+    db_session.commit()
+    assert search_users(db_session, "freshna")[1] == 0
+
+
+def test_search_results_are_capped(db_session, monkeypatch):
+    monkeypatch.setattr(user_search, "SEARCH_RESULT_CAP", 5)
+    _add_users(db_session, [f"capped{i}" for i in range(8)])
+
+    users, total, capped = search_users(db_session, "capped", limit=3)
+    assert len(users) == 3
+    assert total == 5 and capped
+    assert search_users(db_session, "capped", offset=5)[0] == []
+
+
+@pytest.mark.skipif(
+    not os.environ.get("ETIME_SEARCH_BENCHMARK"),
+    reason="set ETIME_SEARCH_BENCHMARK=1 to run the 1M-user search benchmark",
+)
+def test_search_on_one_million_users(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    User.__table__.create(bind=engine)
+    with engine.begin() as connection:
+        batch = []
+        for i in range(1_000_000):
+            batch.append({
+                "email": f"user{i:07d}@example.com",
+                "username": f"user{i:07d}",
+                "password_hash": "x",
+                "role": "user",
+                "is_active": True,
+                "data_version": 0,
+                "created_at": text("CURRENT_TIMESTAMP"),
+            })
+            if len(batch) == 10_000:
+                connection.execute(insert(User.__table__).values(batch))
+                batch = []
+
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        users, total, _ = search_users(db, "user0999999")
+        elapsed = time.perf_counter() - started
+        assert [user.username for user in users] == ["user0999999"]
+        assert total == 1
+        assert elapsed < 0.5
+
+        started = time.perf_counter()
+        users, total, capped = search_users(db, "user00123", mode="prefix", limit=20)
+        elapsed = time.perf_counter() - started
+        assert len(users) == 20 and total == 100 and not capped
+        assert elapsed < 0.5
+    finally:
+        db.close()
+        engine.dispose()
@@ -372,3 +372,48 @@ def test_no_duplicate_evaluations(client: TestClient, db_session):
     assert len(evaluations2) == 0
     
     print("✓ No duplicate evaluations created")
+
+
+def test_concurrent_evaluators_insert_each_period_once(client: TestClient, db_session):
+    """Test that a second evaluator session skips periods another one already inserted"""
+    from sqlalchemy.exc import IntegrityError
+    from sqlalchemy.orm import sessionmaker
+    from app.models.notification import Notification
+    from app.models.work_evaluation import WorkEvaluation
+
+    client.post("/api/v1/auth/register", json={
+        "email": "race@example.com",
+        "username": "race",
+        "password": "testpass123"
+    })
+    login_response = client.post("/api/v1/auth/login", json={"username": "race", "password": "testpass123"})
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    client.post("/api/v1/targets", json={
+        "period": "daily",
+        "target_seconds": 3600,
+        "effective_from": datetime(2025, 12, 11, 0, 0, 0, tzinfo=timezone.utc).isoformat()
+    }, headers=headers)
+
+    other = sessionmaker(bind=db_session.get_bind())()
+    try:
+        assert len(evaluate_targets_for_date(date(2025, 12, 11), other, user_id=user_id)) == 1
+    finally:
+        other.close()
+    assert evaluate_targets_for_date(date(2025, 12, 11), db_session, user_id=user_id) == []
+    assert db_session.query(Notification).filter(Notification.user_id == user_id).count() == 1
+
+    existing = db_session.query(WorkEvaluation).one()
+    db_session.add(WorkEvaluation(
+        user_id=user_id,
+        target_id=existing.target_id,
+        period_start=existing.period_start,
+        period_end=existing.period_end,
+        actual_seconds=0,
+        target_seconds=3600,
+        status="missed",
+        deficit_seconds=3600,
+    ))
+    with pytest.raises(IntegrityError):
+        db_session.flush()
+    db_session.rollback()
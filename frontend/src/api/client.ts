@@ -182,6 +182,13 @@ class ApiClient {
     return this.getUserRole() === 'admin';
   }
 
+  // 实时事件流：EventSource 无法附带 Authorization 头，token 走查询参数
+  eventStreamUrl(): string | null {
+    const token = this.getToken();
+    if (!token) return null;
+    return `${API_BASE_URL}/events/stream?access_token=${encodeURIComponent(token)}`;
+  }
+
   // API 方法
   async get<T>(url: string, params?: any): Promise<T> {
     const response = await this.client.get<T>(url, { params });
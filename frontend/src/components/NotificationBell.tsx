@@ -2,7 +2,7 @@ import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react'
 import { useLocation } from 'react-router-dom';
 import { Bell } from 'lucide-react';
 import { apiClient } from '../api/client';
-import { NotificationItem, TargetDashboard } from '../types';
+import { NotificationItem, NotificationUnreadCount, TargetDashboard } from '../types';
 import { TARGET_PROGRESS_CHANGED_EVENT } from '../utils/targetProgress';
 
 const formatTime = (seconds: number) => {
@@ -13,23 +13,28 @@ const formatTime = (seconds: number) => {
   return `${hours} 小时 ${minutes} 分钟`;
 };
 
+const NOTIFICATION_PAGE_SIZE = 12;
+
 export const NotificationBell: React.FC = () => {
   const location = useLocation();
   const rootRef = useRef<HTMLDivElement | null>(null);
   const refreshIdRef = useRef(0);
   const [notifications, setNotifications] = useState<NotificationItem[]>([]);
+  const [unreadCount, setUnreadCount] = useState(0);
   const [dashboard, setDashboard] = useState<TargetDashboard | null>(null);
   const [showDropdown, setShowDropdown] = useState(false);
 
   const loadNotifications = useCallback(async () => {
     const refreshId = ++refreshIdRef.current;
     try {
-      const [notificationData, dashboardData] = await Promise.all([
-        apiClient.get<NotificationItem[]>('/notifications'),
+      const [notificationData, unreadData, dashboardData] = await Promise.all([
+        apiClient.get<NotificationItem[]>('/notifications', { limit: NOTIFICATION_PAGE_SIZE }),
+        apiClient.get<NotificationUnreadCount>('/notifications/unread-count'),
         apiClient.get<TargetDashboard>('/targets/dashboard'),
       ]);
       if (refreshId !== refreshIdRef.current) return;
       setNotifications(notificationData);
+      setUnreadCount(unreadData.unread_count);
       setDashboard(dashboardData);
     } catch (error) {
       console.error('加载通知失败', error);
@@ -87,8 +92,6 @@ export const NotificationBell: React.FC = () => {
     };
   }, [showDropdown]);
 
-  const unreadCount = notifications.filter((notification) => !notification.read_at).length;
-
   const remaining = useMemo(() => {
     const progress = dashboard?.progress ?? [];
     return {
@@ -112,6 +115,7 @@ export const NotificationBell: React.FC = () => {
 
   const markAllAsRead = async () => {
     const readAt = new Date().toISOString();
+    setUnreadCount(0);
     setNotifications((current) => current.map((notification) => (
       notification.read_at ? notification : { ...notification, read_at: readAt }
     )));
@@ -163,7 +167,7 @@ export const NotificationBell: React.FC = () => {
             <p className="notification-empty">暂无通知</p>
           ) : (
             <ul>
-              {notifications.slice(0, 12).map((notification) => (
+              {notifications.slice(0, NOTIFICATION_PAGE_SIZE).map((notification) => (
                 <li
                   key={notification.id}
                   className={notification.read_at ? 'read' : 'unread'}
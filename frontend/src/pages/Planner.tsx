@@ -35,6 +35,7 @@ import {
   CalendarTaskPriority,
   CalendarTaskStatus,
   Category,
+  ReminderDueEvent,
   TargetDashboard,
   WorkTarget,
 } from '../types';
@@ -200,12 +201,21 @@ export const Planner: React.FC = () => {
   }, []);
 
   useEffect(() => {
-    void checkDueReminders();
-    const timer = window.setInterval(() => {
-      void checkDueReminders();
-    }, 60_000);
+    // The server fires reminders; the planner only listens for them.
+    const url = apiClient.eventStreamUrl();
+    if (!url || typeof EventSource === 'undefined') return undefined;
 
-    return () => window.clearInterval(timer);
+    const source = new EventSource(url);
+    source.addEventListener('reminder_due', (event) => {
+      void notifyReminder(JSON.parse((event as MessageEvent<string>).data) as ReminderDueEvent);
+    });
+    // 服务端无法补发断线期间的事件（缓冲已淘汰或进程已重启），整体重新拉取
+    source.addEventListener('resync', () => {
+      void loadData();
+      void loadTargetData();
+    });
+
+    return () => source.close();
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
@@ -247,11 +257,11 @@ export const Planner: React.FC = () => {
     }
   };
 
-  const notifyTask = async (task: CalendarTask) => {
-    if (firedReminderIds.current.has(task.id)) return;
-    firedReminderIds.current.add(task.id);
+  const notifyReminder = async (reminder: ReminderDueEvent) => {
+    if (firedReminderIds.current.has(reminder.task_id)) return;
+    firedReminderIds.current.add(reminder.task_id);
 
-    const body = `${taskTimeLabel(task)} · ${task.title}`;
+    const body = `${format(new Date(reminder.scheduled_start), 'HH:mm')} · ${reminder.title}`;
     let shown = false;
 
     if ('Notification' in window) {
@@ -271,21 +281,9 @@ export const Planner: React.FC = () => {
       setToast(`提醒：${body}`);
     }
 
-    await apiClient.post(`/calendar-tasks/${task.id}/reminder-fired`);
     await loadData();
   };
 
-  const checkDueReminders = async () => {
-    try {
-      const due = await apiClient.get<CalendarTask[]>('/calendar-tasks/reminders/due');
-      for (const task of due) {
-        await notifyTask(task);
-      }
-    } catch (error) {
-      console.error('检查提醒失败', error);
-    }
-  };
-
   const scheduledTasks = tasks.filter((task) => task.scheduled_start && task.status !== 'cancelled');
   const unscheduledTasks = tasks.filter((task) => task.status === 'unscheduled');
   const todayTasks = scheduledTasks.filter((task) => isSameDay(new Date(task.scheduled_start!), new Date()));
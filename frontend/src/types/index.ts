@@ -107,6 +107,13 @@ export interface TimeTraceEntry {
   created_at: string;
 }
 
+export interface TimeTraceSearchResponse {
+  page: number;
+  page_size: number;
+  has_more: boolean;
+  items: TimeTraceEntry[];
+}
+
 export interface DayDetail {
   id: number;
   category_id: number | null;
@@ -203,6 +210,10 @@ export interface NotificationItem {
   read_at?: string | null;
 }
 
+export interface NotificationUnreadCount {
+  unread_count: number;
+}
+
 export type GroupRole = 'owner' | 'admin' | 'member';
 export type GroupVisibility = 'private' | 'invite_code' | 'public';
 export type GroupMessageType = 'text' | 'status_share' | 'card_share' | 'system';
@@ -258,6 +269,13 @@ export interface GroupMessage {
   deleted_at?: string | null;
 }
 
+export interface GroupMessageSearchResponse {
+  page: number;
+  page_size: number;
+  has_more: boolean;
+  items: GroupMessage[];
+}
+
 export interface ReviewCategoryItem {
   category_id: number | null;
   category_name: string | null;
@@ -337,8 +355,10 @@ export interface PaginatedUsersResponse {
 
 export interface PaginatedSessionsResponse {
   total: number;
+  total_is_estimate?: boolean;
   page: number;
   page_size: number;
+  next_cursor?: string | null;
   sessions: SessionListItem[];
 }
 
@@ -400,6 +420,14 @@ export interface CalendarTask {
   updated_at: string;
 }
 
+// Payload of the reminder_due live event, fired by the server reminder engine
+export interface ReminderDueEvent {
+  task_id: number;
+  title: string;
+  scheduled_start: string;
+  reminder_minutes_before?: number | null;
+}
+
 export interface CalendarTaskPayload {
   title?: string;
   description?: string | null;